@@ -0,0 +1,43 @@
+'''
+Import time benchmark. Each import is measured in a fresh interpreter.
+
+Run with:
+    python -m benchmarks.import_time
+'''
+from __future__ import print_function
+import sys
+import subprocess
+
+SNIPPETS = [
+    ('import mljar', 'import mljar'),
+    ('REST clients', 'from mljar.client.project import ProjectClient; '
+                        'from mljar.client.experiment import ExperimentClient; '
+                        'from mljar.client.result import ResultClient'),
+    ('Mljar', 'from mljar import Mljar')
+]
+
+CODE = '''
+import sys, time
+start = time.time()
+{}
+elapsed = time.time() - start
+print('%f %d %d' % (elapsed, 'pandas' in sys.modules, 'numpy' in sys.modules))
+'''
+
+def measure(snippet, repeat = 5):
+    '''
+    Returns the best import time in seconds and flags if pandas and numpy were imported.
+    '''
+    best = None
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', CODE.format(snippet)])
+        elapsed, pandas_loaded, numpy_loaded = output.decode('utf-8').split()
+        elapsed = float(elapsed)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, pandas_loaded == '1', numpy_loaded == '1'
+
+if __name__ == '__main__':
+    for name, snippet in SNIPPETS:
+        elapsed, pandas_loaded, numpy_loaded = measure(snippet)
+        print('{:<14} {:7.1f} ms  pandas: {}  numpy: {}'.format(name, elapsed * 1000.0,
+                                                                pandas_loaded, numpy_loaded))
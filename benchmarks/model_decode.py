@@ -0,0 +1,30 @@
+'''
+Benchmark of model objects decoding: marshmallow schema load vs compiled decoder.
+
+Run with:
+    python -m benchmarks.model_decode
+'''
+from __future__ import print_function
+import sys
+import time
+
+from mljar.model.result import Result
+from tests.model_payload import make_payload
+
+def timeit(fun, repeat = 3):
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        fun()
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    payload = make_payload(n)
+    t_schema = timeit(lambda: [Result.from_dict(r) for r in payload])
+    t_decoder = timeit(lambda: Result.from_list(payload))
+    print('Results count: {}'.format(n))
+    print('marshmallow load: {:.3f} s'.format(t_schema))
+    print('compiled decoder: {:.3f} s ({:.1f}x faster)'.format(t_decoder, t_schema / t_decoder))
@@ -0,0 +1,43 @@
+'''
+Memory benchmark of Result objects, per 100k results.
+
+Run with (Python 3):
+    python -m benchmarks.model_memory
+'''
+from __future__ import print_function
+import gc
+import sys
+import json
+import tracemalloc
+
+from mljar.model.result import Result
+from tests.model_payload import make_payload
+
+def measure(build):
+    # payload is encoded as JSON to not share objects between runs
+    raw = json.dumps(make_payload(N))
+    gc.collect()
+    tracemalloc.start()
+    payload = json.loads(raw)
+    objects = build(payload)
+    del payload
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, objects
+
+N = 100000
+
+if __name__ == '__main__':
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else N
+    cases = [
+        ('marshmallow load', lambda p: [Result.from_dict(r) for r in p]),
+        ('from_list', lambda p: Result.from_list(p)),
+        ('from_list, not compact', lambda p: Result.from_list(p, compact = False))
+    ]
+    print('Results count: {}'.format(N))
+    for name, build in cases:
+        current, objects = measure(build)
+        print('{:<22} {:8.1f} MB  ({:.0f} bytes per result)'.format(name, current / 1024.0 / 1024.0,
+                                                                    current / float(N)))
+        del objects
@@ -0,0 +1,55 @@
+'''
+Scaling benchmark of parallel dataset serialization (CSV, hash and ZIP) across workers.
+
+Run with:
+    python -m benchmarks.parallel_scaling [rows] [max workers]
+'''
+from __future__ import print_function
+import os
+import sys
+import uuid
+import tempfile
+import hashlib
+import multiprocessing
+from zipfile import ZipFile, ZIP_DEFLATED
+
+import numpy as np
+import pandas as pd
+
+from mljar.parallel import ParallelSerializer
+from benchmarks.model_decode import timeit
+
+def make_frame(n_rows, n_cols = 20):
+    np.random.seed(1)
+    data = pd.DataFrame(np.random.rand(n_rows, n_cols), columns=['attribute_'+str(i+1) for i in range(n_cols)])
+    data['category'] = np.random.choice(['a', 'b', 'c'], n_rows)
+    data['target'] = np.random.randint(0, 2, n_rows)
+    return data
+
+def serial(data, file_path_zip):
+    file_path = file_path_zip[:-4]
+    data.to_csv(file_path, index=False)
+    with open(file_path, 'rb') as fin:
+        hashlib.sha1(fin.read()).hexdigest()
+    with ZipFile(file_path_zip, 'w', ZIP_DEFLATED) as myzip:
+        myzip.write(file_path, os.path.basename(file_path))
+    os.remove(file_path)
+
+if __name__ == '__main__':
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else multiprocessing.cpu_count()
+    data = make_frame(n_rows)
+    file_path_zip = os.path.join(tempfile.gettempdir(), 'dataset-'+ str(uuid.uuid4())[:8]+'.csv.zip')
+    try:
+        t_serial = timeit(lambda: serial(data, file_path_zip), repeat = 1)
+        print('Rows: {}'.format(n_rows))
+        print('serial: {:.2f} s'.format(t_serial))
+        workers = 1
+        while workers <= max_workers:
+            engine = ParallelSerializer(n_workers = workers)
+            elapsed = timeit(lambda: engine.serialize(data, file_path_zip, 'data.csv'), repeat = 1)
+            print('{} workers: {:.2f} s ({:.1f}x)'.format(workers, elapsed, t_serial / elapsed))
+            workers *= 2
+    finally:
+        if os.path.exists(file_path_zip):
+            os.remove(file_path_zip)
@@ -3,4 +3,21 @@ __version__ = '0.0.8'
 API_VERSION = 'v1'
 MLJAR_ENDPOINT = 'https://mljar.com/api'
 
-from .mljar import Mljar
+import sys
+
+__all__ = ['Mljar']
+
+# Mljar (with numpy and pandas) is imported on first access,
+# so REST clients can be used without heavy imports.
+if sys.version_info < (3, 7):
+    from .mljar import Mljar
+else:
+    def __getattr__(name):
+        if name == 'Mljar':
+            from .mljar import Mljar
+            globals()['Mljar'] = Mljar
+            return Mljar
+        raise AttributeError("module 'mljar' has no attribute '{}'".format(name))
+
+    def __dir__():
+        return sorted(list(globals().keys()) + __all__)
@@ -0,0 +1,108 @@
+import time
+import threading
+import numpy as np
+import pandas as pd
+from concurrent.futures import Future
+
+from .mljar import Mljar
+from .exceptions import IncorrectInputDataException, MljarException
+from .log import logger
+
+class PredictionBatcher(object):
+    '''
+    Aggregates many small predict requests for one model into a single dataset.
+
+    Requests are queued and flushed as one combined dataset when there are at least
+    max_rows rows waiting or the oldest request waits longer than max_latency seconds.
+    Each request gets a future with its own slice of the predictions.
+    '''
+    def __init__(self, project_id, model_id, max_rows = 10000, max_latency = 1.0):
+        self.project_id = project_id
+        self.model_id = model_id
+        self.max_rows = max_rows
+        self.max_latency = max_latency
+        self._queue = []
+        self._queued_rows = 0
+        self._oldest = None
+        self._columns = None
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='mljar-batcher')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self, X):
+        '''
+        Queues X for prediction. Returns future with predictions DataFrame.
+        '''
+        if not isinstance(X, pd.DataFrame):
+            X = pd.DataFrame(np.asarray(X))
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise MljarException('PredictionBatcher is closed')
+            if self._columns is None:
+                self._columns = list(X.columns)
+            elif list(X.columns) != self._columns:
+                raise IncorrectInputDataException('All batched requests should have the same columns')
+            if self._oldest is None:
+                self._oldest = time.time()
+            self._queue.append((X, future))
+            self._queued_rows += X.shape[0]
+            self._condition.notify()
+        return future
+
+    def predict(self, X, timeout = None):
+        return self.submit(X).result(timeout)
+
+    def _ready(self):
+        if len(self._queue) == 0:
+            return False
+        if self._closed or self._queued_rows >= self.max_rows:
+            return True
+        return time.time() - self._oldest >= self.max_latency
+
+    def _take(self):
+        batch, self._queue = self._queue, []
+        self._queued_rows = 0
+        self._oldest = None
+        return batch
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._ready():
+                    if self._closed and len(self._queue) == 0:
+                        return
+                    timeout = None
+                    if self._oldest is not None:
+                        timeout = max(self.max_latency - (time.time() - self._oldest), 0.0)
+                    self._condition.wait(timeout)
+                batch = self._take()
+            self._flush(batch)
+
+    def _flush(self, batch):
+        try:
+            X = pd.concat([x for x, _ in batch], ignore_index = True)
+            pred = Mljar.compute_prediction(X, self.model_id, self.project_id)
+            if pred is None:
+                raise MljarException('Prediction was not computed')
+        except Exception as e:
+            logger.error('Batched prediction failed, %s' % str(e))
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        start = 0
+        for x, future in batch:
+            stop = start + x.shape[0]
+            future.set_result(pred.iloc[start:stop].reset_index(drop = True))
+            start = stop
+
+    def close(self, timeout = None):
+        '''
+        Flushes queued requests and stops the background thread.
+        '''
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout)
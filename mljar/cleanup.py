@@ -0,0 +1,266 @@
+import time
+import atexit
+import datetime
+import threading
+from queue import Queue, Empty
+
+from .client.dataset import DatasetClient
+from .log import logger
+
+# title prefix of prediction datasets which are deleted after use
+MLJAR_TEMPORARY_PREFIX = 'Temporary-'
+MLJAR_ORPHANS_MAX_AGE = 24 * 3600 # seconds
+
+class DatasetCleaner(object):
+    '''
+    Deletes temporary datasets in a background thread.
+
+    Scheduled deletes are drained from the queue in batches, grouped by project,
+    and retried on failure. Pending deletes are flushed on interpreter exit.
+    Old orphaned temporary prediction datasets (with 'Temporary-' prefix) left
+    by crashed runs are periodically removed from the projects seen by the cleaner.
+    Datasets kept on user request (keep_dataset=True) have 'Testing-' prefix
+    and are never collected.
+
+    Datasets found or added in using() block are not deleted till the block ends,
+    so a dataset scheduled for delete can be reused by the next prediction.
+    '''
+    def __init__(self, batch_size = 20, max_retries = 3, retry_interval = 5.0,
+                    gc_interval = 3600.0, orphans_max_age = MLJAR_ORPHANS_MAX_AGE):
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_interval = retry_interval
+        self.gc_interval = gc_interval
+        self.orphans_max_age = orphans_max_age
+        self._queue = Queue()
+        self._projects = set()
+        self._pending = set()
+        # project hid -> number of datasets lookups in progress
+        self._lookups = {}
+        # project hid -> number of deletes in progress
+        self._deleting = {}
+        # dataset hid -> number of using() blocks which use the dataset
+        self._pinned = {}
+        self._lock = threading.Lock()
+        self._deleted = threading.Condition(self._lock)
+        self._last_gc = time.time()
+        self._thread = threading.Thread(target=self._run, name='mljar-cleaner')
+        self._thread.daemon = True
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def schedule(self, project_hid, dataset_hid):
+        '''
+        Queues dataset to be deleted.
+        '''
+        with self._lock:
+            self._projects.add(project_hid)
+            self._pending.add(dataset_hid)
+        self._queue.put((project_hid, dataset_hid, 0))
+
+    def cancel(self, dataset_hid):
+        '''
+        Cancels scheduled delete, for example when the same dataset is used again.
+        '''
+        with self._lock:
+            self._pending.discard(dataset_hid)
+
+    def using(self, project_hid):
+        '''
+        Returns context manager which protects datasets of the project from deletion.
+        The context value is function which should be called with the found or added dataset,
+        it pins the dataset till the end of the block and cancels its scheduled delete.
+        Deletes in the project wait till the dataset is pinned.
+
+            with get_cleaner().using(project_hid) as use:
+                dataset = use(DatasetClient(project_hid).add_dataset_if_not_exists(X, None))
+        '''
+        return _DatasetsInUse(self, project_hid)
+
+    def _begin_lookup(self, project_hid):
+        with self._lock:
+            # the dataset which is being deleted can not be found by lookup
+            while self._deleting.get(project_hid, 0) > 0:
+                self._deleted.wait()
+            self._lookups[project_hid] = self._lookups.get(project_hid, 0) + 1
+
+    def _end_lookup(self, project_hid):
+        with self._lock:
+            self._lookups[project_hid] -= 1
+            if self._lookups[project_hid] == 0:
+                del self._lookups[project_hid]
+
+    def _pin(self, dataset_hid):
+        with self._lock:
+            self._pinned[dataset_hid] = self._pinned.get(dataset_hid, 0) + 1
+            self._pending.discard(dataset_hid)
+
+    def _unpin(self, dataset_hid):
+        with self._lock:
+            self._pinned[dataset_hid] -= 1
+            if self._pinned[dataset_hid] == 0:
+                del self._pinned[dataset_hid]
+
+    def _begin_delete(self, project_hid, dataset_hid):
+        '''
+        Returns True if dataset can be deleted now, it is False if the dataset is
+        in use or there is a lookup in the project.
+        '''
+        with self._lock:
+            if dataset_hid in self._pinned or self._lookups.get(project_hid, 0) > 0:
+                return False
+            self._deleting[project_hid] = self._deleting.get(project_hid, 0) + 1
+            return True
+
+    def _end_delete(self, project_hid):
+        with self._lock:
+            self._deleting[project_hid] -= 1
+            if self._deleting[project_hid] == 0:
+                del self._deleting[project_hid]
+            self._deleted.notify_all()
+
+    def flush(self):
+        '''
+        Blocks till all scheduled deletes are processed.
+        '''
+        self._queue.join()
+
+    def _next_batch(self):
+        try:
+            batch = [self._queue.get(timeout = 1.0)]
+        except Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if len(batch) > 0:
+                try:
+                    self._delete_batch(batch)
+                except Exception as e:
+                    logger.error('Datasets cleaning failed, %s' % str(e))
+                finally:
+                    # flush() waits for all items, so they are marked done also on failure
+                    for _ in batch:
+                        self._queue.task_done()
+            if self.gc_interval is not None and time.time() - self._last_gc > self.gc_interval:
+                self._last_gc = time.time()
+                for project_hid in list(self._projects):
+                    try:
+                        self.collect_orphans(project_hid)
+                    except Exception as e:
+                        logger.error('Orphaned datasets cleaning failed, %s' % str(e))
+
+    def _delete_batch(self, batch):
+        projects = {}
+        for item in batch:
+            projects.setdefault(item[0], []).append(item)
+        failed = []
+        # datasets in projects with lookups in progress are retried later
+        deferred = []
+        for project_hid, items in projects.items():
+            try:
+                client = DatasetClient(project_hid)
+            except Exception as e:
+                logger.error('Cannot delete datasets in project %s, %s' % (project_hid, str(e)))
+                continue
+            for item in items:
+                project_hid, dataset_hid, retries = item
+                with self._lock:
+                    if dataset_hid not in self._pending:
+                        continue
+                if not self._begin_delete(project_hid, dataset_hid):
+                    deferred.append(item)
+                    continue
+                try:
+                    client.delete_dataset(dataset_hid)
+                    with self._lock:
+                        self._pending.discard(dataset_hid)
+                except Exception as e:
+                    if retries + 1 < self.max_retries:
+                        failed.append((project_hid, dataset_hid, retries + 1))
+                    else:
+                        logger.error('Cannot delete dataset %s, %s' % (dataset_hid, str(e)))
+                        with self._lock:
+                            self._pending.discard(dataset_hid)
+                finally:
+                    self._end_delete(project_hid)
+        if len(failed) + len(deferred) > 0:
+            time.sleep(self.retry_interval)
+            for item in failed + deferred:
+                self._queue.put(item)
+
+    def collect_orphans(self, project_hid, prefix = MLJAR_TEMPORARY_PREFIX, max_age = None):
+        '''
+        Deletes datasets with title prefix which are older than max_age seconds.
+        '''
+        max_age = self.orphans_max_age if max_age is None else max_age
+        client = DatasetClient(project_hid)
+        deleted = 0
+        for ds in client.get_datasets():
+            if not ds.title.startswith(prefix) or ds.created_at is None:
+                continue
+            now = datetime.datetime.now(ds.created_at.tzinfo) if ds.created_at.tzinfo \
+                    else datetime.datetime.utcnow()
+            if (now - ds.created_at).total_seconds() > max_age:
+                if not self._begin_delete(project_hid, ds.hid):
+                    continue
+                try:
+                    logger.info('Remove orphaned dataset: %s' % ds.hid)
+                    client.delete_dataset(ds.hid)
+                    deleted += 1
+                finally:
+                    self._end_delete(project_hid)
+        return deleted
+
+class _DatasetsInUse(object):
+    '''
+    Context manager returned by DatasetCleaner.using.
+    '''
+    def __init__(self, cleaner, project_hid):
+        self._cleaner = cleaner
+        self._project_hid = project_hid
+        self._lookup = False
+        self._datasets = []
+
+    def __enter__(self):
+        self._cleaner._begin_lookup(self._project_hid)
+        self._lookup = True
+        return self.use
+
+    def use(self, dataset):
+        if dataset is not None:
+            self._cleaner._pin(dataset.hid)
+            self._datasets.append(dataset.hid)
+        if self._lookup:
+            # dataset is pinned, so other deletes in the project can continue
+            self._lookup = False
+            self._cleaner._end_lookup(self._project_hid)
+        return dataset
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._lookup:
+            self._lookup = False
+            self._cleaner._end_lookup(self._project_hid)
+        for dataset_hid in self._datasets:
+            self._cleaner._unpin(dataset_hid)
+        self._datasets = []
+
+_cleaner = None
+_cleaner_lock = threading.Lock()
+
+def get_cleaner():
+    '''
+    Returns shared DatasetCleaner, it is created on first use.
+    '''
+    global _cleaner
+    with _cleaner_lock:
+        if _cleaner is None:
+            _cleaner = DatasetCleaner()
+        return _cleaner
@@ -7,6 +7,7 @@ from ..exceptions import JSONReadException, NotFoundException, AuthenticationExc
 
 
 from ..log import logger
+from ..timing import record_request
 
 class MljarHttpClient(object):
     '''
@@ -22,9 +23,10 @@ class MljarHttpClient(object):
 
         self.base_url = '/'.join([MLJAR_ENDPOINT, API_VERSION])
 
-    def request(self, method, url, data=None, with_header=True, url_outside_mljar=False, parse_json=True):
+    def request(self, method, url, data=None, with_header=True, url_outside_mljar=False, parse_json=True, stream=False):
         """
         Execute the request using requests library.
+        If stream is True, the response body is not downloaded till it is read.
         """
         if url_outside_mljar:
             request_url = url
@@ -34,9 +36,11 @@ class MljarHttpClient(object):
 
         headers = {'Authorization': 'Token '+self.TOKEN }
         if with_header:
-            response = requests.request(method, request_url, headers=headers, data=data)
+            response = requests.request(method, request_url, headers=headers, data=data, stream=stream)
         else:
-            response = requests.request(method, request_url, data=data)
+            response = requests.request(method, request_url, data=data, stream=stream)
+        n_bytes = len(data) if isinstance(data, (bytes, str)) else 0
+        record_request(n_bytes + int(response.headers.get('Content-Length', 0)))
 
         if parse_json:
             try:
@@ -1,10 +1,8 @@
 from builtins import range
-import numpy as np
-import pandas as pd
 import uuid
 import os
+import json
 import sys
-import time
 import copy
 import tempfile
 from zipfile import ZipFile, ZIP_DEFLATED
@@ -16,7 +14,9 @@ from ..exceptions import NotFoundException, MljarException, CreateDatasetExcepti
 from .dataupload import DataUploadClient
 from ..log import logger
 
-from ..utils import make_hash
+from ..utils import make_hash, make_sampled_hash, sampled_positions
+from ..webhook import get_waiter
+from ..timing import phase, timed, record_bytes
 
 class DatasetClient(MljarHttpClient):
     '''
@@ -34,7 +34,7 @@ class DatasetClient(MljarHttpClient):
         logger.info('Get datasets, project id {}'.format(self.project_hid))
         response = self.request("GET", self.url+'?project_id='+self.project_hid)
         datasets_dict = response.json()
-        return [Dataset.from_dict(ds) for ds in datasets_dict]
+        return Dataset.from_list(datasets_dict)
 
     def get_dataset(self, dataset_hid):
         '''
@@ -60,6 +60,17 @@ class DatasetClient(MljarHttpClient):
         Concatenates matrices and computes hash
         '''
         logger.info('Prepare dataset and compute hash')
+        data = self._prepare_frame(X, y)
+        with phase('hash'):
+            dataset_hash = str(make_hash(data))
+        return data, dataset_hash
+
+    def _prepare_frame(self, X, y):
+        '''
+        Concatenates matrices
+        '''
+        import numpy as np
+        import pandas as pd
         data = None
         if isinstance(X, np.ndarray):
             cols = {}
@@ -81,10 +92,9 @@ class DatasetClient(MljarHttpClient):
                 # "target", "class", "loss"
             else:
                 data = copy.deepcopy(X)
+        return data
 
-        dataset_hash = str(make_hash(data))
-        return data, dataset_hash
-
+    @timed('validation_wait')
     def _wait_till_all_datasets_are_valid(self):
         '''
         Waits till all datasets is valid. If all valid it returns True,
@@ -93,6 +103,7 @@ class DatasetClient(MljarHttpClient):
         '''
         logger.info('Wait till all datasets are valid')
         total_checks = 120
+        waiter = get_waiter([('dataset', None)])
         for i in range(total_checks):
             datasets = self.get_datasets()
             if datasets is not None:
@@ -106,22 +117,54 @@ class DatasetClient(MljarHttpClient):
                     return
             else:
                 logger.info('None datasets list')
-            time.sleep(5)
+            waiter.sleep(5)
         raise MljarException('There are some problems with reading one of your dataset. \
                             Please login to mljar.com and check your project for more details.')
 
+    @timed('validation_wait')
+    def _wait_till_dataset_is_valid(self, dataset_hid):
+        '''
+        Waits till selected dataset is validated.
+        '''
+        logger.info('Wait till dataset {} is valid'.format(dataset_hid))
+        total_checks = 120
+        waiter = get_waiter([('dataset', dataset_hid)])
+        for i in range(total_checks):
+            dataset = self.get_dataset(dataset_hid)
+            if dataset is not None and dataset.valid != 0:
+                return
+            waiter.sleep(5)
+        raise MljarException('There are some problems with reading your dataset. \
+                            Please login to mljar.com and check your project for more details.')
 
-
-    def add_dataset_if_not_exists(self, X, y, title_prefix = 'dataset-', dataset_title = None):
+    def add_dataset_if_not_exists(self, X, y, title_prefix = 'dataset-', dataset_title = None,
+                                    engine = None, sampled_fingerprint = False, delta_store = None,
+                                    wait_for_all = True):
         '''
         Checks if dataset already exists, if not it add dataset to project.
+        If engine (for example ParallelSerializer) is set, data is serialized and
+        fingerprinted by the engine and the fingerprint is stored in dataset meta.
+        If sampled_fingerprint is True, existing datasets are found by sampled hash
+        stored in dataset meta, the full hash is computed only to confirm a match.
+        If delta_store (for example LocalChunkStore) is set, data is split into
+        content-defined chunks and only new chunks are put into the store,
+        the least recently used chunks are evicted after upload.
+        If wait_for_all is False, it does not wait for other datasets in the project
+        to be validated, so many datasets can be added concurrently.
         '''
         logger.info('Add dataset if not exists')
         # before start adding any new dataset
         # wait till all dataset are validated
         # it does not return an object, it just waits
-        self._wait_till_all_datasets_are_valid()
-        logger.info('All datasets are valid till now')
+        if wait_for_all:
+            self._wait_till_all_datasets_are_valid()
+            logger.info('All datasets are valid till now')
+        if engine is not None:
+            return self._add_dataset_with_engine(X, y, title_prefix, dataset_title, engine)
+        if delta_store is not None:
+            return self._add_dataset_with_delta(X, y, title_prefix, dataset_title, delta_store)
+        if sampled_fingerprint:
+            return self._add_dataset_with_sampled_hash(X, y, title_prefix, dataset_title)
         # check if dataset already exists
         data, dataset_hash = self._prepare_data(X, y)
         datasets = self.get_datasets()
@@ -133,16 +176,136 @@ class DatasetClient(MljarHttpClient):
         else:
             dataset_details = dataset_details[0]
 
+        return self._finalize_dataset(dataset_details, wait_for_all)
+
+    def add_csv_dataset_if_not_exists(self, file_path, fingerprint, prediction_only = False,
+                                        title_prefix = 'dataset-', dataset_title = None, wait_for_all = True):
+        '''
+        Checks if dataset with fingerprint (stored in dataset meta) already exists,
+        if not it uploads already serialized CSV file.
+        If wait_for_all is False, it does not wait for other datasets in the project
+        to be validated, so many datasets can be added concurrently.
+        '''
+        logger.info('Add CSV dataset if not exists')
+        if wait_for_all:
+            self._wait_till_all_datasets_are_valid()
+        dataset_details = self._find_by_meta(self.get_datasets(), 'fingerprint', fingerprint)
+        if dataset_details is None:
+            title = self._make_title(title_prefix, dataset_title)
+            dataset_details = self._upload_csv(file_path, title, prediction_only,
+                                                meta = [{'fingerprint': fingerprint}])
+        return self._finalize_dataset(dataset_details, wait_for_all)
+
+    def _add_dataset_with_engine(self, X, y, title_prefix, dataset_title, engine):
+        data = self._prepare_frame(X, y)
+        file_path_zip = os.path.join(tempfile.gettempdir(), 'dataset-'+ str(uuid.uuid4())[:8]+'.csv.zip')
+        try:
+            with phase('serialization'):
+                fingerprint = engine.serialize(data, file_path_zip, basename(file_path_zip)[:-4])
+                record_bytes(os.path.getsize(file_path_zip))
+            del data
+            dataset_details = self._find_by_meta(self.get_datasets(), 'fingerprint', fingerprint)
+            if dataset_details is None:
+                title = self._make_title(title_prefix, dataset_title)
+                dataset_details = self._register_zip(file_path_zip, title, y is None,
+                                                        meta = [{'fingerprint': fingerprint}])
+        finally:
+            if os.path.exists(file_path_zip):
+                os.remove(file_path_zip)
+        return self._finalize_dataset(dataset_details)
+
+    def _add_dataset_with_sampled_hash(self, X, y, title_prefix, dataset_title):
+        with phase('hash'):
+            # only sampled rows are concatenated, the full data is not copied
+            sampled_hash = make_sampled_hash(self._prepare_sample(X, y), n_rows = X.shape[0])
+        dataset_details = None
+        data = None
+        candidates = [d for d in self.get_datasets() if self._has_meta(d, 'sampled_fingerprint', sampled_hash)]
+        if len(candidates) > 0:
+            logger.info('Confirm dataset match with full hash')
+            data = self._prepare_frame(X, y)
+            with phase('hash'):
+                dataset_hash = str(make_hash(data))
+            dataset_details = next((d for d in candidates if d.dataset_hash == dataset_hash), None)
+        if dataset_details is None:
+            if data is None:
+                data = self._prepare_frame(X, y)
+            dataset_details = self.add_new_dataset(data, y, title_prefix, dataset_title,
+                                                    meta = [{'sampled_fingerprint': sampled_hash}])
+        return self._finalize_dataset(dataset_details)
+
+    def _prepare_sample(self, X, y):
+        '''
+        Concatenates rows of matrices sampled by make_sampled_hash
+        '''
+        import numpy as np
+        positions = sampled_positions(X.shape[0])
+        if positions is None:
+            return self._prepare_frame(X, y)
+        X_sample = X.iloc[positions] if hasattr(X, 'iloc') else X[positions]
+        y_sample = None
+        if y is not None:
+            y_sample = y.iloc[positions] if hasattr(y, 'iloc') else np.asarray(y)[positions]
+        return self._prepare_frame(X_sample, y_sample)
+
+    def _add_dataset_with_delta(self, X, y, title_prefix, dataset_title, store):
+        from ..delta import split_chunks, store_chunks, manifest_fingerprint
+        data = self._prepare_frame(X, y)
+        with phase('serialization'):
+            chunks = split_chunks(data.to_csv(index=False).encode('utf-8'))
+        del data
+        with phase('compression'):
+            manifest, stored_bytes = store_chunks(store, chunks)
+            record_bytes(stored_bytes)
+        del chunks
+        fingerprint = manifest_fingerprint(manifest)
+        try:
+            dataset_details = self._find_by_meta(self.get_datasets(), 'fingerprint', fingerprint)
+            if dataset_details is None:
+                title = self._make_title(title_prefix, dataset_title)
+                file_path_zip = os.path.join(tempfile.gettempdir(), 'dataset-'+ str(uuid.uuid4())[:8]+'.csv.zip')
+                try:
+                    with phase('compression'):
+                        store.compose(manifest, file_path_zip, basename(file_path_zip)[:-4])
+                    # MLJAR API can not compose datasets from chunks, composed file is uploaded,
+                    # the manifest is not stored in meta, because it grows with the dataset
+                    dataset_details = self._register_zip(file_path_zip, title, y is None,
+                                                meta = [{'fingerprint': fingerprint}])
+                finally:
+                    if os.path.exists(file_path_zip):
+                        os.remove(file_path_zip)
+        finally:
+            store.evict()
+        return self._finalize_dataset(dataset_details)
+
+    @staticmethod
+    def _has_meta(dataset, key, value):
+        return any(isinstance(m, dict) and m.get(key, None) == value for m in dataset.meta or [])
+
+    @staticmethod
+    def _find_by_meta(datasets, key, value):
+        for d in datasets:
+            if DatasetClient._has_meta(d, key, value):
+                return d
+        return None
+
+    def _finalize_dataset(self, dataset_details, wait_for_all = True):
+        '''
+        Waits till dataset is valid, accepts column usage and returns updated dataset.
+        '''
         if dataset_details is None:
             raise MljarException('There was a problem during new dataset addition')
         # wait till dataset is validated ...
-        self._wait_till_all_datasets_are_valid()
+        if wait_for_all:
+            self._wait_till_all_datasets_are_valid()
+        else:
+            self._wait_till_dataset_is_valid(dataset_details.hid)
         if not self._accept_dataset_column_usage(dataset_details.hid):
             raise MljarException('There was a problem with accept column usage for your dataset.')
         # get dataset with updated statistics
         my_dataset = self.get_dataset(dataset_details.hid)
         if my_dataset is None:
-            raise DatasetUnknownException('Can not find dataset: %s' % self.dataset_title)
+            raise DatasetUnknownException('Can not find dataset: %s' % dataset_details.title)
         if my_dataset.valid != 1:
             raise MljarException('Sorry, your dataset can not be read by MLJAR. \
                                     Please report this to us - we will fix it.')
@@ -153,30 +316,58 @@ class DatasetClient(MljarHttpClient):
 
         return my_dataset
 
+
+    @timed('column_accept')
     def _accept_dataset_column_usage(self, dataset_hid):
         logger.info('Accept column usage')
         response = self.request("POST", '/accept_column_usage/',data = {'dataset_id': dataset_hid})
         return response.status_code == 200
 
 
-    def add_new_dataset(self, data, y, title_prefix = 'dataset-', dataset_title = None):
-        logger.info('Add new dataset')
+    @staticmethod
+    def _make_title(title_prefix, dataset_title):
         if dataset_title is None:
-            title = title_prefix + str(uuid.uuid4())[:4] # set some random name
-        else:
-            title = dataset_title
+            return title_prefix + str(uuid.uuid4())[:4] # set some random name
+        return dataset_title
+
+    def add_new_dataset(self, data, y, title_prefix = 'dataset-', dataset_title = None, meta = None):
+        logger.info('Add new dataset')
+        title = self._make_title(title_prefix, dataset_title)
 
         file_path = os.path.join(tempfile.gettempdir(), 'dataset-'+ str(uuid.uuid4())[:8]+'.csv')
 
-        logger.info('Compress data before export')
         prediction_only = y is None
         # save to local storage
-        data.to_csv(file_path, index=False)
+        with phase('serialization'):
+            data.to_csv(file_path, index=False)
+            record_bytes(os.path.getsize(file_path))
+        try:
+            return self._upload_csv(file_path, title, prediction_only, meta)
+        finally:
+            # clean data file
+            os.remove(file_path)
+
+    def _upload_csv(self, file_path, title, prediction_only, meta = None):
+        '''
+        Compresses CSV file, uploads it and creates dataset in MLJAR.
+        '''
+        logger.info('Compress data before export')
         # compress
-        file_path_zip = file_path + '.zip'
-        with ZipFile(file_path_zip, 'w', ZIP_DEFLATED) as myzip:
-            myzip.write(file_path, basename(file_path))
+        file_path_zip = os.path.join(tempfile.gettempdir(), 'dataset-'+ str(uuid.uuid4())[:8]+'.csv.zip')
+        with phase('compression'):
+            with ZipFile(file_path_zip, 'w', ZIP_DEFLATED) as myzip:
+                myzip.write(file_path, basename(file_path_zip)[:-4])
+            record_bytes(os.path.getsize(file_path_zip))
+        try:
+            return self._register_zip(file_path_zip, title, prediction_only, meta)
+        finally:
+            logger.info('Clean tmp files')
+            os.remove(file_path_zip)
 
+    def _register_zip(self, file_path_zip, title, prediction_only, meta = None):
+        '''
+        Uploads compressed dataset file and creates dataset in MLJAR.
+        '''
         # upload data to MLJAR storage
         dst_path = DataUploadClient().upload_file(self.project_hid, file_path_zip)
         # create a dataset instance in DB
@@ -188,7 +379,7 @@ class DatasetClient(MljarHttpClient):
             'derived': 0,
             'valid': 0,
             'parent_project': self.project_hid,
-            'meta': '',
+            'meta': json.dumps(meta) if meta else '',
             'data_type': 'tabular',
             'scope': 'private',
             'prediction_only': 1 if prediction_only else 0
@@ -197,9 +388,4 @@ class DatasetClient(MljarHttpClient):
         response = self.request("POST", self.url, data = data)
         if response.status_code != 201:
             raise CreateDatasetException()
-        logger.info('Clean tmp files')
-        # clean data file
-        os.remove(file_path)
-        os.remove(file_path_zip)
-
         return Dataset.from_dict(response.json())
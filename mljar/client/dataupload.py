@@ -3,6 +3,7 @@ from ..model.dataset import Dataset
 from ..exceptions import FileUploadException
 
 from ..log import logger
+from ..timing import phase, timed
 
 class DataUploadClient(MljarHttpClient):
     '''
@@ -12,6 +13,7 @@ class DataUploadClient(MljarHttpClient):
         self.url = "/s3policy/"
         super(DataUploadClient, self).__init__()
 
+    @timed('signed_url')
     def _get_signed_url(self, project_hid, file_path):
         data = {'project_hid':project_hid, 'fname': file_path.split('/')[-1]}
         response = self.request("POST", self.url, data = data)
@@ -22,7 +24,7 @@ class DataUploadClient(MljarHttpClient):
         url_data = self._get_signed_url(project_hid, file_path)
         signed_url = url_data['signed_url']
         dst_path   = url_data['destination_path']
-        with open(file_path, 'rb') as fin:
+        with phase('upload'), open(file_path, 'rb') as fin:
             response = self.request("PUT", signed_url, data=fin.read(),
                                             with_header=False, url_outside_mljar=True,
                                             parse_json=False)
@@ -2,12 +2,13 @@ from __future__ import print_function
 import json
 import warnings
 from .base import MljarHttpClient
-from ..model.experiment import Experiment
+from ..model.experiment import Experiment, ExperimentIndex
 from ..exceptions import NotFoundException, MljarException, CreateExperimentException
 from ..exceptions import UndefinedExperimentException
 
 from .dataupload import DataUploadClient
 from ..log import logger
+from ..metadata_cache import get_metadata_cache
 
 from ..utils import make_hash
 from ..utils import MLJAR_METRICS, MLJAR_TUNING_MODES, MLJAR_DEFAULT_ALGORITHMS, MLJAR_DEFAULT_METRICS
@@ -16,9 +17,10 @@ class ExperimentClient(MljarHttpClient):
     '''
     Client to interact with MLJAR experiments
     '''
-    def __init__(self, project_hid):
+    def __init__(self, project_hid, cache = None):
         self.project_hid = project_hid
         self.url = "/experiments"
+        self.cache = cache if cache is not None else get_metadata_cache()
         super(ExperimentClient, self).__init__()
 
     def get_experiments(self):
@@ -28,7 +30,7 @@ class ExperimentClient(MljarHttpClient):
         logger.info('Get experiments, project id {}'.format(self.project_hid))
         response = self.request("GET", self.url+'?project_id='+self.project_hid)
         experiments_dict = response.json()
-        return [Experiment.from_dict(expt) for expt in experiments_dict]
+        return Experiment.from_list(experiments_dict)
 
     def get_experiment(self, experiment_hid):
         '''
@@ -51,7 +53,12 @@ class ExperimentClient(MljarHttpClient):
                                         validation_kfolds, validation_shuffle, \
                                         validation_stratify, validation_train_split, \
                                         algorithms, metric, \
-                                        tuning_mode, time_constraint, create_ensemble):
+                                        tuning_mode, time_constraint, create_ensemble, index = None):
+        '''
+        Checks if experiment already exists, if not it creates new experiment.
+        The index is ExperimentIndex with project experiments, if provided then
+        experiments are not listed and new experiment is added to the index.
+        '''
         logger.info('Add experiment if not exists')
         # parameters validation
         # validation with dataset
@@ -107,29 +114,41 @@ class ExperimentClient(MljarHttpClient):
                                 compute_now=0, computation_started_at=None, created_at=None,
                                 created_by=None, parent_project=self.project_hid)
 
-        # get existing experiments
-        experiments = self.get_experiments()
+        cache_key = ('experiment', self.project_hid, new_expt.title)
+        if index is None:
+            # check if there is cached experiment with selected title
+            cached_hid = self.cache.get(cache_key)
+            if cached_hid is not None:
+                expt = self.get_experiment(cached_hid)
+                if expt is not None and expt.title == new_expt.title:
+                    index = ExperimentIndex([expt])
+                else:
+                    self.cache.invalidate(cache_key)
+        if index is None:
+            # get existing experiments
+            index = ExperimentIndex(self.get_experiments())
         # check if there are experiments with selected title
-        experiments = [e for e in experiments if e.title == new_expt.title]
+        experiments = index.with_title(new_expt.title)
         # if there are experiments with selected title
         if len(experiments) > 0:
             # check if experiment with the same title has different parameters
-            for expt in experiments:
-                if not expt.equal(new_expt):
+            same = index.find(new_expt.title, new_expt.fingerprint())
+            if same is None or len(experiments) > 1:
+                different = [e for e in experiments if not e.equal(new_expt)]
+                if len(different) > 0:
                     print('The experiment with specified title already exists, but it has different parameters than you specified.')
                     print('Existing experiment')
-                    print(str(expt))
+                    print(str(different[0]))
                     print('New experiment')
                     print(str(new_expt))
                     print('Please rename your new experiment with new parameters setup.')
                     return None
-            # there is only one experiment with selected title and has the same parameters
-            # this is our experiment :)
-            if len(experiments) == 1:
-                return experiments[0]
-            else:
                 # there more than 1 experiment, something goes wrong ...
                 raise UndefinedExperimentException()
+            # there is only one experiment with selected title and has the same parameters
+            # this is our experiment :)
+            self.cache.set(cache_key, same.hid)
+            return same
         else:
             # there is no experiment with such title, let's go and create it!
             logger.info('Create new experiment: %s' % new_expt.title)
@@ -146,7 +165,10 @@ class ExperimentClient(MljarHttpClient):
                 'params': params
 
             }
-            return self.create_experiment(data)
+            experiment = self.create_experiment(data)
+            self.cache.set(cache_key, experiment.hid)
+            index.add(experiment)
+            return experiment
 
 
 
@@ -1,11 +1,13 @@
-import os
-import uuid
-import tempfile
-import pandas as pd
+import io
 from .base import MljarHttpClient
 from ..exceptions import PredictionDownloadException
 
 from ..log import logger
+from ..timing import timed
+
+# size of read buffer used when parsing the response stream
+MLJAR_DOWNLOAD_BUFFER_SIZE = 1024 * 1024
+MLJAR_DOWNLOAD_CHUNK_ROWS = 100000
 
 class PredictionDownloadClient(MljarHttpClient):
     '''
@@ -15,17 +17,92 @@ class PredictionDownloadClient(MljarHttpClient):
         self.url = "/download/prediction/"
         super(PredictionDownloadClient, self).__init__()
 
-    def download(self, prediction_hid):
-        response = self.request("POST", self.url, data = {"prediction_id": prediction_hid}, parse_json=False)
+    def _open(self, prediction_hid):
+        response = self.request("POST", self.url, data = {"prediction_id": prediction_hid},
+                                    parse_json=False, stream=True)
+        response.raw.decode_content = True
+        # urllib3 closes exhausted raw stream, then buffered reader fails on the next read
+        response.raw.auto_close = False
+        return response, io.BufferedReader(response.raw, buffer_size = MLJAR_DOWNLOAD_BUFFER_SIZE)
+
+    @timed('download')
+    def download(self, prediction_hid, dtype = None, as_numpy = False):
+        '''
+        Downloads predictions. The response is parsed directly from the stream,
+        gzip content encoding is decoded transparently.
+        Args:
+            dtype: The dtype of predictions, for example numpy.float32.
+            as_numpy: The flag which decides if numpy array should be returned
+                        instead of pandas DataFrame.
+        '''
+        import pandas as pd
+        response, stream = self._open(prediction_hid)
         pred = None
         try:
-            tmp_file = os.path.join(tempfile.gettempdir(), 'mljar_prediction_' + str(uuid.uuid4()) + '.csv')
-            with open(tmp_file, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=1024):
-                    if chunk: # filter out keep-alive new chunks
-                        f.write(chunk)
-            pred = pd.read_csv(tmp_file)
-            os.remove(tmp_file)
+            pred = pd.read_csv(stream, dtype = dtype)
         except Exception as e:
             raise PredictionDownloadException(str(e))
+        finally:
+            response.close()
+        if as_numpy:
+            return pred.values
         return pred
+
+    def download_chunks(self, prediction_hid, chunksize = MLJAR_DOWNLOAD_CHUNK_ROWS, dtype = None):
+        '''
+        Yields predictions as DataFrames with at most chunksize rows. The index
+        of each chunk is the row position in the predicted dataset.
+        '''
+        import pandas as pd
+        response, stream = self._open(prediction_hid)
+        try:
+            for chunk in pd.read_csv(stream, dtype = dtype, chunksize = chunksize):
+                yield chunk
+        except Exception as e:
+            raise PredictionDownloadException(str(e))
+        finally:
+            response.close()
+
+    @timed('download')
+    def download_to(self, prediction_hid, out, chunksize = MLJAR_DOWNLOAD_CHUNK_ROWS):
+        '''
+        Writes predictions into out with bounded memory. The out can be a file path,
+        then the CSV is saved as is, or a preallocated numpy array (for example np.memmap)
+        with one row per predicted sample. Returns the number of written rows.
+        '''
+        if not hasattr(out, 'shape'):
+            response, stream = self._open(prediction_hid)
+            lines = 0
+            last = b''
+            try:
+                with open(out, 'wb') as fout:
+                    while True:
+                        block = stream.read(MLJAR_DOWNLOAD_BUFFER_SIZE)
+                        if not block:
+                            break
+                        lines += block.count(b'\n')
+                        last = block[-1:]
+                        fout.write(block)
+            except Exception as e:
+                raise PredictionDownloadException(str(e))
+            finally:
+                response.close()
+            # the last line might be not terminated
+            if last not in (b'', b'\n'):
+                lines += 1
+            # without the header line
+            return max(lines - 1, 0)
+
+        start = 0
+        for chunk in self.download_chunks(prediction_hid, chunksize, dtype = out.dtype):
+            stop = start + chunk.shape[0]
+            if stop > out.shape[0]:
+                raise PredictionDownloadException('There are more predictions than rows in output array')
+            values = chunk.values
+            if len(out.shape) == 1:
+                values = values[:, 0]
+            out[start:stop] = values
+            start = stop
+        if hasattr(out, 'flush'):
+            out.flush()
+        return start
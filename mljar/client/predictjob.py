@@ -14,10 +14,14 @@ class PredictJobClient(MljarHttpClient):
 
 
     def submit(self, project_hid, dataset_hid, result_hid):
+        '''
+        Submits predict job, result_hid can be a single hid or a list of hids.
+        '''
+        algorithms_ids = list(result_hid) if isinstance(result_hid, (list, tuple)) else [result_hid]
         data =  {
                     'predict_params' : json.dumps({'project_id': project_hid,
                                                     'project_hardware': 'cloud',
-                                                    'algorithms_ids': [result_hid],
+                                                    'algorithms_ids': algorithms_ids,
                                                     'dataset_id': dataset_hid,
                                                     'cv_models':1})
                 }
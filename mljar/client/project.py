@@ -2,14 +2,16 @@ from .base import MljarHttpClient
 from ..model.project import Project
 from ..exceptions import NotFoundException, CreateProjectException
 from ..log import logger
+from ..metadata_cache import get_metadata_cache
 
 class ProjectClient(MljarHttpClient):
     '''
     Client to interact with MLJAR projects.
     '''
-    def __init__(self):
+    def __init__(self, cache = None):
         self.verbose = True
         self.url = "/projects"
+        self.cache = cache if cache is not None else get_metadata_cache()
         super(ProjectClient, self).__init__()
 
     def get_projects(self):
@@ -18,7 +20,7 @@ class ProjectClient(MljarHttpClient):
         '''
         response = self.request("GET", self.url)
         projects_dict = response.json()
-        return [Project.from_dict(proj) for proj in projects_dict]
+        return Project.from_list(projects_dict)
 
     def get_project(self, hid):
         '''
@@ -58,6 +60,16 @@ class ProjectClient(MljarHttpClient):
         '''
         Checks if project with specified title and task exists, if not it adds new project.
         '''
+        # check cached project hid first, to not list all projects
+        cache_key = ('project', title, task)
+        cached_hid = self.cache.get(cache_key)
+        if cached_hid is not None:
+            project = self.get_project(cached_hid)
+            if project is not None and project.title == title and project.task == task:
+                self.my_project = project
+                return self.my_project
+            self.cache.invalidate(cache_key)
+
         projects = self.get_projects()
         self.my_project = [p for p in projects if p.title == title and p.task == task]
         # if project with such title does not exist, create one
@@ -68,4 +80,5 @@ class ProjectClient(MljarHttpClient):
         else:
             self.my_project = self.my_project[0]
 
+        self.cache.set(cache_key, self.my_project.hid)
         return self.my_project
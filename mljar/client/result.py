@@ -11,13 +11,30 @@ class ResultClient(MljarHttpClient):
         self.project_hid = project_hid
         super(ResultClient, self).__init__()
 
-    def get_results(self, experiment_hid = None):
+    def get_results_payload(self, experiment_hid = None):
         '''
-        List all models.
+        List all models as raw JSON payload (list of dicts).
         '''
         data = {'project_id': self.project_hid}
         if experiment_hid is not None:
             data['experiment_id'] = experiment_hid
         response = self.request("POST", self.url, data = data)
-        results_dict = response.json()
-        return [Result.from_dict(r) for r in results_dict]
+        return response.json()
+
+    def get_results(self, experiment_hid = None):
+        '''
+        List all models.
+        '''
+        results_dict = self.get_results_payload(experiment_hid)
+        return Result.from_list(results_dict)
+
+    def get_results_table(self, experiment_hid = None, metric = None, table = None):
+        '''
+        Get models as ResultTable. If table is provided it is updated in place.
+        '''
+        # imported here, because it requires pandas
+        from ..model.result_table import ResultTable
+        results_dict = self.get_results_payload(experiment_hid)
+        if table is None:
+            return ResultTable.from_payload(results_dict, metric)
+        return table.update(results_dict)
@@ -0,0 +1,158 @@
+import os
+import json
+import zlib
+import hashlib
+import tempfile
+import threading
+
+from .parallel import compress_block, ZipStreamWriter
+from .utils import atomic_file_path
+from .log import logger
+
+MLJAR_DELTA_AVG_ROWS = 4096
+MLJAR_DELTA_MIN_ROWS = 512
+MLJAR_DELTA_MAX_ROWS = 65536
+MLJAR_DEFAULT_CHUNK_STORE_SIZE = 1024 * 1024 * 1024 # bytes
+
+def chunk_boundaries(lines, avg_rows = MLJAR_DELTA_AVG_ROWS, min_rows = MLJAR_DELTA_MIN_ROWS,
+                        max_rows = MLJAR_DELTA_MAX_ROWS):
+    '''
+    Content-defined chunking of lines. The line ends a chunk if its CRC-32 modulo
+    avg_rows is zero (and the chunk has at least min_rows lines) or the chunk has max_rows lines.
+    Boundaries depend only on lines content, so appending rows does not change
+    chunks before the last one. Yields chunks end positions.
+    '''
+    start = 0
+    for i, line in enumerate(lines):
+        n = i - start + 1
+        if n >= max_rows or (n >= min_rows and zlib.crc32(line) % avg_rows == 0):
+            yield i + 1
+            start = i + 1
+    if start < len(lines):
+        yield len(lines)
+
+def split_chunks(csv, **params):
+    '''
+    Splits serialized CSV (bytes) into chunks. Returns list of (chunk hash, chunk bytes).
+    '''
+    lines = csv.splitlines(True)
+    chunks = []
+    start = 0
+    for stop in chunk_boundaries(lines, **params):
+        chunk = b''.join(lines[start:stop])
+        chunks.append((hashlib.sha1(chunk).hexdigest(), chunk))
+        start = stop
+    return chunks
+
+class LocalChunkStore(object):
+    '''
+    Local store of compressed chunks with JSON index of chunks CRC-32 and sizes.
+    Chunks are compressed once, as full-flushed deflate blocks, so the dataset
+    file is composed from stored chunks without compressing them again.
+    When evict() is called and total size of chunks exceeds max_size,
+    the least recently used chunks are removed.
+    '''
+    def __init__(self, directory = None, max_size = MLJAR_DEFAULT_CHUNK_STORE_SIZE):
+        self.directory = directory or os.path.join(tempfile.gettempdir(), 'mljar-chunks')
+        self.max_size = max_size
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        self._index_path = os.path.join(self.directory, 'index.json')
+        self._index = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self._index_path):
+            try:
+                with open(self._index_path) as fin:
+                    self._index = json.load(fin)
+            except Exception as e:
+                logger.error('Cannot read chunks index, %s' % str(e))
+
+    def _chunk_path(self, chunk_hash):
+        return os.path.join(self.directory, chunk_hash + '.deflate')
+
+    def has(self, chunk_hash):
+        with self._lock:
+            known = chunk_hash in self._index
+        if not known:
+            return False
+        try:
+            # mark as recently used
+            os.utime(self._chunk_path(chunk_hash), None)
+            return True
+        except OSError:
+            return False
+
+    def put(self, chunk_hash, chunk):
+        '''
+        Stores chunk, returns the number of stored (compressed) bytes.
+        '''
+        compressed, crc, size, _ = compress_block(chunk, last = False)
+        with atomic_file_path(self._chunk_path(chunk_hash)) as tmp_path:
+            with open(tmp_path, 'wb') as fout:
+                fout.write(compressed)
+        with self._lock:
+            self._index[chunk_hash] = [crc, size]
+            self._save()
+        return len(compressed)
+
+    def evict(self):
+        '''
+        Removes the least recently used chunks till total size is below max_size.
+        It should not be called between store_chunks and compose of the same manifest.
+        '''
+        with self._lock:
+            entries = []
+            for chunk_hash in list(self._index.keys()):
+                try:
+                    stat = os.stat(self._chunk_path(chunk_hash))
+                except OSError:
+                    del self._index[chunk_hash]
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, chunk_hash))
+            total = sum(e[1] for e in entries)
+            for mtime, size, chunk_hash in sorted(entries):
+                if total <= self.max_size:
+                    break
+                try:
+                    os.remove(self._chunk_path(chunk_hash))
+                except OSError:
+                    pass
+                del self._index[chunk_hash]
+                total -= size
+            self._save()
+
+    def _save(self):
+        with atomic_file_path(self._index_path) as tmp_path:
+            with open(tmp_path, 'w') as fout:
+                json.dump(self._index, fout)
+
+    def compose(self, chunk_hashes, file_path_zip, arcname):
+        '''
+        Writes ZIP file with chunks concatenated in order.
+        '''
+        with ZipStreamWriter(file_path_zip, arcname) as writer:
+            for chunk_hash in chunk_hashes:
+                with self._lock:
+                    crc, size = self._index[chunk_hash]
+                with open(self._chunk_path(chunk_hash), 'rb') as fin:
+                    writer.write_block(fin.read(), crc, size)
+            compressed, crc, size, _ = compress_block(b'', last = True)
+            writer.write_block(compressed, crc, size)
+        return file_path_zip
+
+def store_chunks(store, chunks):
+    '''
+    Puts to the store chunks which are not there yet.
+    Returns the list of chunks hashes (manifest) and the number of stored bytes.
+    '''
+    manifest = []
+    stored_bytes = 0
+    for chunk_hash, chunk in chunks:
+        if not store.has(chunk_hash):
+            stored_bytes += store.put(chunk_hash, chunk)
+        manifest.append(chunk_hash)
+    logger.info('Chunks: {}, new data stored: {} bytes'.format(len(manifest), stored_bytes))
+    return manifest, stored_bytes
+
+def manifest_fingerprint(manifest):
+    return 'chunks-' + hashlib.sha1(','.join(manifest).encode('utf-8')).hexdigest()
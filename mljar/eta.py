@@ -0,0 +1,112 @@
+import math
+
+from .utils import MLJAR_TUNING_MODES
+
+class RunningStats(object):
+    '''
+    Running mean and variance (Welford's algorithm).
+    '''
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+
+class ETA(object):
+    '''
+    Estimated time of models arrival with confidence interval, in minutes.
+    '''
+    def __init__(self, minutes, low, high):
+        self.minutes = minutes
+        self.low = low
+        self.high = high
+
+    def __str__(self):
+        return '{} ({} - {}) minutes'.format(round(self.minutes, 2), round(self.low, 2), round(self.high, 2))
+
+def get_tuning_mode(params):
+    '''
+    Returns tuning mode name based on experiment params.
+    '''
+    params = params or {}
+    for mode, counts in MLJAR_TUNING_MODES.items():
+        if params.get('random_start_cnt', None) == counts['random_start_cnt'] and \
+            params.get('hill_climbing_cnt', None) == counts['hill_climbing_cnt']:
+            return mode
+    return None
+
+class ETAEstimator(object):
+    '''
+    Estimates remaining training time from run times of finished models.
+
+    Statistics of run_time (in seconds) are kept per (model_type, tuning_mode),
+    per model_type and globally. The same estimator can be reused between
+    experiments, so estimates improve with each finished model.
+    '''
+    def __init__(self, parallelism = None, z = 1.96):
+        self.parallelism = parallelism
+        self.z = z
+        self.observed_parallelism = 1
+        self._stats = {}
+        self._seen = set()
+
+    def _stats_for(self, key):
+        if key not in self._stats:
+            self._stats[key] = RunningStats()
+        return self._stats[key]
+
+    def observe(self, results, tuning_mode = None):
+        '''
+        Updates statistics with finished results, each result is counted once.
+        '''
+        learning_cnt = 0
+        for r in results or []:
+            if r.status == 'Learning':
+                learning_cnt += 1
+            if r.status != 'Done' or r.run_time is None or r.hid in self._seen:
+                continue
+            self._seen.add(r.hid)
+            run_time = float(r.run_time)
+            self._stats_for((r.model_type, tuning_mode)).add(run_time)
+            self._stats_for(r.model_type).add(run_time)
+            self._stats_for(None).add(run_time)
+        self.observed_parallelism = max(self.observed_parallelism, learning_cnt)
+
+    def _expected(self, model_type, tuning_mode, default):
+        for key in [(model_type, tuning_mode), model_type, None]:
+            stats = self._stats.get(key, None)
+            if stats is not None and stats.count > 0:
+                return stats.mean, stats.variance
+        # no observations, assume uniform distribution over [0, default]
+        return 0.5 * default, default * default / 12.0
+
+    def estimate(self, results, single_limit = 5.0, tuning_mode = None):
+        '''
+        Returns ETA for not finished results. The single_limit is in minutes.
+        '''
+        default = float(single_limit) * 60.0
+        total, variance = 0.0, 0.0
+        for r in results or []:
+            if r.status not in ['Initiated', 'Learning']:
+                continue
+            mean, var = self._expected(r.model_type, tuning_mode, default)
+            if r.status == 'Learning':
+                # on average half of the work is already done
+                mean, var = 0.5 * mean, 0.25 * var
+            total += mean
+            variance += var
+        parallelism = float(self.parallelism or self.observed_parallelism)
+        total /= parallelism
+        spread = self.z * math.sqrt(variance) / parallelism
+        return ETA(total / 60.0, max(total - spread, 0.0) / 60.0, (total + spread) / 60.0)
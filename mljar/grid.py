@@ -0,0 +1,155 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from .mljar import Mljar
+from .client.experiment import ExperimentClient
+from .model.experiment import ExperimentIndex
+from .watcher import ExperimentWatcher
+from .exceptions import BadValueException, IncorrectInputDataException
+
+from .log import logger
+
+class ExperimentHandle(object):
+    '''
+    Handle of experiment submitted in the grid.
+    The mljar attribute is Mljar object ready for predict. If experiment
+    was not created, the future holds the exception.
+    '''
+    def __init__(self, mljar, future):
+        self.mljar = mljar
+        self.future = future
+
+    @property
+    def experiment(self):
+        return self.mljar.experiment
+
+    def done(self):
+        return self.future.done()
+
+    def wait(self, timeout = None):
+        '''
+        Waits till experiment is done and returns the best model.
+        '''
+        state = self.future.result(timeout)
+        self.mljar.experiment = state.experiment
+        self.mljar.selected_algorithm = state.table.best()
+        return self.mljar.selected_algorithm
+
+class _LockedIndex(object):
+    '''
+    ExperimentIndex wrapper safe to use from many threads.
+    '''
+    def __init__(self, index):
+        self._index = index
+        self._lock = threading.Lock()
+
+    def add(self, expt):
+        with self._lock:
+            self._index.add(expt)
+
+    def with_title(self, title):
+        with self._lock:
+            return list(self._index.with_title(title))
+
+    def find(self, title, fingerprint):
+        with self._lock:
+            return self._index.find(title, fingerprint)
+
+def submit_grid(project, X, y, configs, validation_data = None, dataset_title = None,
+                    max_workers = 4, watcher = None):
+    '''
+    Submits many experiments over the same dataset.
+
+    Project, datasets and existing experiments are resolved once, then experiments
+    are created concurrently.
+    Args:
+        project: The project title.
+        configs: The list of dicts with Mljar arguments, each with unique 'experiment' title,
+                    for example [{'experiment': 'xgb-auc', 'algorithms': ['xgb'], 'metric': 'auc'}].
+        max_workers: The maximum number of experiments created at the same time.
+        watcher: The ExperimentWatcher used to wait for experiments. If not set,
+                    a new watcher is started and it is stopped when all experiments are done.
+    Returns:
+        The list of ExperimentHandle, in configs order. The experiment which was not
+        created does not stop the others, its handle future holds the exception.
+    '''
+    if len(configs) == 0:
+        return []
+    titles = [c.get('experiment', '') for c in configs]
+    if len(set(titles)) != len(titles):
+        raise BadValueException('Experiments titles in the grid should be unique')
+    if y.shape[0] != X.shape[0]:
+        raise IncorrectInputDataException('Sorry, there is a missmatch between X and y matrices shapes')
+    # parameters are validated in constructor
+    models = [Mljar(project = project, **c) for c in configs]
+    # resolve shared state once
+    first = models[0]
+    first._add_project(y)
+    first._add_datasets(X, y, validation_data, dataset_title)
+    index = _LockedIndex(ExperimentIndex(ExperimentClient(first.project.hid).get_experiments()))
+    for model in models:
+        model.project_task = first.project_task
+        model.project = first.project
+        model.dataset = first.dataset
+        model.dataset_vald = first.dataset_vald
+        model.wait_till_all_done = False
+
+    logger.info('MLJAR: add {} experiments'.format(len(models)))
+    def add_experiment(model):
+        try:
+            model._add_experiment(index)
+            return None
+        except Exception as e:
+            logger.error('Experiment {} was not created, {}'.format(model.experiment_title, str(e)))
+            return e
+    executor = ThreadPoolExecutor(max_workers = max_workers)
+    try:
+        errors = list(executor.map(add_experiment, models))
+    finally:
+        executor.shutdown()
+
+    own_watcher = watcher is None
+    if own_watcher:
+        watcher = ExperimentWatcher()
+    handles = []
+    for model, error in zip(models, errors):
+        if error is None:
+            future = watcher.watch(model.project.hid, model.experiment.hid)
+        else:
+            future = Future()
+            future.set_exception(error)
+        handles.append(ExperimentHandle(model, future))
+    if own_watcher:
+        watcher.start()
+        _stop_when_done(watcher, [h.future for h in handles])
+    return handles
+
+def _stop_when_done(watcher, futures):
+    pending = [len(futures)]
+    lock = threading.Lock()
+    def on_done(future):
+        with lock:
+            pending[0] -= 1
+            last = pending[0] == 0
+        if last:
+            watcher.stop()
+    for future in futures:
+        future.add_done_callback(on_done)
+
+def wait_all(handles, timeout = None):
+    '''
+    Waits till all experiments are done. Returns list in handles order with
+    the best model, the exception if experiment failed, or None if experiment
+    is not done before timeout.
+    '''
+    wait([h.future for h in handles], timeout)
+    results = []
+    for h in handles:
+        if not h.done():
+            results.append(None)
+            continue
+        try:
+            results.append(h.wait(0))
+        except Exception as e:
+            results.append(e)
+    return results
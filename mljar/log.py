@@ -1,4 +1,5 @@
 import logging
 
+# There is no logging configuration here, it is left to the application.
+# Without any handler configured, Python 3 prints warnings and errors to stderr.
 logger = logging.getLogger('mljar')
-logging.basicConfig(format='%(message)s', level=logging.ERROR)
@@ -0,0 +1,91 @@
+import os
+import json
+import time
+import threading
+
+from .utils import atomic_file_path
+from .log import logger
+
+MLJAR_METADATA_CACHE_TTL = 300 # seconds
+
+class MetadataCache(object):
+    '''
+    Local cache of titles lookups, for example (title, task) -> project hid
+    or (project hid, title) -> experiment hid.
+
+    Entries expire after ttl seconds. Clients invalidate entries when the cached
+    hid is not found. If path is set, the cache is persisted in JSON file.
+    '''
+    def __init__(self, ttl = MLJAR_METADATA_CACHE_TTL, path = None):
+        self.ttl = ttl
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+        if self.path is not None and os.path.exists(self.path):
+            self._load()
+
+    @staticmethod
+    def _key(key):
+        return json.dumps(list(key))
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(self._key(key), None)
+        if entry is None:
+            return None
+        value, created_at = entry
+        if self.ttl is not None and time.time() - created_at > self.ttl:
+            self.invalidate(key)
+            return None
+        return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[self._key(key)] = (value, time.time())
+        self._save()
+
+    def invalidate(self, key):
+        with self._lock:
+            removed = self._entries.pop(self._key(key), None)
+        if removed is not None:
+            self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+        self._save()
+
+    def _load(self):
+        try:
+            with open(self.path) as fin:
+                self._entries = dict((k, tuple(v)) for k, v in json.load(fin).items())
+        except Exception as e:
+            logger.error('Cannot read metadata cache, %s' % str(e))
+            self._entries = {}
+
+    def _save(self):
+        if self.path is None:
+            return
+        with self._lock:
+            entries = dict(self._entries)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        with atomic_file_path(self.path) as tmp_path:
+            with open(tmp_path, 'w') as fout:
+                json.dump(entries, fout)
+
+_metadata_cache = MetadataCache()
+
+def get_metadata_cache():
+    '''
+    Returns metadata cache shared by clients.
+    '''
+    return _metadata_cache
+
+def set_metadata_cache(cache):
+    '''
+    Sets metadata cache shared by clients, for example the one persisted on disk.
+    '''
+    global _metadata_cache
+    _metadata_cache = cache
@@ -4,7 +4,12 @@ import uuid
 import sys
 import json, requests
 import time
+import gzip
+import threading
+from collections import OrderedDict
 import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 
 from .utils import *
 from .exceptions import IncorrectInputDataException, UndefinedExperimentException
@@ -17,6 +22,16 @@ from .client.result import ResultClient
 from .client.prediction import PredictionClient
 from .client.predictjob import PredictJobClient
 from .client.prediction_download import PredictionDownloadClient
+from .model.project import Project
+from .model.dataset import Dataset
+from .model.experiment import Experiment
+from .model.result import Result
+from .model.result_table import ResultTable
+from .eta import ETAEstimator, get_tuning_mode
+from .webhook import get_waiter
+from .cleanup import get_cleaner, MLJAR_TEMPORARY_PREFIX
+from .sampling import stratified_sample
+from .timing import TimingRecorder, use_recorder, run_with_recorder, phase, timed
 
 from .log import logger
 
@@ -41,6 +56,8 @@ class Mljar(object):
         Args:
             tuning_mode: This parameter controls number of models that will be checked
                             for each selected algorithm. There available modes: Normal, Sport, Insane.
+                            Baseline mode checks a single random model and a single
+                            hill climbing step for each algorithm.
             algorithms: The list of algorithms that will be checked. The list depends on project task which will be guessed based on target column values.
                         For binary classification task available algorithm are:
                          - xgb which is for Xgboost
@@ -96,9 +113,9 @@ class Mljar(object):
 
         if tuning_mode is None:
             tuning_mode = MLJAR_DEFAULT_TUNING_MODE
-        if tuning_mode not in ['Normal', 'Sport', 'Insane']:
+        if tuning_mode not in MLJAR_TUNING_MODES:
             raise BadValueException('There is a wrong tuning mode selected. \
-                                        There are available modes: Normal, Sport, Insane.')
+                                        There are available modes: Normal, Sport, Insane, Baseline.')
         self.tuning_mode = tuning_mode
         # below params are validated later
         self.algorithms = algorithms
@@ -108,6 +125,21 @@ class Mljar(object):
         self.selected_algorithm = None
         self.project = None
         self.experiment = None
+        self.eta_estimator = ETAEstimator()
+        self.prediction_cache = None
+        # opt-in dataset serialization engine, for example ParallelSerializer
+        self.dataset_engine = None
+        # find existing datasets by sampled hash, for huge datasets
+        self.sampled_fingerprint = False
+        # chunks store for append-only datasets, for example LocalChunkStore
+        self.delta_store = None
+        # quick experiment on subsample, created by fit in baseline mode
+        self.baseline = None
+        self._full_experiment = None
+        # guards dataset and experiment set by the full experiment thread in baseline mode
+        self._state_lock = threading.Lock()
+        # durations, bytes and requests counts of fit and predict phases
+        self.timings = TimingRecorder()
 
         self.validation_kfolds = validation_kfolds
         self.validation_shuffle = validation_shuffle
@@ -123,7 +155,8 @@ class Mljar(object):
                 raise MljarException('Wrong validation_train_split parameter value, it should be in (0.05, 0.95) range.')
 
 
-    def fit(self, X, y, validation_data = None, wait_till_all_done = True, dataset_title = None):
+    def fit(self, X, y, validation_data = None, wait_till_all_done = True, dataset_title = None,
+                baseline = False, baseline_rows = MLJAR_BASELINE_SAMPLE_ROWS):
         '''
         Fit models with MLJAR engine.
         Args:
@@ -135,6 +168,11 @@ class Mljar(object):
                                 till experiment is done.
             dataset_title: The title of your dataset. It is optional. If missing the
                             random title will be generated.
+            baseline: The flag which decides if quick experiment in Baseline tuning mode
+                        should be started first on stratified subsample of baseline_rows samples.
+                        The full dataset is uploaded in the background and the full
+                        experiment is started when it is ready. Predict uses the best
+                        model from both experiments.
         '''
         self.wait_till_all_done = wait_till_all_done
         # check input data dimensions
@@ -144,25 +182,122 @@ class Mljar(object):
             raise IncorrectInputDataException('Sorry, there is a missmatch between X and y matrices shapes')
 
         try:
-            self._start_experiment(X, y, validation_data, dataset_title)
+            with use_recorder(self.timings):
+                if baseline and X.shape[0] > baseline_rows:
+                    self._start_baseline_experiment(X, y, validation_data, dataset_title, baseline_rows)
+                else:
+                    self._start_experiment(X, y, validation_data, dataset_title)
         except Exception as e:
             print('Ups, {0}'.format(str(e)))
 
 
     def _start_experiment(self, X, y, validation_data = None, dataset_title = None):
 
+        self._add_project(y)
+        self._add_datasets(X, y, validation_data, dataset_title)
+        self._add_experiment()
+        #
+        # get results
+        #
+        # results = ResultClient(self.project.hid).get_results(self.experiment.hid)
+        #
+        # wait for models ...
+        #
+        if self.wait_till_all_done:
+            self.selected_algorithm = self._wait_till_all_models_trained()
+
+    def _start_baseline_experiment(self, X, y, validation_data, dataset_title, baseline_rows):
+        self._add_project(y)
+        #
+        # quick experiment on stratified subsample
+        #
+        positions = stratified_sample(y, baseline_rows, self.project_task)
+        take = lambda data: data.iloc[positions] if isinstance(data, (pd.DataFrame, pd.Series)) else data[positions]
+        self.baseline = self._make_child(self.experiment_title + '-baseline', 'Baseline')
+        logger.info('MLJAR: add baseline experiment')
+        self.baseline._add_datasets(take(X), take(y), validation_data,
+                                        None if dataset_title is None else dataset_title + '-baseline')
+        self.baseline._add_experiment()
+        #
+        # full dataset is uploaded in the background, the full experiment
+        # is published when it is created, so predict can be called meanwhile
+        #
+        def start_full_experiment():
+            full = self._make_child(self.experiment_title, self.tuning_mode)
+            full._add_datasets(X, y, validation_data, dataset_title)
+            full._add_experiment()
+            with self._state_lock:
+                self.dataset, self.dataset_vald = full.dataset, full.dataset_vald
+                self.experiment = full.experiment
+        executor = ThreadPoolExecutor(max_workers = 1)
+        self._full_experiment = executor.submit(run_with_recorder(self.timings, start_full_experiment))
+        executor.shutdown(wait = False)
+        if self.wait_till_all_done:
+            self._full_experiment.result()
+            self._wait_till_all_models_trained()
+            self.selected_algorithm = self._get_the_best_available_result()
+
+    def _make_child(self, experiment_title, tuning_mode):
+        '''
+        Returns Mljar with the same settings and resolved project, used for
+        baseline and full experiments created by fit in baseline mode.
+        '''
+        child = Mljar(project = self.project_title, experiment = experiment_title,
+                        metric = self.metric, algorithms = self.algorithms,
+                        validation_kfolds = self.validation_kfolds,
+                        validation_shuffle = self.validation_shuffle,
+                        validation_stratify = self.validation_stratify,
+                        validation_train_split = self.validation_train_split,
+                        tuning_mode = tuning_mode, create_ensemble = self.create_ensemble,
+                        single_algorithm_time_limit = self.single_algorithm_time_limit)
+        child.project_task = self.project_task
+        child.project = self.project
+        child.wait_till_all_done = False
+        child.dataset_engine = self.dataset_engine
+        child.sampled_fingerprint = self.sampled_fingerprint
+        child.delta_store = self.delta_store
+        return child
+
+    def _get_the_best_available_result(self):
+        '''
+        Returns the best result from baseline and full experiments.
+        '''
+        if self._full_experiment is not None and self._full_experiment.done() and \
+                self._full_experiment.exception() is not None:
+            logger.error('Full experiment was not started, %s' % str(self._full_experiment.exception()))
+        results = []
+        for model in [self.baseline, self]:
+            with model._state_lock:
+                experiment = model.experiment
+            if experiment is not None:
+                experiment = ExperimentClient(model.project.hid).get_experiment(experiment.hid)
+                with model._state_lock:
+                    model.experiment = experiment
+                if experiment.compute_now in [1, 2]:
+                    results += ResultClient(model.project.hid).get_results(experiment.hid)
+        metric = self.baseline.experiment.metric
+        return ResultTable(results, metric).best()
+
+    def _add_project(self, y):
         # define project task
-        self.project_task = 'bin_class' if len(np.unique(y)) == 2 else 'reg'
+        with phase('task_inference'):
+            self.project_task = 'bin_class' if len(np.unique(y)) == 2 else 'reg'
         #
         # check if project with such title exists
         #
         logger.info('MLJAR: add project')
-        self.project = ProjectClient().create_project_if_not_exists(self.project_title, self.project_task)
+        with phase('project_resolution'):
+            self.project = ProjectClient().create_project_if_not_exists(self.project_title, self.project_task)
+
+    def _add_datasets(self, X, y, validation_data = None, dataset_title = None):
         #
         # add a dataset to project
         #
         logger.info('MLJAR: add training dataset')
-        self.dataset = DatasetClient(self.project.hid).add_dataset_if_not_exists(X, y, title_prefix = 'Training-', dataset_title = dataset_title)
+        self.dataset = DatasetClient(self.project.hid).add_dataset_if_not_exists(X, y, title_prefix = 'Training-', dataset_title = dataset_title,
+                                                                                        engine = self.dataset_engine,
+                                                                                        sampled_fingerprint = self.sampled_fingerprint,
+                                                                                        delta_store = self.delta_store)
 
         self.dataset_vald = None
         if validation_data is not None:
@@ -170,7 +305,13 @@ class Mljar(object):
                 raise MljarException('Wrong format of validation data. It should be tuple (X,y)')
             logger.info('MLJAR: add validation dataset')
             X_vald, y_vald = validation_data
-            self.dataset_vald = DatasetClient(self.project.hid).add_dataset_if_not_exists(X_vald, y_vald, title_prefix = 'Validation-')
+            self.dataset_vald = DatasetClient(self.project.hid).add_dataset_if_not_exists(X_vald, y_vald, title_prefix = 'Validation-',
+                                                                                        engine = self.dataset_engine,
+                                                                                        sampled_fingerprint = self.sampled_fingerprint,
+                                                                                        delta_store = self.delta_store)
+
+    @timed('experiment_creation')
+    def _add_experiment(self, index = None):
         #
         # add experiment to project
         #
@@ -180,25 +321,20 @@ class Mljar(object):
                                                     self.validation_kfolds, self.validation_shuffle, \
                                                     self.validation_stratify, self.validation_train_split, \
                                                     self.algorithms, self.metric, \
-                                                    self.tuning_mode, self.single_algorithm_time_limit, self.create_ensemble)
+                                                    self.tuning_mode, self.single_algorithm_time_limit, self.create_ensemble,
+                                                    index = index)
         if self.experiment is None:
             raise UndefinedExperimentException()
-        #
-        # get results
-        #
-        # results = ResultClient(self.project.hid).get_results(self.experiment.hid)
-        #
-        # wait for models ...
-        #
-        if self.wait_till_all_done:
-            self.selected_algorithm = self._wait_till_all_models_trained()
 
+    @timed('training_wait')
     def _wait_till_all_models_trained(self):
         WAIT_INTERVAL = 10.0
         loop_max_counter = 24*360 # 24 hours of max waiting, is enough ;)
         results = None
         max_error_cnt = 5
         current_error_cnt = 0
+        # waiter is woken up by experiment and results notifications (if webhook receiver is running)
+        waiter = get_waiter([('experiment', self.experiment.hid), ('result', None)])
         while True:
             loop_max_counter -= 1
             if loop_max_counter <= 0:
@@ -220,7 +356,7 @@ class Mljar(object):
                 sys.stdout.write("\rinitiated: {}, learning: {}, done: {}, error: {} | ETA: {} minutes                         ".format(initiated_cnt, learning_cnt, done_cnt, error_cnt, eta))
                 sys.stdout.flush()
 
-                time.sleep(WAIT_INTERVAL)
+                waiter.sleep(WAIT_INTERVAL)
             except KeyboardInterrupt:
                 break
             except Exception as e:
@@ -240,10 +376,9 @@ class Mljar(object):
             Estimated time of models arrival, in minutes.
         '''
         single_alg_limit = float(self.experiment.params.get('single_limit', 5.0))
-        initiated_cnt, learning_cnt, done_cnt, error_cnt = self._get_results_stats(results)
-        total = (initiated_cnt * single_alg_limit) / float(max(learning_cnt,1))
-        total += 0.5 * single_alg_limit
-        return total
+        tuning_mode = get_tuning_mode(self.experiment.params)
+        self.eta_estimator.observe(results, tuning_mode)
+        return self.eta_estimator.estimate(results, single_alg_limit, tuning_mode).minutes
 
     def _get_results_stats(self, results):
         initiated_cnt, learning_cnt, done_cnt, error_cnt = 0, 0, 0, 0
@@ -261,20 +396,109 @@ class Mljar(object):
     def _get_the_best_result(self, results):
         the_best_result = None
         if self.experiment.compute_now in [1, 2]:
-            opt_direction = 1 if self.experiment.metric \
-                                        not in MLJAR_OPT_MAXIMIZE else -1
-            min_value = 10e12
-            for r in results:
-                if r.metric_value is None:
-                    continue
-                if r.metric_value*opt_direction < min_value:
-                    min_value = r.metric_value*opt_direction
-                    the_best_result = r
+            the_best_result = ResultTable(results, self.experiment.metric).best()
         return the_best_result
 
 
+    STATE_VERSION = 1
+
+    def save_state(self, file_path):
+        '''
+        Saves resolved project, datasets, experiment and selected model
+        into gzipped JSON file, so session can be restored with load_state.
+        The baseline experiment is saved too, but the full experiment which
+        is still being uploaded in the background is not resumed by load_state.
+        '''
+        state = self._get_state()
+        state['version'] = Mljar.STATE_VERSION
+        state['saved_at'] = time.time()
+        with gzip.open(file_path, 'wb') as fout:
+            fout.write(json.dumps(state).encode('utf-8'))
+
+    def _get_state(self):
+        def dump(obj):
+            if obj is None:
+                return None
+            fields = obj.schema.fields
+            # skip empty values which can not be loaded back
+            return dict((k, v) for k, v in obj.to_dict().items()
+                            if v is not None or fields[k].allow_none)
+        return {
+            'params': {
+                'project': self.project_title,
+                'experiment': self.experiment_title,
+                'metric': self.metric,
+                'algorithms': self.algorithms,
+                'validation_kfolds': self.validation_kfolds,
+                'validation_shuffle': self.validation_shuffle,
+                'validation_stratify': self.validation_stratify,
+                'validation_train_split': self.validation_train_split,
+                'tuning_mode': self.tuning_mode,
+                'create_ensemble': self.create_ensemble,
+                'single_algorithm_time_limit': self.single_algorithm_time_limit
+            },
+            'project_task': getattr(self, 'project_task', None),
+            'project': dump(self.project),
+            'dataset': dump(getattr(self, 'dataset', None)),
+            'dataset_vald': dump(getattr(self, 'dataset_vald', None)),
+            'experiment': dump(self.experiment),
+            'selected_algorithm': dump(self.selected_algorithm),
+            'baseline': self.baseline._get_state() if self.baseline is not None else None
+        }
+
+    @classmethod
+    def load_state(cls, file_path, max_age = None, check_experiment = False):
+        '''
+        Restores Mljar object saved with save_state.
+        Args:
+            max_age: The maximum age of saved state in seconds. Older state
+                        raises MljarException.
+            check_experiment: The flag which decides if experiment should be
+                        fetched from MLJAR to check that it still exists.
+        '''
+        with gzip.open(file_path, 'rb') as fin:
+            state = json.loads(fin.read().decode('utf-8'))
+        if state.get('version', None) != Mljar.STATE_VERSION:
+            raise MljarException('Unknown version of saved Mljar state')
+        if max_age is not None and time.time() - state['saved_at'] > max_age:
+            raise MljarException('Saved Mljar state is stale')
+        model = cls._from_state(state)
+        if check_experiment and model.experiment is not None:
+            experiment = ExperimentClient(model.project.hid).get_experiment(model.experiment.hid)
+            if experiment is None:
+                raise MljarException('Experiment from saved Mljar state does not exist')
+            model.experiment = experiment
+        return model
+
+    @classmethod
+    def _from_state(cls, state):
+        def load(model_class, dct):
+            return model_class.from_dict(dct) if dct is not None else None
+        model = cls(**state['params'])
+        model.project_task = state['project_task']
+        model.project = load(Project, state['project'])
+        model.dataset = load(Dataset, state['dataset'])
+        model.dataset_vald = load(Dataset, state['dataset_vald'])
+        model.experiment = load(Experiment, state['experiment'])
+        model.selected_algorithm = load(Result, state['selected_algorithm'])
+        # state saved before baseline experiments were persisted has no baseline
+        if state.get('baseline', None) is not None:
+            model.baseline = cls._from_state(state['baseline'])
+            model.baseline.wait_till_all_done = False
+        return model
+
     def predict(self, X):
-        if self.project is None or self.experiment is None:
+        if self.baseline is not None:
+            with self._state_lock:
+                experiment = self.experiment
+            # the best model can change till the full experiment is done
+            if experiment is None or experiment.compute_now != 2:
+                self.selected_algorithm = self._get_the_best_available_result()
+            if self.selected_algorithm is None:
+                print('There is no ready model to use for prediction.')
+                print('Please wait and try in a moment')
+                return None
+        if self.project is None or (self.experiment is None and self.baseline is None):
             print('Can not run prediction.')
             print('Please run fit method first, to start models training and to retrieve them ;)')
             return None
@@ -294,7 +518,9 @@ class Mljar(object):
 
         if self.selected_algorithm is not None:
 
-            return Mljar.compute_prediction(X, self.selected_algorithm.hid, self.project.hid)
+            with use_recorder(self.timings):
+                return Mljar.compute_prediction(X, self.selected_algorithm.hid, self.project.hid,
+                                                    cache = self.prediction_cache)
             '''
             # chack if dataset exists in mljar if not upload dataset for prediction
             dataset = DatasetClient(self.project.hid).add_dataset_if_not_exists(X, y = None)
@@ -331,39 +557,185 @@ class Mljar(object):
 
 
     @staticmethod
-    def compute_prediction(X, model_id, project_id, keep_dataset = False, dataset_title = None):
-
+    def compute_prediction(X, model_id, project_id, keep_dataset = False, dataset_title = None, cache = None):
+        '''
+        Computes predictions for X with selected model.
+        Args:
+            keep_dataset: The flag which decides if uploaded dataset should be kept.
+                            If not, it is deleted in the background, use
+                            get_cleaner().flush() to wait for deletion.
+            cache: The PredictionCache instance. If set, then predictions for
+                    the same input and model are served from local cache.
+        '''
+        if cache is not None:
+            cache_key = cache.key(X, model_id)
+            pred = cache.get(cache_key)
+            if pred is not None:
+                logger.info('Prediction loaded from cache')
+                return pred
 
         # chack if dataset exists in mljar if not upload dataset for prediction
-        dataset = DatasetClient(project_id).add_dataset_if_not_exists(X, y = None, title_prefix = 'Testing-', dataset_title = dataset_title)
+        # temporary datasets left by crashed runs are collected by the cleaner
+        title_prefix = 'Testing-' if keep_dataset else MLJAR_TEMPORARY_PREFIX
+        # the dataset found by hash might be scheduled for delete by previous prediction,
+        # the cleaner does not delete it while it is used
+        with get_cleaner().using(project_id) as use:
+            dataset = use(DatasetClient(project_id).add_dataset_if_not_exists(X, y = None, title_prefix = title_prefix,
+                                                                                dataset_title = dataset_title))
+            pred = Mljar._predict_on_dataset(dataset, model_id, project_id)
+        if pred is not None:
+            if cache is not None:
+                cache.put(cache_key, pred)
+            if not keep_dataset:
+                # dataset is deleted in the background, it measures only scheduling
+                with phase('cleanup'):
+                    get_cleaner().schedule(project_id, dataset.hid)
+        return pred
 
+    @staticmethod
+    def _predict_on_dataset(dataset, model_id, project_id, waiter = None):
+        '''
+        Submits predict job for uploaded dataset, waits for prediction and downloads it.
+        '''
         # check if prediction is available
-        total_checks = 1000
-        for i in range(total_checks):
-            prediction = PredictionClient(project_id).\
-                            get_prediction(dataset.hid, model_id)
-
-            # prediction is not available, first check so submit job
-            if i == 0 and prediction is None:
+        prediction = PredictionClient(project_id).get_prediction(dataset.hid, model_id)
+        # prediction is not available, so submit job
+        if prediction is None:
+            with phase('predict_job'):
                 # create prediction job
                 submitted = PredictJobClient().submit(project_id, dataset.hid,
                                                         model_id)
                 if not submitted:
                     logger.error('Problem with prediction for your dataset')
                     return None
+                if waiter is None:
+                    waiter = get_waiter([('prediction', None)], timeout = MLJAR_PREDICTION_TIMEOUT)
+                prediction = waiter.wait_until(lambda: PredictionClient(project_id).\
+                                                        get_prediction(dataset.hid, model_id))
 
-            if prediction is not None:
-                pred = PredictionDownloadClient().download(prediction.hid)
-                #sys.stdout.write('\r\n')
-                if not keep_dataset:
-                    DatasetClient(project_id).delete_dataset(dataset.hid)
-                return pred
+        if prediction is not None:
+            return PredictionDownloadClient().download(prediction.hid)
 
-            #sys.stdout.write('\rFetch predictions: {0}%'.format(round(i/(total_checks*0.01))))
-            #sys.stdout.flush()
-            time.sleep(10)
-
-        #sys.stdout.write('\r\n')
         logger.error('Sorry, there was some problem with computing prediction for your dataset. \
                         Please login to mljar.com to your account and check details.')
         return None
+
+    @staticmethod
+    def compute_prediction_batched(X, model_id, project_id, batch_size = 100000, max_workers = 4,
+                                    keep_dataset = False, dataset_title = None):
+        '''
+        Computes predictions for large X in batches. Batches are uploaded, predicted
+        and downloaded concurrently, so network transfer of one batch overlaps with
+        computation of the others.
+        Args:
+            batch_size: The maximum number of rows in a single batch.
+            max_workers: The maximum number of batches processed at the same time.
+        Returns:
+            The pandas DataFrame with predictions in the same rows order as X.
+        '''
+        if batch_size <= 0:
+            raise BadValueException('The batch_size should be positive')
+        n_rows = X.shape[0]
+        slices = [(start, min(start + batch_size, n_rows)) for start in range(0, n_rows, batch_size)]
+
+        uploaded = []
+        title_prefix = 'Testing-' if keep_dataset else MLJAR_TEMPORARY_PREFIX
+
+        def process(batch):
+            i, (start, stop) = batch
+            X_batch = X.iloc[start:stop] if isinstance(X, pd.DataFrame) else X[start:stop]
+            title = None if dataset_title is None else '{}-batch-{}'.format(dataset_title, i+1)
+            # batches do not wait for other datasets in the project, so they are processed concurrently
+            with get_cleaner().using(project_id) as use:
+                dataset = use(DatasetClient(project_id).add_dataset_if_not_exists(X_batch, y = None,
+                                                        title_prefix = title_prefix, dataset_title = title,
+                                                        wait_for_all = False))
+                uploaded.append(dataset.hid)
+                return Mljar._predict_on_dataset(dataset, model_id, project_id)
+
+        executor = ThreadPoolExecutor(max_workers = max_workers)
+        try:
+            preds = list(executor.map(process, enumerate(slices)))
+        finally:
+            executor.shutdown()
+            # uploaded datasets are removed also if some batch failed,
+            # the same batch content is stored as one dataset, so remove each dataset once
+            if not keep_dataset:
+                for dataset_hid in set(uploaded):
+                    get_cleaner().schedule(project_id, dataset_hid)
+        if len(preds) == 0 or any(pred is None for pred in preds):
+            return None
+        return pd.concat(preds, ignore_index = True)
+
+
+    @staticmethod
+    def predict_many(X, model_ids, project_id, keep_dataset = False, dataset_title = None,
+                        ensemble = False, max_workers = 4):
+        '''
+        Computes predictions for X with several models. The X is uploaded once
+        and there is one predict job submitted for all models.
+        Args:
+            model_ids: The list of models hids.
+            ensemble: The flag which decides if average of models predictions
+                        should be added as 'ensemble' column.
+            max_workers: The number of concurrent predictions downloads.
+        Returns:
+            The pandas DataFrame with one column of predictions per model, aligned with X rows.
+        '''
+        # duplicated models are predicted once
+        model_ids = list(OrderedDict.fromkeys(model_ids))
+        # temporary datasets left by crashed runs are collected by the cleaner
+        title_prefix = 'Testing-' if keep_dataset else MLJAR_TEMPORARY_PREFIX
+        # the dataset is not deleted by the cleaner till predictions are downloaded
+        with get_cleaner().using(project_id) as use:
+            dataset = use(DatasetClient(project_id).add_dataset_if_not_exists(X, y = None, title_prefix = title_prefix,
+                                                                                dataset_title = dataset_title))
+            preds = Mljar._predict_many_on_dataset(dataset, model_ids, project_id, max_workers)
+        if preds is None:
+            return None
+        if not keep_dataset:
+            get_cleaner().schedule(project_id, dataset.hid)
+
+        pred = pd.DataFrame(dict((m, p.iloc[:, 0].values) for m, p in zip(model_ids, preds)),
+                                columns = model_ids)
+        if ensemble:
+            pred['ensemble'] = pred[model_ids].mean(axis = 1)
+        return pred
+
+    @staticmethod
+    def _predict_many_on_dataset(dataset, model_ids, project_id, max_workers):
+        '''
+        Submits one predict job for models, waits for predictions and downloads them in models order.
+        '''
+        predictions = {}
+
+        def check():
+            pending = [m for m in model_ids if m not in predictions]
+            for model_id in pending:
+                prediction = PredictionClient(project_id).get_prediction(dataset.hid, model_id)
+                if prediction is not None:
+                    predictions[model_id] = prediction
+            return True if len(predictions) == len(model_ids) else None
+
+        # submit one job for all models without predictions
+        if check() is None:
+            submitted = PredictJobClient().submit(project_id, dataset.hid,
+                                                    [m for m in model_ids if m not in predictions])
+            if not submitted:
+                logger.error('Problem with prediction for your dataset')
+                return None
+            get_waiter([('prediction', None)], timeout = MLJAR_PREDICTION_TIMEOUT).wait_until(check)
+
+        if len(predictions) < len(model_ids):
+            logger.error('Sorry, there was some problem with computing prediction for your dataset. \
+                            Please login to mljar.com to your account and check details.')
+            return None
+
+        def download(model_id):
+            return PredictionDownloadClient().download(predictions[model_id].hid)
+
+        executor = ThreadPoolExecutor(max_workers = max_workers)
+        try:
+            return list(executor.map(download, model_ids))
+        finally:
+            executor.shutdown()
@@ -1,6 +1,107 @@
 import json
+from marshmallow import fields, utils, ValidationError
+from marshmallow.compat import basestring
+
+# decoders built from schemas, one per model class
+_decoders = {}
+
+def _make_converter(field):
+    '''
+    Returns function which deserializes value the same way as marshmallow field.
+    '''
+    if isinstance(field, fields.String):
+        def convert(value):
+            if not isinstance(value, basestring):
+                raise ValidationError('Not a valid string.')
+            return utils.ensure_text_type(value)
+    elif isinstance(field, fields.Number):
+        num_type = field.num_type
+        def convert(value):
+            try:
+                return num_type(value)
+            except (TypeError, ValueError):
+                raise ValidationError('Not a valid number.')
+    elif isinstance(field, fields.DateTime) and field.dateformat is None:
+        def convert(value):
+            if not value:
+                raise ValidationError('Not a valid datetime.')
+            try:
+                return utils.from_iso(value)
+            except (AttributeError, TypeError, ValueError):
+                raise ValidationError('Not a valid datetime.')
+    elif isinstance(field, fields.Dict):
+        def convert(value):
+            if not isinstance(value, dict):
+                raise ValidationError('Not a valid mapping type.')
+            return value
+    elif isinstance(field, fields.List):
+        convert_item = _make_converter(field.container)
+        item_allow_none = field.container.allow_none
+        def convert(value):
+            if not utils.is_collection(value):
+                raise ValidationError('Not a valid list.')
+            items = []
+            for v in value:
+                if v is None:
+                    if not item_allow_none:
+                        raise ValidationError('Field may not be null.')
+                    items.append(None)
+                else:
+                    items.append(convert_item(v))
+            return items
+    else:
+        # not known field type, use marshmallow deserialization
+        convert = field.deserialize
+    return convert
+
+def _make_lazy_check(field, compact):
+    '''
+    Returns function which only checks type of the raw value of lazy field,
+    the value is decoded on first access. If compact is True, nested values
+    are encoded back to JSON strings, which take much less memory.
+    '''
+    if isinstance(field, fields.DateTime):
+        def check(value):
+            if not value or not isinstance(value, basestring):
+                raise ValidationError('Not a valid datetime.')
+            return value
+    elif isinstance(field, (fields.Dict, fields.List)):
+        value_type, message = (dict, 'Not a valid mapping type.') if isinstance(field, fields.Dict) \
+                                else (list, 'Not a valid list.')
+        def check(value):
+            if not isinstance(value, value_type):
+                raise ValidationError(message)
+            return json.dumps(value) if compact else value
+    else:
+        check = _make_converter(field)
+    return check
+
+def lazy_property(name, decode):
+    '''
+    Property which keeps raw value (JSON or ISO datetime string) and
+    decodes it on first access.
+    '''
+    slot = '_' + name
+    def getter(self):
+        value = getattr(self, slot)
+        if isinstance(value, basestring):
+            value = decode(value)
+            setattr(self, slot, value)
+        return value
+    def setter(self, value):
+        setattr(self, slot, value)
+    return property(getter, setter)
+
+def lazy_json(name):
+    return lazy_property(name, json.loads)
+
+def lazy_datetime(name):
+    return lazy_property(name, utils.from_iso)
 
 class BaseModel(object):
+    __slots__ = ()
+    # fields kept raw by decoder and decoded on first access
+    _lazy_fields = ()
 
     def to_dict(self):
         return self.schema.dump(self).data
@@ -8,3 +109,67 @@ class BaseModel(object):
     @classmethod
     def from_dict(cls, dct):
         return cls.schema.load(dct).data
+
+    @classmethod
+    def _get_decoder(cls, compact = True):
+        '''
+        Builds (once per class and compact flag) decoder with the same semantics as schema load.
+        '''
+        decoder = _decoders.get((cls, compact), None)
+        if decoder is not None:
+            return decoder
+        specs = []
+        for name, field in cls.schema.fields.items():
+            if field.dump_only:
+                continue
+            convert = _make_lazy_check(field, compact) if name in cls._lazy_fields else _make_converter(field)
+            specs.append((field.load_from or name, field.attribute or name,
+                            field.allow_none, convert))
+
+        def decoder(dct):
+            data = {}
+            errors = {}
+            for key, attribute, allow_none, convert in specs:
+                if key not in dct:
+                    continue
+                value = dct[key]
+                if value is None:
+                    if allow_none:
+                        data[attribute] = None
+                    else:
+                        errors[key] = ['Field may not be null.']
+                    continue
+                try:
+                    data[attribute] = convert(value)
+                except ValidationError as e:
+                    errors[key] = e.messages
+            if errors:
+                raise ValidationError(errors)
+            return data
+
+        _decoders[(cls, compact)] = decoder
+        return decoder
+
+    def compact(self):
+        '''
+        Encodes heavy nested fields back to JSON strings, they are decoded again
+        on first access. Use it for objects which are kept for a long time.
+        '''
+        for name in self._lazy_fields:
+            value = getattr(self, '_' + name)
+            if isinstance(value, (dict, list)):
+                setattr(self, '_' + name, json.dumps(value))
+        return self
+
+    @classmethod
+    def from_list(cls, lst, compact = True):
+        '''
+        Creates model objects from list of dicts. It skips marshmallow
+        machinery, so it is much faster for long lists. Lazy fields
+        are only type checked and kept raw, datetimes are parsed on first access.
+        If compact is True, nested dict and list fields are kept as JSON strings
+        (as after compact()) and decoded on first access, otherwise the dicts
+        from response.json() are kept.
+        '''
+        decoder = cls._get_decoder(compact)
+        return [cls(**decoder(dct)) for dct in lst]
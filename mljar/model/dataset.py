@@ -29,6 +29,9 @@ class DatasetSchema(Schema):
 
 class Dataset(BaseModel):
     schema = DatasetSchema(strict=True)
+    __slots__ = ('hid', 'title', 'scope', 'created_at', 'created_by', 'parent_project', 'data_type',
+                    'dataset_hash', 'file_name', 'file_path', 'file_size', 'meta', 'prediction_only',
+                    'accepted', 'checked', 'derived', 'valid', 'text_msg', 'column_usage_min')
 
     def __init__(self, hid, title, scope, data_type,
                     file_name, file_path, file_size, meta, prediction_only,
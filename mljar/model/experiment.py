@@ -1,6 +1,6 @@
 from marshmallow import Schema, fields, post_load
 
-from .base import BaseModel
+from .base import BaseModel, lazy_json, lazy_datetime
 
 class ExperimentSchema(Schema):
     hid = fields.Str()
@@ -26,6 +26,15 @@ class ExperimentSchema(Schema):
 
 class Experiment(BaseModel):
     schema = ExperimentSchema(strict=True)
+    __slots__ = ('hid', 'title', 'description', '_created_at', 'created_by', 'parent_project',
+                    'models_cnt', 'task', 'metric', 'validation_scheme', 'total_timelog', 'bestalg',
+                    '_details', '_params', 'compute_now', '_computation_started_at', '_fingerprint')
+    _lazy_fields = ('created_at', 'details', 'params', 'computation_started_at')
+
+    created_at = lazy_datetime('created_at')
+    details = lazy_json('details')
+    params = lazy_json('params')
+    computation_started_at = lazy_datetime('computation_started_at')
 
     def __init__(self, hid, title, models_cnt, task, description, metric,
                     validation_scheme, details,
@@ -48,19 +57,55 @@ class Experiment(BaseModel):
         self.params = params
         self.compute_now = compute_now
         self.computation_started_at = computation_started_at
+        self._fingerprint = None
 
     def __str__(self):
         desc = 'Experiment id: {} title: {} metric: {} validation: {}\n'.format(self.hid, self.title, self.metric, self.validation_scheme)
         desc += 'Algorithms: {} single algorithm train time: {}\n'.format(str(self.params.get('algs', None)), str(self.params.get('single_limit', None)))
         return desc
 
+    def fingerprint(self):
+        '''
+        Canonical, hashable representation of experiment setup. It is computed once.
+        '''
+        if self._fingerprint is None:
+            params = self.params or {}
+            def dataset_id(dataset):
+                dataset = dataset or {}
+                return dataset.get('id', dataset.get('hid', None))
+            single_limit = params.get('single_limit', 0)
+            self._fingerprint = (
+                dataset_id(params.get('train_dataset', None)),
+                dataset_id(params.get('vald_dataset', None)),
+                str(self.metric),
+                str(self.validation_scheme),
+                tuple(sorted(params.get('algs', None) or [])),
+                int(float(single_limit)) if single_limit is not None else None,
+                tuple(sorted((params.get('preproc', None) or {}).items())),
+                params.get('random_start_cnt', None),
+                params.get('hill_climbing_cnt', None)
+            )
+        return self._fingerprint
+
     def equal(self, expt):
-        # sort algorithms names before comparison
-        algs   = sorted(self.params.get('algs', []))
-        algs_2 = sorted(expt.params.get('algs', []))
-        return  self.params['train_dataset'].get('hid', None) == expt.params['train_dataset'].get('hid', None) and \
-                self.metric == str(expt.metric) and \
-                self.validation_scheme == str(expt.validation_scheme) and \
-                '-'.join(algs) == '-'.join(algs_2) and \
-                int(self.params.get('single_limit', 0)) == int(expt.params.get('single_limit', 0)) and \
-                self.params.get('preproc', None) == expt.params.get('preproc', None)
+        return self.fingerprint() == expt.fingerprint()
+
+class ExperimentIndex(object):
+    '''
+    Index of experiments by title and by fingerprint.
+    '''
+    def __init__(self, experiments = None):
+        self._by_title = {}
+        self._by_fingerprint = {}
+        for expt in experiments or []:
+            self.add(expt)
+
+    def add(self, expt):
+        self._by_title.setdefault(expt.title, []).append(expt)
+        self._by_fingerprint.setdefault((expt.title, expt.fingerprint()), expt)
+
+    def with_title(self, title):
+        return self._by_title.get(title, [])
+
+    def find(self, title, fingerprint):
+        return self._by_fingerprint.get((title, fingerprint), None)
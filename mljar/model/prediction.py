@@ -19,6 +19,8 @@ class PredictionSchema(Schema):
 
 class Prediction(BaseModel):
     schema = PredictionSchema(strict=True)
+    __slots__ = ('hid', 'scope', 'created_by', 'created_at', 'parent_alg_hid',
+                    'prediction_on_dataset_title', 'alg_name', 'alg_on_dataset_title', 'alg_metric')
 
     def __init__(self, hid, scope, created_by, created_at, parent_alg_hid,
                     prediction_on_dataset_title, alg_name, alg_on_dataset_title,
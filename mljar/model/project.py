@@ -28,6 +28,9 @@ class ProjectSchema(Schema):
 
 class Project(BaseModel):
     schema = ProjectSchema(strict=True)
+    __slots__ = ('hid', 'title', 'description', 'task', 'info', 'created_at', 'created_by',
+                    'experiments_cnt', 'models_cnt', 'hardware', 'scope', 'datasets', 'topalg',
+                    'total_timelog', 'compute_now', 'insights')
 
     def __init__(self, hid, title, description, task, hardware, scope, created_at, created_by,
                     models_cnt, compute_now, experiments_cnt = None, datasets = None, topalg = None,
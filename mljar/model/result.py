@@ -1,6 +1,6 @@
 from marshmallow import Schema, fields, post_load
 
-from .base import BaseModel
+from .base import BaseModel, lazy_json, lazy_datetime
 
 class ResultSchema(Schema):
     hid = fields.Str()
@@ -28,6 +28,17 @@ class ResultSchema(Schema):
 
 class Result(BaseModel):
     schema = ResultSchema(strict=True)
+    __slots__ = ('hid', 'experiment', 'dataset', 'validation_scheme', 'model_type', 'metric_type',
+                    'metric_value', 'run_time', 'iters', 'status', 'status_detail', '_status_modify_at',
+                    '_importance', 'train_prediction_path', '_params', '_train_details', 'models_saved',
+                    '_metric_additional')
+    _lazy_fields = ('status_modify_at', 'importance', 'params', 'train_details', 'metric_additional')
+
+    status_modify_at = lazy_datetime('status_modify_at')
+    importance = lazy_json('importance')
+    params = lazy_json('params')
+    train_details = lazy_json('train_details')
+    metric_additional = lazy_json('metric_additional')
 
     def __init__(self, hid, experiment, dataset, validation_scheme, model_type, metric_type,
                     params, status, status_detail=None, status_modify_at=None, metric_value=None,
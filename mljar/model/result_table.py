@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+from marshmallow import ValidationError
+
+from .result import Result
+from ..utils import MLJAR_OPT_MAXIMIZE
+
+class ResultTable(object):
+    '''
+    Columnar view over experiment results (models).
+
+    Results are kept as NumPy/pandas columns indexed by result hid, so the leaderboard
+    queries (best, top-k, best per algorithm) are vectorized. The table can be
+    updated incrementally with the results from each poll.
+    '''
+    COLUMNS = ['model_type', 'metric_value', 'run_time', 'iters', 'status', 'status_modify_at']
+
+    def __init__(self, results = None, metric = None):
+        self.metric = metric
+        self.opt_direction = -1 if metric in MLJAR_OPT_MAXIMIZE else 1
+        self._items = {}
+        self._frame = self._build_frame([])
+        if results:
+            self.update(results)
+
+    @classmethod
+    def from_payload(cls, payload, metric = None):
+        '''
+        Builds table directly from the /results/ JSON payload (list of dicts).
+        '''
+        return cls(payload, metric)
+
+    def __len__(self):
+        return len(self._frame)
+
+    @property
+    def frame(self):
+        return self._frame
+
+    @staticmethod
+    def _get(item, key):
+        if isinstance(item, dict):
+            return item.get(key, None)
+        return getattr(item, key, None)
+
+    def _build_frame(self, items):
+        get = ResultTable._get
+        columns = {
+            'model_type': [get(r, 'model_type') for r in items],
+            'metric_value': np.array([get(r, 'metric_value') for r in items], dtype=float),
+            'run_time': np.array([get(r, 'run_time') for r in items], dtype=float),
+            'iters': np.array([get(r, 'iters') for r in items], dtype=float),
+            'status': [get(r, 'status') for r in items],
+            'status_modify_at': pd.to_datetime([get(r, 'status_modify_at') for r in items])
+        }
+        hids = pd.Index([get(r, 'hid') for r in items], name='hid')
+        return pd.DataFrame(columns, index=hids, columns=ResultTable.COLUMNS)
+
+    @staticmethod
+    def _decode(payload):
+        try:
+            return Result.from_list(payload)
+        except (TypeError, ValidationError):
+            # incomplete results are kept raw, get() reports the error
+            return payload
+
+    def update(self, results):
+        '''
+        Inserts new results and replaces the existing ones with the same hid.
+        '''
+        if results is None or len(results) == 0:
+            return self
+        new_frame = self._build_frame(results)
+        new_frame = new_frame[~new_frame.index.duplicated(keep='last')]
+        # raw payload is kept as compact Result objects, nested fields are decoded on access
+        if any(isinstance(r, dict) for r in results):
+            decoded = iter(ResultTable._decode([r for r in results if isinstance(r, dict)]))
+            results = [next(decoded) if isinstance(r, dict) else r for r in results]
+        for r in results:
+            self._items[ResultTable._get(r, 'hid')] = r
+        if len(self._frame) == 0:
+            self._frame = new_frame
+        else:
+            kept = self._frame[~self._frame.index.isin(new_frame.index)]
+            self._frame = pd.concat([kept, new_frame])
+        return self
+
+    def get(self, hid):
+        '''
+        Returns Result object for specified hid.
+        '''
+        item = self._items.get(hid, None)
+        if isinstance(item, dict):
+            item = Result.from_dict(item)
+            self._items[hid] = item
+        return item
+
+    def _ranked_positions(self, model_type = None, k = None):
+        scores = self._frame['metric_value'].values * self.opt_direction
+        mask = ~np.isnan(scores)
+        if model_type is not None:
+            mask &= (self._frame['model_type'].values == model_type)
+        positions = np.flatnonzero(mask)
+        if len(positions) == 0:
+            return positions
+        scores = scores[positions]
+        if k is not None and k < len(positions):
+            part = np.argpartition(scores, k-1)[:k]
+            positions, scores = positions[part], scores[part]
+        return positions[np.argsort(scores, kind='mergesort')]
+
+    def top_k(self, k, model_type = None):
+        '''
+        Returns k best results, optionally only for selected model_type.
+        '''
+        if k <= 0:
+            return []
+        hids = self._frame.index.values[self._ranked_positions(model_type, k)]
+        return [self.get(hid) for hid in hids]
+
+    def best(self, model_type = None):
+        '''
+        Returns the best result or None if there is no result with metric value.
+        '''
+        top = self.top_k(1, model_type)
+        return top[0] if top else None
+
+    def best_per_algorithm(self):
+        '''
+        Returns dict with the best result for each model_type.
+        '''
+        frame = self._frame[self._frame['metric_value'].notnull()]
+        if len(frame) == 0:
+            return {}
+        scores = frame['metric_value'] * self.opt_direction
+        hids = scores.groupby(frame['model_type'].values).idxmin()
+        return dict((model_type, self.get(hid)) for model_type, hid in hids.items())
+
+    def status_counts(self):
+        '''
+        Returns number of results in each status.
+        '''
+        return self._frame['status'].value_counts().to_dict()
@@ -0,0 +1,132 @@
+import io
+import os
+import uuid
+import hashlib
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+from .mljar import Mljar
+from .client.dataset import DatasetClient
+from .exceptions import IncorrectInputDataException
+
+from .log import logger
+
+def _iter_rows(lines):
+    '''
+    Joins CSV lines into rows, new lines in quoted values are kept.
+    Rows are returned without line terminator.
+    '''
+    row, quotes = [], 0
+    for line in lines:
+        row.append(line)
+        quotes += line.count('"')
+        # quotes in values are doubled, so row is complete if quotes are balanced
+        if quotes % 2 == 0:
+            yield ''.join(row).rstrip('\r\n')
+            row, quotes = [], 0
+    if row:
+        yield ''.join(row).rstrip('\r\n')
+
+class FeatureBlock(object):
+    '''
+    Features matrix serialized to CSV file once, it is combined with each target
+    column when the training file is written. Call close() to remove the file.
+    '''
+    def __init__(self, X):
+        if isinstance(X, np.ndarray):
+            X = pd.DataFrame(X, columns=['attribute_'+str(i+1) for i in range(X.shape[1])])
+        if 'target' in X.columns:
+            raise IncorrectInputDataException('Sorry, features matrix can not have a column named target')
+        self.n_rows = X.shape[0]
+        self.file_path = os.path.join(tempfile.gettempdir(), 'features-'+ str(uuid.uuid4())[:8]+'.csv')
+        X.to_csv(self.file_path, index=False, encoding='utf-8')
+        h = hashlib.sha1()
+        with open(self.file_path, 'rb') as fin:
+            for block in iter(lambda: fin.read(1 << 20), b''):
+                h.update(block)
+        self.digest = h.hexdigest()
+
+    def write_with_target(self, file_path, y):
+        '''
+        Writes CSV with features and target column. Returns fingerprint of the written data.
+        '''
+        y = np.asarray(y).reshape(-1)
+        if y.shape[0] != self.n_rows:
+            raise IncorrectInputDataException('Sorry, there is a missmatch between X and y matrices shapes')
+        target_csv = pd.DataFrame({'target': y}).to_csv(index=False)
+        fingerprint = hashlib.sha1((self.digest + '-' +
+                        hashlib.sha1(target_csv.encode('utf-8')).hexdigest()).encode('utf-8')).hexdigest()
+        target_rows = _iter_rows(io.StringIO(target_csv, newline=''))
+        with io.open(self.file_path, 'r', encoding='utf-8', newline='') as fin:
+            with io.open(file_path, 'w', encoding='utf-8', newline='') as fout:
+                for x, t in zip(_iter_rows(fin), target_rows):
+                    fout.write(x + ',' + t + '\n')
+        return fingerprint
+
+    def close(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+def fit_targets(project, experiment, X, Y, max_workers = 4, **params):
+    '''
+    Trains models for many targets over the same features matrix X.
+
+    X is serialized once, it is combined with each target column when writing
+    training file. Uploads and experiments creation run concurrently. Experiments
+    are titled '<experiment>-<target name>'. The function does not wait for training.
+    Args:
+        Y: The pandas DataFrame with target columns or dict with target vectors.
+        max_workers: The number of targets processed at the same time.
+        params: The other Mljar arguments, for example metric or algorithms.
+    Returns:
+        The dict with Mljar object for each target. If dataset or experiment of the target
+        was not created, there is the exception instead, it does not stop the other targets.
+    '''
+    if isinstance(Y, pd.DataFrame):
+        Y = dict((c, Y[c].values) for c in Y.columns)
+    models = dict((name, Mljar(project = project, experiment = '{}-{}'.format(experiment, name), **params))
+                    for name in Y)
+
+    # targets with the same values are uploaded one after another, so the dataset is found
+    locks, locks_guard = {}, threading.Lock()
+    def fingerprint_lock(fingerprint):
+        with locks_guard:
+            return locks.setdefault(fingerprint, threading.Lock())
+
+    def fit_target(name):
+        model, y = models[name], Y[name]
+        model.wait_till_all_done = False
+        file_path = os.path.join(tempfile.gettempdir(), 'dataset-'+ str(uuid.uuid4())[:8]+'.csv')
+        try:
+            fingerprint = block.write_with_target(file_path, y)
+            logger.info('MLJAR: add training dataset for target {}'.format(name))
+            with fingerprint_lock(fingerprint):
+                # targets do not wait for each other datasets, so they are uploaded concurrently
+                model.dataset = DatasetClient(model.project.hid).add_csv_dataset_if_not_exists(file_path,
+                                        fingerprint, title_prefix = 'Training-{}-'.format(name),
+                                        wait_for_all = False)
+            model.dataset_vald = None
+            model._add_experiment()
+            return model
+        except Exception as e:
+            logger.error('Target {} was not fitted, {}'.format(name, str(e)))
+            return e
+        finally:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    # projects are resolved one by one, to not create the same project twice
+    for name in Y:
+        models[name]._add_project(Y[name])
+
+    block = FeatureBlock(X)
+    executor = ThreadPoolExecutor(max_workers = max_workers)
+    try:
+        names = list(Y.keys())
+        return dict(zip(names, executor.map(fit_target, names)))
+    finally:
+        executor.shutdown()
+        block.close()
@@ -0,0 +1,239 @@
+import sys
+import time
+import zlib
+import struct
+import hashlib
+import multiprocessing
+
+from .log import logger
+
+try:
+    from multiprocessing import shared_memory
+except ImportError: # Python < 3.8
+    shared_memory = None
+
+MLJAR_PARALLEL_BLOCK_ROWS = 50000
+
+'''
+CRC-32 of concatenated data, the same algorithm as crc32_combine in zlib.
+'''
+def _gf2_matrix_times(mat, vec):
+    s, i = 0, 0
+    while vec:
+        if vec & 1:
+            s ^= mat[i]
+        vec >>= 1
+        i += 1
+    return s
+
+def _gf2_matrix_square(mat):
+    return [_gf2_matrix_times(mat, mat[n]) for n in range(32)]
+
+def crc32_combine(crc1, crc2, len2):
+    '''
+    Returns CRC-32 of A+B from crc1 = crc32(A), crc2 = crc32(B) and len2 = len(B).
+    '''
+    if len2 == 0:
+        return crc1
+    # operator for one zero bit
+    odd = [0xedb88320] + [1 << n for n in range(31)]
+    even = _gf2_matrix_square(odd) # two zero bits
+    odd = _gf2_matrix_square(even) # four zero bits
+    while True:
+        even = _gf2_matrix_square(odd)
+        if len2 & 1:
+            crc1 = _gf2_matrix_times(even, crc1)
+        len2 >>= 1
+        if len2 == 0:
+            break
+        odd = _gf2_matrix_square(even)
+        if len2 & 1:
+            crc1 = _gf2_matrix_times(odd, crc1)
+        len2 >>= 1
+        if len2 == 0:
+            break
+    return crc1 ^ crc2
+
+def compress_block(data, last, level = 6):
+    '''
+    Compresses block into raw deflate stream. Not last blocks are ended with full flush,
+    so compressed blocks can be concatenated into a single deflate stream.
+    Returns (compressed, crc32, size, sha1 digest).
+    '''
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data)
+    compressed += compressor.flush(zlib.Z_FINISH if last else zlib.Z_FULL_FLUSH)
+    return compressed, zlib.crc32(data) & 0xffffffff, len(data), hashlib.sha1(data).hexdigest()
+
+class ZipStreamWriter(object):
+    '''
+    Writes single-file ZIP archive from compressed deflate blocks.
+    '''
+    def __init__(self, file_path, arcname):
+        self.file_path = file_path
+        self.arcname = arcname.encode('utf-8')
+        self.crc = 0
+        self.size = 0
+        self.compressed_size = 0
+        t = time.localtime()
+        self._dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+        self._dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+    def __enter__(self):
+        self._fout = open(self.file_path, 'wb')
+        # sizes are written in zip64 extra field, they are updated on close
+        extra = struct.pack('<HHQQ', 1, 16, 0, 0)
+        self._fout.write(struct.pack('<IHHHHHIIIHH', 0x04034b50, 45, 0, 8, self._dos_time, self._dos_date,
+                                        0, 0xffffffff, 0xffffffff, len(self.arcname), len(extra)))
+        self._fout.write(self.arcname)
+        self._fout.write(extra)
+        return self
+
+    def write_block(self, compressed, crc, size):
+        self._fout.write(compressed)
+        self.crc = crc32_combine(self.crc, crc, size)
+        self.size += size
+        self.compressed_size += len(compressed)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self._finish()
+        finally:
+            self._fout.close()
+
+    def _finish(self):
+        fout = self._fout
+        cd_offset = fout.tell()
+        # update local header
+        fout.seek(14)
+        fout.write(struct.pack('<I', self.crc))
+        fout.seek(30 + len(self.arcname) + 4)
+        fout.write(struct.pack('<QQ', self.size, self.compressed_size))
+        fout.seek(cd_offset)
+        # central directory
+        zip64 = self.size >= 0xffffffff or self.compressed_size >= 0xffffffff
+        if zip64:
+            extra = struct.pack('<HHQQ', 1, 16, self.size, self.compressed_size)
+            size, compressed_size = 0xffffffff, 0xffffffff
+        else:
+            extra = b''
+            size, compressed_size = self.size, self.compressed_size
+        fout.write(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, 45, 45, 0, 8, self._dos_time,
+                                    self._dos_date, self.crc, compressed_size, size, len(self.arcname),
+                                    len(extra), 0, 0, 0, 0, 0))
+        fout.write(self.arcname)
+        fout.write(extra)
+        cd_size = fout.tell() - cd_offset
+        if zip64:
+            eocd64_offset = fout.tell()
+            fout.write(struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, 45, 45, 0, 0, 1, 1, cd_size, cd_offset))
+            fout.write(struct.pack('<IIQI', 0x07064b50, 0, eocd64_offset, 1))
+        fout.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, 1, 1, cd_size, cd_offset, 0))
+
+def _attach(name):
+    '''
+    Attaches to the memory owned by parent process, only the parent unlinks it.
+    '''
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # workers share the parent's resource tracker, so the segment is already registered
+    # there and must not be unregistered by workers
+    return shared_memory.SharedMemory(name=name)
+
+def _serialize_block(task):
+    '''
+    Serializes rows block to CSV and compresses it, it is run in worker process.
+    '''
+    import numpy as np
+    import pandas as pd
+    columns, start, stop, header, last, level = task
+    handles = []
+    cols = {}
+    try:
+        for name, kind, value in columns:
+            if kind == 'shm':
+                shm_name, dtype, n_rows = value
+                shm = _attach(shm_name)
+                handles.append(shm)
+                cols[name] = np.ndarray((n_rows,), dtype=np.dtype(dtype), buffer=shm.buf)[start:stop]
+            else:
+                cols[name] = value
+        block = pd.DataFrame(cols, columns=[c[0] for c in columns])
+        data = block.to_csv(index=False, header=header).encode('utf-8')
+        del block, cols
+    finally:
+        for shm in handles:
+            shm.close()
+    return compress_block(data, last, level)
+
+class ParallelSerializer(object):
+    '''
+    Opt-in engine which serializes, hashes and compresses data frame in a process pool.
+
+    The frame is partitioned into blocks of rows. Numeric columns are shared with workers
+    through shared memory buffers (Python 3.8+), other columns are sent per block.
+    Workers return compressed deflate blocks which are merged in order into one ZIP file.
+    The fingerprint is computed from blocks digests, so it is deterministic for
+    the same block_rows, no matter how many workers are used.
+    '''
+    def __init__(self, n_workers = None, block_rows = MLJAR_PARALLEL_BLOCK_ROWS, level = 6):
+        self.n_workers = n_workers or multiprocessing.cpu_count()
+        self.block_rows = block_rows
+        self.level = level
+
+    def _tasks(self, data, shared):
+        n_rows = data.shape[0]
+        starts = list(range(0, n_rows, self.block_rows)) or [0]
+        for i, start in enumerate(starts):
+            stop = min(start + self.block_rows, n_rows)
+            columns = []
+            for name in data.columns:
+                if name in shared:
+                    columns.append((name, 'shm', shared[name]))
+                else:
+                    columns.append((name, 'values', data[name].values[start:stop]))
+            yield (columns, start, stop, i == 0, i == len(starts) - 1, self.level)
+
+    def serialize(self, data, file_path_zip, arcname):
+        '''
+        Writes data as CSV compressed in ZIP file. Returns data fingerprint.
+        '''
+        import numpy as np
+        segments = []
+        shared = {}
+        try:
+            if shared_memory is not None and self.n_workers > 1:
+                for name in data.columns:
+                    values = data[name].values
+                    if values.dtype.kind not in 'biuf' or values.nbytes == 0:
+                        continue
+                    shm = shared_memory.SharedMemory(create=True, size=values.nbytes)
+                    segments.append(shm)
+                    np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+                    shared[name] = (shm.name, values.dtype.str, values.shape[0])
+            digests = hashlib.sha1()
+            with ZipStreamWriter(file_path_zip, arcname) as writer:
+                tasks = self._tasks(data, shared)
+                if self.n_workers > 1:
+                    pool = multiprocessing.Pool(self.n_workers)
+                    try:
+                        blocks = pool.imap(_serialize_block, tasks)
+                        for compressed, crc, size, digest in blocks:
+                            writer.write_block(compressed, crc, size)
+                            digests.update(digest.encode('utf-8'))
+                    finally:
+                        pool.close()
+                        pool.join()
+                else:
+                    for task in tasks:
+                        compressed, crc, size, digest = _serialize_block(task)
+                        writer.write_block(compressed, crc, size)
+                        digests.update(digest.encode('utf-8'))
+            logger.info('Data serialized in parallel, size: {} compressed: {}'.format(writer.size,
+                                                                                        writer.compressed_size))
+            return '{}-{}'.format(self.block_rows, digests.hexdigest())
+        finally:
+            for shm in segments:
+                shm.close()
+                shm.unlink()
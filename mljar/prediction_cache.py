@@ -0,0 +1,101 @@
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+
+from .utils import atomic_file_path
+from .log import logger
+
+MLJAR_DEFAULT_CACHE_SIZE = 512 * 1024 * 1024 # bytes
+
+class PredictionCache(object):
+    '''
+    On-disk cache of predictions keyed by (input fingerprint, model hid).
+
+    Predictions are stored column-wise in NumPy .npz files. When total size of the
+    cache exceeds max_size, the least recently used entries are removed.
+    '''
+    def __init__(self, path = None, max_size = MLJAR_DEFAULT_CACHE_SIZE):
+        if path is None:
+            path = os.path.join(os.path.expanduser('~'), '.mljar', 'predictions')
+        self.path = path
+        self.max_size = max_size
+        if not os.path.exists(self.path):
+            os.makedirs(self.path)
+
+    def key(self, X, model_id):
+        '''
+        Computes cache key for input data and model. The key covers
+        shape, column names, dtypes and all values.
+        '''
+        if not isinstance(X, pd.DataFrame):
+            X = pd.DataFrame(X)
+        h = hashlib.sha1()
+        h.update(str(X.shape).encode('utf-8'))
+        h.update(str([str(c) for c in X.columns]).encode('utf-8'))
+        h.update(str([str(d) for d in X.dtypes]).encode('utf-8'))
+        h.update(pd.util.hash_pandas_object(X, index=False).values.tobytes())
+        h.update(model_id.encode('utf-8'))
+        return h.hexdigest()
+
+    def _file_path(self, key):
+        return os.path.join(self.path, key + '.npz')
+
+    def get(self, key):
+        '''
+        Returns cached predictions or None.
+        '''
+        file_path = self._file_path(key)
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with np.load(file_path, allow_pickle=False) as data:
+                columns = list(data['columns'])
+                pred = pd.DataFrame(dict((c, data['col_%d' % i]) for i, c in enumerate(columns)),
+                                        columns=columns)
+            # mark as recently used
+            os.utime(file_path, None)
+            return pred
+        except Exception as e:
+            logger.error('Cannot read cached prediction, %s' % str(e))
+            return None
+
+    def put(self, key, pred):
+        '''
+        Stores predictions in cache.
+        '''
+        arrays = {'columns': np.array([str(c) for c in pred.columns])}
+        for i, c in enumerate(pred.columns):
+            values = pred[c].values
+            if values.dtype == object:
+                values = values.astype(str)
+            arrays['col_%d' % i] = values
+        with atomic_file_path(self._file_path(key), '.npz') as tmp_path:
+            np.savez(tmp_path, **arrays)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for fname in os.listdir(self.path):
+            if not fname.endswith('.npz') or fname.startswith('tmp-'):
+                continue
+            file_path = os.path.join(self.path, fname)
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file_path))
+        total = sum(e[1] for e in entries)
+        for mtime, size, file_path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(file_path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        for fname in os.listdir(self.path):
+            if fname.endswith('.npz'):
+                os.remove(os.path.join(self.path, fname))
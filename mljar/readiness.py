@@ -0,0 +1,67 @@
+import time
+import threading
+
+class Backoff(object):
+    '''
+    Geometrically growing wait intervals, in seconds.
+    '''
+    def __init__(self, initial = 0.5, factor = 2.0, max_interval = 10.0):
+        self.initial = initial
+        self.factor = factor
+        self.max_interval = max_interval
+        self.reset()
+
+    def reset(self):
+        self._current = self.initial
+
+    def next(self):
+        interval = self._current
+        self._current = min(self._current * self.factor, self.max_interval)
+        return interval
+
+class ReadinessWaiter(object):
+    '''
+    Waits till a resource is ready.
+
+    The check function is called with geometrically growing intervals. The check can
+    also block itself (long-polling), then the backoff only spaces retries. Calling
+    notify() (for example from a webhook receiver) wakes up the waiter, so the check
+    is repeated immediately.
+    '''
+    def __init__(self, timeout = None, initial = 0.5, factor = 2.0, max_interval = 10.0):
+        self.timeout = timeout
+        self.backoff = Backoff(initial, factor, max_interval)
+        self._event = threading.Event()
+
+    def notify(self):
+        self._event.set()
+
+    def sleep(self, interval):
+        '''
+        Sleeps for interval seconds or till notify() is called.
+        Returns True if waiter was notified.
+        '''
+        notified = self._event.wait(interval)
+        self._event.clear()
+        return bool(notified)
+
+    def wait_until(self, check):
+        '''
+        Returns the first not None result of check() or None if timeout is exceeded.
+        '''
+        deadline = None if self.timeout is None else time.time() + self.timeout
+        self.backoff.reset()
+        while True:
+            self._event.clear()
+            result = check()
+            if result is not None:
+                return result
+            interval = self.backoff.next()
+            if deadline is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                interval = min(interval, remaining)
+            if self._event.wait(interval):
+                # notified, the next check should see ready resource
+                self.backoff.reset()
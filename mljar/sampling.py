@@ -0,0 +1,32 @@
+import numpy as np
+
+def get_strata(y, task, n_bins = 10):
+    '''
+    Returns stratum index for each sample: class for classification,
+    quantile bin for regression.
+    '''
+    y = np.asarray(y).reshape(-1)
+    if task == 'bin_class':
+        _, strata = np.unique(y, return_inverse = True)
+        return strata
+    edges = np.percentile(y.astype(np.float64), np.linspace(0, 100, n_bins + 1)[1:-1])
+    return np.searchsorted(edges, y, side = 'right')
+
+def stratified_sample(y, n_samples, task, n_bins = 10, random_state = 0):
+    '''
+    Selects n_samples positions with the same strata distribution as in y.
+    Each non-empty stratum keeps at least one sample. Returns sorted positions.
+    '''
+    strata = get_strata(y, task, n_bins)
+    n_rows = strata.shape[0]
+    if n_samples >= n_rows:
+        return np.arange(n_rows)
+    counts = np.bincount(strata)
+    allocation = np.minimum(counts, np.maximum(1, np.round(counts * float(n_samples) / n_rows))).astype(np.int64)
+    # random order within each stratum
+    keys = np.random.RandomState(random_state).rand(n_rows)
+    order = np.lexsort((keys, strata))
+    sorted_strata = strata[order]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.arange(n_rows) - starts[sorted_strata]
+    return np.sort(order[rank < allocation[sorted_strata]])
@@ -0,0 +1,171 @@
+import time
+import functools
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+
+from .log import logger
+
+# the recorder and the stack of open phases of the current thread
+_local = threading.local()
+
+class PhaseTiming(object):
+    '''
+    Aggregated measurements of one phase. Duration is in seconds.
+    '''
+    __slots__ = ('name', 'count', 'duration', 'bytes', 'requests')
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.duration = 0.0
+        self.bytes = 0
+        self.requests = 0
+
+    def to_dict(self):
+        return {'count': self.count, 'duration': self.duration,
+                'bytes': self.bytes, 'requests': self.requests}
+
+    def __str__(self):
+        return '{}: {:.3f} s, {} bytes, {} requests ({} calls)'.format(self.name, self.duration,
+                                                                        self.bytes, self.requests, self.count)
+
+class TimingHook(object):
+    '''
+    Interface of timing hooks, for example to export measurements to metrics system.
+    on_phase is called after each phase with the measurements of this phase call.
+    '''
+    def on_phase(self, name, duration, n_bytes, n_requests):
+        pass
+
+class LoggingHook(TimingHook):
+    '''
+    Logs each phase measurements.
+    '''
+    def on_phase(self, name, duration, n_bytes, n_requests):
+        logger.info('Phase {}: {:.3f} s, {} bytes, {} requests'.format(name, duration, n_bytes, n_requests))
+
+class TimingRecorder(object):
+    '''
+    Records durations, byte counts and request counts per phase.
+
+    Phases can be nested, bytes and requests are counted in all open phases.
+    The recorder is active in the thread, where it is used with `use_recorder`.
+    '''
+    def __init__(self, hooks = None):
+        self.hooks = list(hooks or [])
+        self._phases = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def _add(self, name, duration, n_bytes, n_requests):
+        with self._lock:
+            timing = self._phases.get(name, None)
+            if timing is None:
+                timing = self._phases[name] = PhaseTiming(name)
+            timing.count += 1
+            timing.duration += duration
+            timing.bytes += n_bytes
+            timing.requests += n_requests
+        for hook in self.hooks:
+            try:
+                hook.on_phase(name, duration, n_bytes, n_requests)
+            except Exception as e:
+                logger.error('Timing hook failed, %s' % str(e))
+
+    def get(self, name):
+        with self._lock:
+            return self._phases.get(name, None)
+
+    def to_dict(self):
+        with self._lock:
+            return OrderedDict((name, timing.to_dict()) for name, timing in self._phases.items())
+
+    def reset(self):
+        with self._lock:
+            self._phases = OrderedDict()
+
+    def __str__(self):
+        with self._lock:
+            return '\n'.join(str(timing) for timing in self._phases.values())
+
+class _OpenPhase(object):
+    __slots__ = ('bytes', 'requests')
+
+    def __init__(self):
+        self.bytes = 0
+        self.requests = 0
+
+@contextmanager
+def use_recorder(recorder):
+    '''
+    Makes recorder active in the current thread.
+    '''
+    previous = getattr(_local, 'recorder', None), getattr(_local, 'stack', None)
+    _local.recorder, _local.stack = recorder, []
+    try:
+        yield recorder
+    finally:
+        _local.recorder, _local.stack = previous
+
+def current_recorder():
+    return getattr(_local, 'recorder', None)
+
+@contextmanager
+def phase(name):
+    '''
+    Measures the phase with the recorder active in the current thread.
+    It does nothing if there is no active recorder.
+    '''
+    recorder = current_recorder()
+    if recorder is None:
+        yield
+        return
+    open_phase = _OpenPhase()
+    _local.stack.append(open_phase)
+    start = time.time()
+    try:
+        yield
+    finally:
+        duration = time.time() - start
+        _local.stack.pop()
+        recorder._add(name, duration, open_phase.bytes, open_phase.requests)
+
+def record_request(n_bytes = 0):
+    '''
+    Counts request and its transferred bytes in all open phases.
+    '''
+    for open_phase in getattr(_local, 'stack', None) or []:
+        open_phase.requests += 1
+        open_phase.bytes += n_bytes
+
+def record_bytes(n_bytes):
+    '''
+    Counts bytes processed locally (for example serialized or downloaded) in all open phases.
+    '''
+    for open_phase in getattr(_local, 'stack', None) or []:
+        open_phase.bytes += n_bytes
+
+def run_with_recorder(recorder, fun):
+    '''
+    Wraps function, so it runs with recorder active in the thread where it is called.
+    It is used for work submitted to executors.
+    '''
+    def wrapper(*args, **kwargs):
+        with use_recorder(recorder):
+            return fun(*args, **kwargs)
+    return wrapper
+
+def timed(name):
+    '''
+    Decorator which measures each function call as the phase.
+    '''
+    def decorator(fun):
+        @functools.wraps(fun)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return fun(*args, **kwargs)
+        return wrapper
+    return decorator
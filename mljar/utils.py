@@ -1,8 +1,9 @@
 from __future__ import unicode_literals
-import pandas as pd
-import numpy as np
-import hashlib
+import os
 import sys
+import uuid
+import hashlib
+from contextlib import contextmanager
 '''
 MLJAR Constants
 '''
@@ -45,7 +46,9 @@ MLJAR_REGRESSION = {
             "etr"  :"Extra Trees"
             }
 
+# Baseline keeps a single hill climbing step, MLJAR API is not known to accept zero steps
 MLJAR_TUNING_MODES = {
+            'Baseline': {'random_start_cnt': 1, 'hill_climbing_cnt': 1},
             'Normal': {'random_start_cnt': 5, 'hill_climbing_cnt': 1},
             'Sport': {'random_start_cnt': 10, 'hill_climbing_cnt': 2},
             'Insane': {'random_start_cnt': 15, 'hill_climbing_cnt': 3}
@@ -70,10 +73,20 @@ MLJAR_DEFAULT_TIME_CONSTRAINT = '5' # minutes
 
 MLJAR_OPT_MAXIMIZE = ['auc']
 
+MLJAR_PREDICTION_TIMEOUT = 10000 # seconds
+
+MLJAR_BASELINE_SAMPLE_ROWS = 10000
+
+MLJAR_SAMPLED_HASH_BLOCKS = 16
+MLJAR_SAMPLED_HASH_BLOCK_ROWS = 100
+
 '''
 Function to compute datasets hash, to not upload several times the same dataset.
 '''
 def make_hash(item):
+    # pandas and numpy are imported here to keep `import mljar` lightweight
+    import pandas as pd
+    import numpy as np
     if isinstance(item, pd.DataFrame) or isinstance(item, pd.Series):
         if sys.version_info.major == 2:
             values = [str(x).replace(' ', '').encode('utf-8') for x in item.values]
@@ -95,3 +108,56 @@ def make_hash(item):
         except TypeError as e:
             print("Unhashable type: %s" % (item))
             raise e
+
+def sampled_positions(n_rows, n_blocks = MLJAR_SAMPLED_HASH_BLOCKS, block_rows = MLJAR_SAMPLED_HASH_BLOCK_ROWS):
+    '''
+    Returns positions of rows sampled by make_sampled_hash, None if all rows are sampled.
+    '''
+    import numpy as np
+    if n_rows <= n_blocks * block_rows:
+        return None
+    starts = np.linspace(0, n_rows - block_rows, n_blocks).astype(np.int64)
+    return (starts[:, None] + np.arange(block_rows)).ravel()
+
+def make_sampled_hash(item, n_blocks = MLJAR_SAMPLED_HASH_BLOCKS, block_rows = MLJAR_SAMPLED_HASH_BLOCK_ROWS,
+                        n_rows = None):
+    '''
+    Computes approximate hash of data frame from its shape, columns, dtypes
+    and rows blocks sampled at deterministic positions (including head and tail).
+    It does not read the whole data, so changes outside sampled blocks are not detected,
+    use it only to find candidates which are confirmed with make_hash.
+    If n_rows is set, item holds only rows at sampled_positions(n_rows) of the data.
+    '''
+    import pandas as pd
+    import numpy as np
+    if isinstance(item, np.ndarray):
+        item = pd.DataFrame(item)
+    if n_rows is None:
+        n_rows = item.shape[0]
+        positions = sampled_positions(n_rows, n_blocks, block_rows)
+        sample = item if positions is None else item.iloc[positions]
+    else:
+        sample = item
+    h = hashlib.sha1()
+    h.update(str((int(n_rows), item.shape[1])).encode('utf-8'))
+    h.update(str([str(c) for c in item.columns]).encode('utf-8'))
+    h.update(str([str(d) for d in item.dtypes]).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(sample, index=False).values.tobytes())
+    return 'sampled-' + h.hexdigest()
+
+@contextmanager
+def atomic_file_path(file_path, suffix = ''):
+    '''
+    Yields temporary path in the file_path directory. The file written there
+    replaces file_path at the end of the block, so readers never see partially
+    written file. The temporary file is removed on error.
+    '''
+    tmp_path = os.path.join(os.path.dirname(os.path.abspath(file_path)),
+                            'tmp-' + str(uuid.uuid4())[:8] + suffix)
+    try:
+        yield tmp_path
+        # os.replace is atomic also on Windows, it is not available in Python 2
+        getattr(os, 'replace', os.rename)(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
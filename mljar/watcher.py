@@ -0,0 +1,151 @@
+import threading
+from concurrent.futures import Future
+
+from .client.result import ResultClient
+from .client.experiment import ExperimentClient
+from .model.result_table import ResultTable
+
+from .log import logger
+
+class ExperimentState(object):
+    '''
+    The latest known state of watched experiment.
+    '''
+    def __init__(self, project_hid, experiment_hid):
+        self.project_hid = project_hid
+        self.experiment_hid = experiment_hid
+        self.experiment = None
+        self.table = None
+        self.callbacks = []
+        self.future = Future()
+
+    @property
+    def done(self):
+        return self.experiment is not None and self.experiment.compute_now == 2
+
+class ExperimentWatcher(object):
+    '''
+    Watches any number of experiments from a single thread.
+
+    In each poll there are two requests per project (results and experiments),
+    no matter how many experiments from the project are watched. The updates
+    are dispatched to per-experiment callbacks and the future returned by watch()
+    is resolved with ExperimentState when experiment is done.
+    '''
+    def __init__(self, interval = 10.0, max_error_cnt = 5):
+        self.interval = interval
+        self.max_error_cnt = max_error_cnt
+        self._projects = {}
+        self._error_cnt = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def watch(self, project_hid, experiment_hid, callback = None):
+        '''
+        Starts watching experiment. Returns future with ExperimentState.
+        '''
+        with self._lock:
+            experiments = self._projects.setdefault(project_hid, {})
+            state = experiments.get(experiment_hid, None)
+            if state is None:
+                state = ExperimentState(project_hid, experiment_hid)
+                experiments[experiment_hid] = state
+            if callback is not None:
+                state.callbacks.append(callback)
+        return state.future
+
+    def unwatch(self, project_hid, experiment_hid):
+        with self._lock:
+            state = self._projects.get(project_hid, {}).pop(experiment_hid, None)
+            if project_hid in self._projects and len(self._projects[project_hid]) == 0:
+                del self._projects[project_hid]
+        if state is not None:
+            state.future.cancel()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(expts) for expts in self._projects.values())
+
+    def poll_once(self):
+        '''
+        Fetches results and experiments for all watched projects and dispatches updates.
+        '''
+        with self._lock:
+            projects = dict((p, dict(expts)) for p, expts in self._projects.items())
+        for project_hid, states in projects.items():
+            try:
+                payload = ResultClient(project_hid).get_results_payload()
+                experiments = ExperimentClient(project_hid).get_experiments()
+                self._error_cnt[project_hid] = 0
+            except Exception as e:
+                logger.error('There is some problem while watching project %s, %s' % (project_hid, str(e)))
+                self._error_cnt[project_hid] = self._error_cnt.get(project_hid, 0) + 1
+                if self._error_cnt[project_hid] >= self.max_error_cnt:
+                    for state in states.values():
+                        self._finish(state, exception=e)
+                continue
+            self._dispatch(states, payload, experiments)
+
+    def _dispatch(self, states, payload, experiments):
+        experiments = dict((e.hid, e) for e in experiments)
+        results = {}
+        for r in payload:
+            results.setdefault(r.get('experiment', None), []).append(r)
+        for experiment_hid, state in states.items():
+            state.experiment = experiments.get(experiment_hid, state.experiment)
+            if state.experiment is None:
+                continue
+            if state.table is None:
+                state.table = ResultTable(metric=state.experiment.metric)
+            state.table.update(results.get(experiment_hid, []))
+            for callback in state.callbacks:
+                try:
+                    callback(state)
+                except Exception as e:
+                    logger.error('Watcher callback failed, %s' % str(e))
+            if state.done:
+                self._finish(state)
+
+    def _finish(self, state, exception = None):
+        with self._lock:
+            experiments = self._projects.get(state.project_hid, {})
+            experiments.pop(state.experiment_hid, None)
+            if len(experiments) == 0:
+                self._projects.pop(state.project_hid, None)
+        if state.future.done():
+            return
+        if exception is not None:
+            state.future.set_exception(exception)
+        else:
+            state.future.set_result(state)
+
+    def run(self):
+        '''
+        Polls till stop() is called.
+        '''
+        while not self._stop_event.is_set():
+            self.poll_once()
+            self._stop_event.wait(self.interval)
+
+    def start(self):
+        '''
+        Starts polling in a background thread.
+        '''
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, name='mljar-watcher')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self, timeout = None):
+        '''
+        Stops polling. It can be called from callbacks, then it does not wait for the thread.
+        '''
+        self._stop_event.set()
+        if self._thread is not None:
+            if self._thread is not threading.current_thread():
+                self._thread.join(timeout)
+            self._thread = None
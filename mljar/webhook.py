@@ -0,0 +1,104 @@
+import json
+import weakref
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from .readiness import ReadinessWaiter
+from .log import logger
+
+MLJAR_NOTIFICATION_KINDS = ['dataset', 'result', 'experiment', 'prediction']
+
+# receiver used by the waiting loops, set by WebhookReceiver.start()
+_active_receiver = None
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+class _NotificationHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length).decode('utf-8'))
+            kind, hid = body['kind'], body.get('hid', None)
+            if kind not in MLJAR_NOTIFICATION_KINDS:
+                raise ValueError('Unknown notification kind %s' % kind)
+        except Exception as e:
+            logger.error('Wrong notification received, %s' % str(e))
+            self.send_response(400)
+            self.end_headers()
+            return
+        self.server.receiver.notify(kind, hid)
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        logger.debug('Webhook: ' + format % args)
+
+class WebhookReceiver(object):
+    '''
+    Embedded HTTP listener for completion callbacks.
+
+    The callback is a POST with JSON body {"kind": ..., "hid": ...}, where kind is
+    one of dataset, result, experiment or prediction. It wakes all waiters registered
+    for (kind, hid) and for (kind, None). Waiters still poll with backoff, so there
+    is no difference in results when callbacks do not arrive.
+    '''
+    def __init__(self, host = '127.0.0.1', port = 0):
+        self.host = host
+        self.port = port
+        self._waiters = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return 'http://{}:{}/'.format(self.host, self.port)
+
+    def register(self, waiter, kind, hid = None):
+        with self._lock:
+            self._waiters.setdefault((kind, hid), weakref.WeakSet()).add(waiter)
+
+    def notify(self, kind, hid = None):
+        with self._lock:
+            waiters = list(self._waiters.get((kind, hid), []))
+            if hid is not None:
+                waiters += list(self._waiters.get((kind, None), []))
+        logger.debug('Notification {} {}, waiters: {}'.format(kind, hid, len(waiters)))
+        for waiter in waiters:
+            waiter.notify()
+
+    def start(self):
+        global _active_receiver
+        self._server = _ThreadingHTTPServer((self.host, self.port), _NotificationHandler)
+        self._server.receiver = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='mljar-webhook')
+        self._thread.daemon = True
+        self._thread.start()
+        _active_receiver = self
+        return self
+
+    def stop(self):
+        global _active_receiver
+        if _active_receiver is self:
+            _active_receiver = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread.join()
+
+def get_waiter(keys, timeout = None, **backoff):
+    '''
+    Creates ReadinessWaiter registered in active webhook receiver (if any)
+    for all (kind, hid) keys.
+    '''
+    waiter = ReadinessWaiter(timeout, **backoff)
+    receiver = _active_receiver
+    if receiver is not None:
+        for kind, hid in keys:
+            receiver.register(waiter, kind, hid)
+    return waiter
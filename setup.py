@@ -17,8 +17,8 @@ setup(
     author='Piotr Plonski',
     author_email='contact@mljar.com',
     license='Apache-2.0',
-    packages=find_packages(exclude=["*.tests", "*.tests.*", "tests.*", "tests"]),
-    install_requires=['requests', 'marshmallow'],
+    packages=find_packages(exclude=["*.tests", "*.tests.*", "tests.*", "tests", "benchmarks", "benchmarks.*"]),
+    install_requires=['requests', 'marshmallow', 'futures; python_version < "3.0"'],
     classifiers=[
         'Programming Language :: Python',
         'Programming Language :: Python :: 2.7',
@@ -0,0 +1,98 @@
+'''
+PredictionBatcher tests, predictions are mocked.
+'''
+import time
+import threading
+import unittest
+import pandas as pd
+try:
+    from unittest import mock
+except ImportError: # Python 2
+    import mock
+
+from mljar.batcher import PredictionBatcher
+from mljar.exceptions import MljarException
+
+class PredictionBatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.error = None
+        patcher = mock.patch('mljar.batcher.Mljar.compute_prediction', side_effect = self._compute_prediction)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _compute_prediction(self, X, model_id, project_id):
+        self.calls.append(X.shape[0])
+        if self.error is not None:
+            raise self.error
+        return pd.DataFrame({'prediction': X['a'].values * 2})
+
+    @staticmethod
+    def make_X(values):
+        return pd.DataFrame({'a': [float(v) for v in values]})
+
+    def test_size_trigger(self):
+        batcher = PredictionBatcher('project-1', 'model-1', max_rows = 4, max_latency = 60)
+        try:
+            f1 = batcher.submit(self.make_X([1, 2]))
+            f2 = batcher.submit(self.make_X([3, 4, 5]))
+            self.assertEqual(list(f1.result(5)['prediction']), [2.0, 4.0])
+            self.assertEqual(list(f2.result(5)['prediction']), [6.0, 8.0, 10.0])
+            self.assertEqual(list(f2.result(5).index), [0, 1, 2])
+            self.assertEqual(self.calls, [5])
+        finally:
+            batcher.close(5)
+
+    def test_latency_trigger(self):
+        batcher = PredictionBatcher('project-1', 'model-1', max_rows = 1000, max_latency = 0.05)
+        try:
+            start = time.time()
+            pred = batcher.predict(self.make_X([1]), timeout = 5)
+            self.assertEqual(list(pred['prediction']), [2.0])
+            self.assertTrue(time.time() - start >= 0.04)
+            self.assertEqual(self.calls, [1])
+        finally:
+            batcher.close(5)
+
+    def test_concurrent_callers(self):
+        batcher = PredictionBatcher('project-1', 'model-1', max_rows = 100, max_latency = 0.1)
+        results = {}
+        def call(i):
+            results[i] = batcher.predict(self.make_X([i] * (i + 1)), timeout = 5)
+        threads = [threading.Thread(target = call, args = (i,)) for i in range(5)]
+        try:
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            batcher.close(5)
+        for i in range(5):
+            self.assertEqual(list(results[i]['prediction']), [2.0 * i] * (i + 1))
+        self.assertEqual(sum(self.calls), 15)
+
+    def test_exception(self):
+        self.error = MljarException('prediction failed')
+        batcher = PredictionBatcher('project-1', 'model-1', max_rows = 2, max_latency = 60)
+        try:
+            f1 = batcher.submit(self.make_X([1]))
+            f2 = batcher.submit(self.make_X([2]))
+            for future in [f1, f2]:
+                with self.assertRaises(MljarException):
+                    future.result(5)
+        finally:
+            batcher.close(5)
+
+    def test_close(self):
+        batcher = PredictionBatcher('project-1', 'model-1', max_rows = 1000, max_latency = 60)
+        future = batcher.submit(self.make_X([1, 2]))
+        batcher.close(5)
+        # queued requests are flushed on close
+        self.assertEqual(list(future.result(0)['prediction']), [2.0, 4.0])
+        self.assertFalse(batcher._thread.is_alive())
+        with self.assertRaises(MljarException):
+            batcher.submit(self.make_X([1]))
+
+if __name__ == '__main__':
+    unittest.main()
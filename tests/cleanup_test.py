@@ -0,0 +1,113 @@
+'''
+DatasetCleaner tests, DatasetClient is mocked.
+'''
+import time
+import datetime
+import threading
+import unittest
+try:
+    from unittest import mock
+except ImportError: # Python 2
+    import mock
+
+from mljar.cleanup import DatasetCleaner
+
+class FakeDataset(object):
+    def __init__(self, hid, title, age):
+        self.hid = hid
+        self.title = title
+        self.created_at = datetime.datetime.utcnow() - datetime.timedelta(seconds = age)
+
+class DatasetCleanerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.deleted = []
+        self.datasets = []
+        self.broken_projects = set()
+        patcher = mock.patch('mljar.cleanup.DatasetClient', side_effect = self._dataset_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cleaner = DatasetCleaner(retry_interval = 0.01, gc_interval = None)
+
+    def _dataset_client(self, project_hid):
+        if project_hid in self.broken_projects:
+            raise Exception('client error')
+        client = mock.Mock()
+        client.get_datasets.return_value = self.datasets
+        client.delete_dataset.side_effect = lambda dataset_hid: self.deleted.append(dataset_hid)
+        return client
+
+    def flush(self, timeout = 10):
+        # flush in a thread, so the test fails instead of hanging
+        thread = threading.Thread(target = self.cleaner.flush)
+        thread.daemon = True
+        thread.start()
+        thread.join(timeout)
+        self.assertFalse(thread.is_alive())
+
+    def test_schedule_and_cancel(self):
+        self.cleaner.schedule('p1', 'ds-1')
+        self.cleaner.schedule('p1', 'ds-2')
+        self.cleaner.cancel('ds-2')
+        self.flush()
+        self.assertEqual(self.deleted, ['ds-1'])
+
+    def test_failure_does_not_stop_worker(self):
+        self.broken_projects.add('p1')
+        self.cleaner.schedule('p1', 'ds-1')
+        self.flush()
+        self.broken_projects.clear()
+        self.cleaner.schedule('p2', 'ds-2')
+        self.flush()
+        self.assertEqual(self.deleted, ['ds-2'])
+
+    def test_reused_dataset_is_not_deleted(self):
+        self.datasets = [FakeDataset('ds-1', 'Temporary-ab12', 60)]
+        # the next prediction of the same X looks up datasets, while the delete is scheduled
+        with self.cleaner.using('p1') as use:
+            self.cleaner.schedule('p1', 'ds-1')
+            time.sleep(0.1)
+            self.assertEqual(self.deleted, [])
+            dataset = use(self.datasets[0])
+            # the pinned dataset is not deleted, its scheduled delete is canceled
+            self.flush()
+            self.assertEqual(self.deleted, [])
+        self.assertEqual(dataset.hid, 'ds-1')
+        self.cleaner.schedule('p1', 'ds-1')
+        self.flush()
+        self.assertEqual(self.deleted, ['ds-1'])
+
+    def test_lookup_waits_for_delete(self):
+        deleting, finish_delete = threading.Event(), threading.Event()
+        def delete_dataset(dataset_hid):
+            deleting.set()
+            finish_delete.wait(5)
+            self.deleted.append(dataset_hid)
+        client = mock.Mock()
+        client.delete_dataset.side_effect = delete_dataset
+        with mock.patch('mljar.cleanup.DatasetClient', return_value = client):
+            self.cleaner.schedule('p1', 'ds-1')
+            self.assertTrue(deleting.wait(5))
+            entered = threading.Event()
+            def lookup():
+                with self.cleaner.using('p1'):
+                    entered.set()
+            thread = threading.Thread(target = lookup)
+            thread.start()
+            self.assertFalse(entered.wait(0.1))
+            finish_delete.set()
+            self.assertTrue(entered.wait(5))
+            thread.join(5)
+        self.assertEqual(self.deleted, ['ds-1'])
+
+    def test_collect_orphans(self):
+        day = 24 * 3600
+        self.datasets = [FakeDataset('old-temporary', 'Temporary-ab12', 2 * day),
+                            FakeDataset('new-temporary', 'Temporary-cd34', 60),
+                            FakeDataset('kept', 'Testing-ef56', 2 * day),
+                            FakeDataset('training', 'Training-gh78', 2 * day)]
+        self.assertEqual(self.cleaner.collect_orphans('p1'), 1)
+        self.assertEqual(self.deleted, ['old-temporary'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+'''
+Delta uploads tests, LocalChunkStore is used as a stand-in of the upload target.
+'''
+import os
+import shutil
+import tempfile
+import unittest
+from zipfile import ZipFile
+
+from mljar.delta import split_chunks, store_chunks, LocalChunkStore
+
+def make_csv(n_rows):
+    lines = ['attribute_1,attribute_2,target\n']
+    lines += ['{},{},{}\n'.format(i, i * 7 % 13, i % 2) for i in range(n_rows)]
+    return ''.join(lines).encode('utf-8')
+
+class DeltaUploadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.params = {'avg_rows': 64, 'min_rows': 16, 'max_rows': 512}
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_prefix_chunks_are_stable(self):
+        chunks = split_chunks(make_csv(5000), **self.params)
+        appended = split_chunks(make_csv(6000), **self.params)
+        self.assertTrue(len(chunks) > 10)
+        # all chunks except the last one are the same after rows append
+        self.assertEqual([h for h, _ in chunks[:-1]], [h for h, _ in appended[:len(chunks) - 1]])
+        self.assertTrue(all(len(c.splitlines()) <= 512 for _, c in appended))
+
+    def test_only_new_chunks_are_stored(self):
+        store = LocalChunkStore(os.path.join(self.path, 'chunks'))
+        csv = make_csv(5000)
+        manifest, stored = store_chunks(store, split_chunks(csv, **self.params))
+        self.assertTrue(stored > 0)
+        _, stored_again = store_chunks(store, split_chunks(csv, **self.params))
+        self.assertEqual(stored_again, 0)
+        appended_csv = make_csv(6000)
+        appended_manifest, stored_delta = store_chunks(store, split_chunks(appended_csv, **self.params))
+        self.assertTrue(0 < stored_delta < stored)
+        # store index is persisted
+        store = LocalChunkStore(os.path.join(self.path, 'chunks'))
+        self.assertTrue(all(store.has(h) for h in appended_manifest))
+        file_path = store.compose(appended_manifest, os.path.join(self.path, 'data.zip'), 'data.csv')
+        with ZipFile(file_path) as myzip:
+            self.assertEqual(myzip.read('data.csv'), appended_csv)
+
+    def test_eviction(self):
+        directory = os.path.join(self.path, 'chunks')
+        store = LocalChunkStore(directory, max_size = 0)
+        old_manifest, _ = store_chunks(store, split_chunks(make_csv(2000), **self.params))
+        # older chunks are used first, so they are evicted first
+        for chunk_hash in old_manifest:
+            os.utime(store._chunk_path(chunk_hash), (1, 1))
+        manifest, _ = store_chunks(store, split_chunks(make_csv(6000)[-20000:], **self.params))
+        store.max_size = sum(os.path.getsize(store._chunk_path(h)) for h in set(manifest))
+        store.evict()
+        self.assertTrue(all(store.has(h) for h in manifest))
+        self.assertFalse(any(store.has(h) for h in old_manifest if h not in manifest))
+        self.assertEqual(len([f for f in os.listdir(directory) if f.endswith('.deflate')]), len(set(manifest)))
+        # evicted chunks are removed from persisted index
+        store = LocalChunkStore(directory)
+        self.assertFalse(any(store.has(h) for h in old_manifest if h not in manifest))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+'''
+ETAEstimator tests.
+'''
+import unittest
+
+from mljar.eta import ETAEstimator, RunningStats, get_tuning_mode
+from .result_table_test import make_result
+
+class ETAEstimatorTest(unittest.TestCase):
+
+    def test_running_stats(self):
+        stats = RunningStats()
+        for v in [1.0, 2.0, 3.0, 4.0]:
+            stats.add(v)
+        self.assertAlmostEqual(stats.mean, 2.5)
+        self.assertAlmostEqual(stats.variance, 5.0/3.0)
+
+    def test_tuning_mode(self):
+        self.assertEqual(get_tuning_mode({'random_start_cnt': 10, 'hill_climbing_cnt': 2}), 'Sport')
+        self.assertEqual(get_tuning_mode({}), None)
+
+    def test_estimate_from_observed_run_times(self):
+        done = [make_result('a', 'xgb', 0.5), make_result('b', 'xgb', 0.4)]
+        for r in done:
+            r.run_time = 120.0
+        pending = [make_result('c', 'xgb', None, status='Initiated'),
+                    make_result('d', 'xgb', None, status='Initiated')]
+        estimator = ETAEstimator(parallelism=2)
+        estimator.observe(done + pending)
+        # observe the same results again, they should be counted once
+        estimator.observe(done)
+        eta = estimator.estimate(done + pending, single_limit=5)
+        self.assertAlmostEqual(eta.minutes, 2.0)
+        self.assertAlmostEqual(eta.low, 2.0)
+        self.assertAlmostEqual(eta.high, 2.0)
+
+    def test_estimate_without_observations(self):
+        pending = [make_result('c', 'lgb', None, status='Initiated')]
+        eta = ETAEstimator().estimate(pending, single_limit=5)
+        self.assertAlmostEqual(eta.minutes, 2.5)
+        self.assertTrue(eta.low < eta.minutes < eta.high)
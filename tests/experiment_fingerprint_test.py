@@ -0,0 +1,35 @@
+'''
+Experiment fingerprint and ExperimentIndex tests.
+'''
+import unittest
+
+from mljar.model.experiment import Experiment, ExperimentIndex
+
+def make_experiment(hid = '', title = 'expt', train_id = 'ds-1', algs = ['xgb', 'lgb'], metric = 'logloss'):
+    params = {'train_dataset': {'id': train_id, 'title': 'Training'},
+                'algs': algs, 'preproc': {'na_fill': 'na_fill_median'},
+                'single_limit': '5', 'ensemble': True,
+                'random_start_cnt': 5, 'hill_climbing_cnt': 1}
+    return Experiment(hid=hid, title=title, models_cnt=0, task='bin_class', description='',
+                        metric=metric, validation_scheme='5-fold CV, Shuffle', details={},
+                        params=params, compute_now=0, computation_started_at=None)
+
+class ExperimentFingerprintTest(unittest.TestCase):
+
+    def test_fingerprint(self):
+        a = make_experiment(algs = ['xgb', 'lgb'])
+        b = make_experiment(algs = ['lgb', 'xgb'])
+        self.assertEqual(hash(a.fingerprint()), hash(b.fingerprint()))
+        self.assertTrue(a.equal(b))
+        # experiments with different train datasets are different
+        self.assertFalse(a.equal(make_experiment(train_id = 'ds-2')))
+        self.assertFalse(a.equal(make_experiment(metric = 'auc')))
+
+    def test_index(self):
+        index = ExperimentIndex([make_experiment(hid = 'e1', title = 'first'),
+                                    make_experiment(hid = 'e2', title = 'second', metric = 'auc')])
+        self.assertEqual(len(index.with_title('first')), 1)
+        self.assertEqual(index.with_title('third'), [])
+        found = index.find('first', make_experiment(title = 'first').fingerprint())
+        self.assertEqual(found.hid, 'e1')
+        self.assertEqual(index.find('second', make_experiment(title = 'second').fingerprint()), None)
@@ -0,0 +1,115 @@
+'''
+submit_grid and wait_all tests, Mljar steps which call MLJAR API are mocked.
+'''
+import unittest
+import numpy as np
+from concurrent.futures import Future
+try:
+    from unittest import mock
+except ImportError: # Python 2
+    import mock
+
+from mljar.mljar import Mljar
+from mljar.grid import submit_grid, wait_all
+from mljar.exceptions import BadValueException
+
+class FakeExperiment(object):
+    def __init__(self, hid, compute_now = 1):
+        self.hid = hid
+        self.compute_now = compute_now
+
+class FakeWatcher(object):
+    def __init__(self):
+        self.futures = {}
+        self.started = False
+        self.stopped = False
+
+    def watch(self, project_hid, experiment_hid):
+        self.futures[experiment_hid] = Future()
+        return self.futures[experiment_hid]
+
+    def start(self):
+        self.started = True
+        return self
+
+    def stop(self, timeout = None):
+        self.stopped = True
+
+    def finish(self, experiment_hid, best):
+        state = mock.Mock(experiment = FakeExperiment(experiment_hid, compute_now = 2))
+        state.table.best.return_value = best
+        self.futures[experiment_hid].set_result(state)
+
+class GridTest(unittest.TestCase):
+
+    def setUp(self):
+        self.X = np.zeros((10, 2))
+        self.y = np.arange(10) % 2
+        self.failing = set()
+        self.created = []
+
+        def add_project(model, y):
+            model.project_task = 'bin_class'
+            model.project = mock.Mock(hid = 'p1')
+        def add_datasets(model, X, y, validation_data = None, dataset_title = None):
+            model.dataset = 'ds'
+            model.dataset_vald = None
+        def add_experiment(model, index = None):
+            if model.experiment_title in self.failing:
+                raise Exception('experiment error')
+            self.created.append(model.experiment_title)
+            model.experiment = FakeExperiment('e-' + model.experiment_title)
+        patchers = [mock.patch.object(Mljar, '_add_project', autospec = True, side_effect = add_project),
+                    mock.patch.object(Mljar, '_add_datasets', autospec = True, side_effect = add_datasets),
+                    mock.patch.object(Mljar, '_add_experiment', autospec = True, side_effect = add_experiment),
+                    mock.patch('mljar.grid.ExperimentClient')]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.configs = [{'experiment': title, 'algorithms': ['xgb']} for title in ['a', 'b', 'c']]
+
+    def test_submit_and_wait(self):
+        self.failing.add('b')
+        watcher = FakeWatcher()
+        handles = submit_grid('project', self.X, self.y, self.configs, watcher = watcher)
+        self.assertEqual(sorted(self.created), ['a', 'c'])
+        self.assertEqual([h.mljar.experiment_title for h in handles], ['a', 'b', 'c'])
+        self.assertEqual(sorted(watcher.futures.keys()), ['e-a', 'e-c'])
+        # failed experiment does not abort the grid, its handle holds the exception
+        self.assertTrue(handles[1].done())
+        watcher.finish('e-a', 'best-a')
+        results = wait_all(handles, timeout = 0)
+        self.assertEqual(results[0], 'best-a')
+        self.assertEqual(str(results[1]), 'experiment error')
+        self.assertIsNone(results[2])
+        watcher.finish('e-c', 'best-c')
+        self.assertEqual(wait_all(handles)[2], 'best-c')
+        self.assertEqual(handles[2].mljar.selected_algorithm, 'best-c')
+        # watcher passed by caller is not stopped
+        self.assertFalse(watcher.stopped)
+
+    def test_own_watcher_is_stopped(self):
+        watcher = FakeWatcher()
+        with mock.patch('mljar.grid.ExperimentWatcher', return_value = watcher):
+            handles = submit_grid('project', self.X, self.y, self.configs)
+        self.assertTrue(watcher.started)
+        watcher.finish('e-a', 'best-a')
+        watcher.finish('e-b', 'best-b')
+        self.assertFalse(watcher.stopped)
+        handles[2].future.cancel()
+        self.assertTrue(watcher.stopped)
+
+    def test_all_failed(self):
+        self.failing.update(['a', 'b', 'c'])
+        watcher = FakeWatcher()
+        with mock.patch('mljar.grid.ExperimentWatcher', return_value = watcher):
+            handles = submit_grid('project', self.X, self.y, self.configs)
+        self.assertTrue(watcher.stopped)
+        self.assertTrue(all(isinstance(r, Exception) for r in wait_all(handles)))
+
+    def test_unique_titles(self):
+        with self.assertRaises(BadValueException):
+            submit_grid('project', self.X, self.y, self.configs + [{'experiment': 'a'}])
+
+if __name__ == '__main__':
+    unittest.main()
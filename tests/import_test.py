@@ -0,0 +1,20 @@
+'''
+Import tests, REST clients should not import pandas and numpy.
+'''
+import sys
+import unittest
+
+from benchmarks.import_time import SNIPPETS, measure
+
+class ImportTest(unittest.TestCase):
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'lazy import requires Python 3.7')
+    def test_lazy_imports(self):
+        for name, snippet in SNIPPETS[:2]:
+            elapsed, pandas_loaded, numpy_loaded = measure(snippet, repeat = 1)
+            self.assertFalse(pandas_loaded, name)
+            self.assertFalse(numpy_loaded, name)
+
+    def test_mljar_import(self):
+        elapsed, pandas_loaded, numpy_loaded = measure(SNIPPETS[2][1], repeat = 1)
+        self.assertTrue(numpy_loaded)
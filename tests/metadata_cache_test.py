@@ -0,0 +1,38 @@
+'''
+MetadataCache tests.
+'''
+import os
+import time
+import shutil
+import tempfile
+import unittest
+
+from mljar.metadata_cache import MetadataCache
+
+class MetadataCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_get_set_invalidate(self):
+        cache = MetadataCache()
+        key = ('project', 'My project', 'bin_class')
+        self.assertEqual(cache.get(key), None)
+        cache.set(key, 'abc')
+        self.assertEqual(cache.get(key), 'abc')
+        cache.invalidate(key)
+        self.assertEqual(cache.get(key), None)
+
+    def test_ttl(self):
+        cache = MetadataCache(ttl = 0.05)
+        cache.set(('experiment', 'p1', 'expt'), 'e1')
+        time.sleep(0.1)
+        self.assertEqual(cache.get(('experiment', 'p1', 'expt')), None)
+
+    def test_persistence(self):
+        file_path = os.path.join(self.path, 'cache', 'metadata.json')
+        MetadataCache(path = file_path).set(('project', 'My project', 'reg'), 'abc')
+        self.assertEqual(MetadataCache(path = file_path).get(('project', 'My project', 'reg')), 'abc')
@@ -0,0 +1,355 @@
+'''
+Mljar tests which run without MLJAR account, the REST clients are mocked.
+'''
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+import numpy as np
+import pandas as pd
+try:
+    from unittest import mock
+except ImportError: # Python 2
+    import mock
+
+from mljar import Mljar
+from mljar.cleanup import DatasetCleaner
+from mljar.exceptions import MljarException
+from mljar.model.project import Project
+from mljar.model.experiment import Experiment
+from mljar.model.result import Result
+
+class FakeDataset(object):
+    def __init__(self, hid):
+        self.hid = hid
+
+class FakePrediction(object):
+    def __init__(self, hid):
+        self.hid = hid
+
+def make_project(hid = 'p1'):
+    return Project.from_dict({'hid': hid, 'title': 'project', 'description': None, 'task': 'bin_class',
+                                'hardware': 'cloud', 'scope': 'private', 'created_at': '2017-08-01T12:00:00Z',
+                                'created_by': 1, 'models_cnt': 0, 'compute_now': 0})
+
+def make_experiment(hid, compute_now = 1, tuning_mode = 'Normal'):
+    return Experiment.from_dict({'hid': hid, 'title': 'expt-' + hid, 'models_cnt': 3, 'task': 'bin_class',
+                                    'description': None, 'metric': 'logloss', 'validation_scheme': '5-fold CV',
+                                    'details': {}, 'params': {'tuning_mode': tuning_mode}, 'compute_now': compute_now,
+                                    'computation_started_at': None})
+
+def make_result(hid, experiment_hid, metric_value):
+    return Result.from_dict({'hid': hid, 'experiment': experiment_hid, 'dataset': 'ds', 'validation_scheme': '5-fold CV',
+                                'model_type': 'xgb', 'metric_type': 'logloss', 'params': {},
+                                'metric_value': metric_value, 'run_time': 10.0, 'status': 'Done'})
+
+class FakeApi(object):
+    '''
+    Stand-in for MLJAR REST clients used by Mljar predictions.
+    Predictions of model 'm<k>' are equal to k * first column of uploaded X.
+    '''
+    def __init__(self):
+        self.uploads = []
+        self.jobs = []
+        self.downloads = []
+        self.scheduled = []
+        self.fail_on_upload = None
+        # function called with X and y while dataset is added
+        self.on_upload = None
+        # if True, dataset with the same X is found and returned
+        self.reuse_datasets = False
+        self.deleted = []
+        # function returning download delay in seconds for prediction hid
+        self.download_delay = None
+        self._ready = set()
+        self._data = {}
+
+    def patch(self, test):
+        clients = {
+            'DatasetClient': self.dataset_client,
+            'PredictionClient': self.prediction_client,
+            'PredictJobClient': self.predict_job_client,
+            'PredictionDownloadClient': self.download_client,
+            'get_cleaner': self.cleaner
+        }
+        for name, fake in clients.items():
+            patcher = mock.patch('mljar.mljar.' + name, side_effect = fake)
+            patcher.start()
+            test.addCleanup(patcher.stop)
+        # do not wait long if prediction is never ready
+        patcher = mock.patch('mljar.mljar.MLJAR_PREDICTION_TIMEOUT', 2)
+        patcher.start()
+        test.addCleanup(patcher.stop)
+
+    def dataset_client(self, project_hid):
+        client = mock.Mock()
+        def add_dataset_if_not_exists(X, y = None, **kwargs):
+            if self.reuse_datasets:
+                for dataset_hid, values in list(self._data.items()):
+                    if np.array_equal(values, np.asarray(X)[:, 0]):
+                        # validation of found dataset takes time too
+                        if self.on_upload is not None:
+                            self.on_upload(X, y)
+                        return FakeDataset(dataset_hid)
+            if self.on_upload is not None:
+                self.on_upload(X, y)
+            if self.fail_on_upload is not None and len(self.uploads) == self.fail_on_upload:
+                self.uploads.append(None)
+                raise Exception('upload failed')
+            dataset_hid = 'ds-%d' % len(self.uploads)
+            self.uploads.append(dataset_hid)
+            self._data[dataset_hid] = np.asarray(X)[:, 0]
+            return FakeDataset(dataset_hid)
+        client.add_dataset_if_not_exists.side_effect = add_dataset_if_not_exists
+        return client
+
+    def prediction_client(self, project_hid):
+        client = mock.Mock()
+        def get_prediction(dataset_hid, model_id):
+            if (dataset_hid, model_id) in self._ready:
+                return FakePrediction('%s/%s' % (dataset_hid, model_id))
+            return None
+        client.get_prediction.side_effect = get_prediction
+        return client
+
+    def predict_job_client(self):
+        client = mock.Mock()
+        def submit(project_hid, dataset_hid, model_ids):
+            model_ids = model_ids if isinstance(model_ids, list) else [model_ids]
+            self.jobs.append((dataset_hid, list(model_ids)))
+            for model_id in model_ids:
+                self._ready.add((dataset_hid, model_id))
+            return True
+        client.submit.side_effect = submit
+        return client
+
+    def download_client(self):
+        client = mock.Mock()
+        def download(prediction_hid):
+            if self.download_delay is not None:
+                time.sleep(self.download_delay(prediction_hid))
+            self.downloads.append(prediction_hid)
+            dataset_hid, model_id = prediction_hid.split('/')
+            return pd.DataFrame({'prediction': self._data[dataset_hid] * int(model_id[1:])})
+        client.download.side_effect = download
+        return client
+
+    def delete_dataset(self, dataset_hid):
+        self.deleted.append(dataset_hid)
+        del self._data[dataset_hid]
+        self._ready = set(r for r in self._ready if r[0] != dataset_hid)
+
+    def cleaner(self):
+        cleaner = mock.MagicMock()
+        cleaner.using.return_value.__enter__.return_value = lambda dataset: dataset
+        cleaner.schedule.side_effect = lambda project_hid, dataset_hid: self.scheduled.append(dataset_hid)
+        return cleaner
+
+class MljarPredictManyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeApi()
+        self.api.patch(self)
+        self.X = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'b': [0.0, 0.0, 0.0]})
+
+    def test_predict_many(self):
+        pred = Mljar.predict_many(self.X, ['m1', 'm2', 'm3'], 'project-1', ensemble = True)
+        self.assertEqual(self.api.uploads, ['ds-0'])
+        self.assertEqual(self.api.jobs, [('ds-0', ['m1', 'm2', 'm3'])])
+        self.assertEqual(list(pred.columns), ['m1', 'm2', 'm3', 'ensemble'])
+        self.assertEqual(list(pred['m3']), [3.0, 6.0, 9.0])
+        self.assertEqual(list(pred['ensemble']), [2.0, 4.0, 6.0])
+        self.assertEqual(self.api.scheduled, ['ds-0'])
+
+    def test_duplicated_models(self):
+        pred = Mljar.predict_many(self.X, ['m2', 'm1', 'm2'], 'project-1')
+        self.assertEqual(self.api.jobs, [('ds-0', ['m2', 'm1'])])
+        self.assertEqual(sorted(self.api.downloads), ['ds-0/m1', 'ds-0/m2'])
+        self.assertEqual(list(pred.columns), ['m2', 'm1'])
+        self.assertEqual(list(pred['m1']), [1.0, 2.0, 3.0])
+
+    def test_keep_dataset(self):
+        Mljar.predict_many(self.X, ['m1'], 'project-1', keep_dataset = True)
+        self.assertEqual(self.api.scheduled, [])
+
+class MljarPredictionCleanupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeApi()
+        self.api.patch(self)
+        self.cleaner = DatasetCleaner(retry_interval = 0.01, gc_interval = None)
+        client = mock.Mock()
+        client.delete_dataset.side_effect = self.api.delete_dataset
+        patchers = [mock.patch('mljar.mljar.get_cleaner', return_value = self.cleaner),
+                    mock.patch('mljar.cleanup.DatasetClient', return_value = client)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.X = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'b': [0.0, 0.0, 0.0]})
+
+    def test_predict_again(self):
+        self.api.reuse_datasets = True
+        # the cleaner runs while the next prediction waits for the found dataset
+        self.api.on_upload = lambda X, y: time.sleep(0.2)
+        for _ in range(3):
+            pred = Mljar.compute_prediction(self.X, 'm2', 'project-1')
+            self.assertEqual(list(pred['prediction']), [2.0, 4.0, 6.0])
+        self.cleaner.flush()
+        self.assertEqual(sorted(self.api.deleted), sorted(set(self.api.uploads)))
+
+class MljarBatchedPredictionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeApi()
+        self.api.patch(self)
+        self.X = pd.DataFrame({'a': np.arange(10, dtype=float), 'b': np.zeros(10)})
+
+    def test_rows_order(self):
+        # the first batches are downloaded the last
+        self.api.download_delay = lambda prediction_hid: 0.01 * (5 - int(prediction_hid.split('/')[0][3:]))
+        pred = Mljar.compute_prediction_batched(self.X, 'm2', 'project-1', batch_size = 3, max_workers = 4)
+        self.assertEqual(len(self.api.uploads), 4)
+        self.assertEqual(list(pred.index), list(range(10)))
+        self.assertEqual(list(pred['prediction']), list(self.X['a'] * 2))
+        self.assertEqual(sorted(self.api.scheduled), sorted(self.api.uploads))
+
+    def test_cleanup_on_failure(self):
+        self.api.fail_on_upload = 2
+        with self.assertRaises(Exception):
+            Mljar.compute_prediction_batched(self.X, 'm1', 'project-1', batch_size = 3, max_workers = 1)
+        self.assertEqual(sorted(self.api.scheduled), ['ds-0', 'ds-1', 'ds-3'])
+
+class MljarStateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.file_path = os.path.join(self.tmp_dir, 'state.json.gz')
+        self.model = Mljar(project = 'project', experiment = 'expt', metric = 'logloss',
+                            algorithms = ['xgb'], tuning_mode = 'Sport')
+        self.model.project_task = 'bin_class'
+        self.model.project = make_project()
+        self.model.experiment = make_experiment('e1', compute_now = 2)
+        self.model.selected_algorithm = make_result('r1', 'e1', 0.3)
+
+    def test_round_trip(self):
+        self.model.save_state(self.file_path)
+        model = Mljar.load_state(self.file_path, max_age = 60)
+        self.assertEqual(model.experiment_title, 'expt')
+        self.assertEqual(model.tuning_mode, 'Sport')
+        self.assertEqual(model.algorithms, ['xgb'])
+        self.assertEqual(model.project.to_dict(), self.model.project.to_dict())
+        self.assertEqual(model.experiment.to_dict(), self.model.experiment.to_dict())
+        self.assertEqual(model.selected_algorithm.hid, 'r1')
+        self.assertIsNone(model.baseline)
+
+    def test_baseline_round_trip(self):
+        baseline = Mljar(project = 'project', experiment = 'expt-baseline', tuning_mode = 'Baseline')
+        baseline.project_task = 'bin_class'
+        baseline.project = self.model.project
+        baseline.experiment = make_experiment('e0', tuning_mode = 'Baseline')
+        self.model.baseline = baseline
+        self.model.experiment = None
+        self.model.save_state(self.file_path)
+        model = Mljar.load_state(self.file_path)
+        self.assertIsNone(model.experiment)
+        self.assertEqual(model.baseline.tuning_mode, 'Baseline')
+        self.assertEqual(model.baseline.experiment.hid, 'e0')
+        self.assertEqual(model.baseline.project.hid, 'p1')
+
+    def test_stale_state(self):
+        self.model.save_state(self.file_path)
+        with mock.patch('mljar.mljar.time.time', return_value = time.time() + 3600):
+            with self.assertRaises(MljarException):
+                Mljar.load_state(self.file_path, max_age = 60)
+            # without max_age the state is loaded
+            self.assertEqual(Mljar.load_state(self.file_path).experiment.hid, 'e1')
+
+    def test_version_mismatch(self):
+        with mock.patch.object(Mljar, 'STATE_VERSION', Mljar.STATE_VERSION + 1):
+            self.model.save_state(self.file_path)
+        with self.assertRaises(MljarException):
+            Mljar.load_state(self.file_path)
+
+class MljarBaselineTest(unittest.TestCase):
+    '''
+    The baseline experiment predicts with model 'm1', the full experiment with model 'm2'.
+    '''
+    def setUp(self):
+        self.api = FakeApi()
+        self.api.patch(self)
+        self.created = []
+        self.experiments = {}
+        self.results = {'e-expt-baseline': [make_result('m1', 'e-expt-baseline', 0.5)],
+                        'e-expt': [make_result('m2', 'e-expt', 0.3)]}
+
+        def add_project(model, y):
+            model.project_task = 'bin_class'
+            model.project = make_project()
+        def experiment_client(project_hid):
+            client = mock.Mock()
+            def add_experiment_if_not_exists(dataset, dataset_vald, title, *args, **kwargs):
+                tuning_mode = args[7]
+                self.created.append((title, tuning_mode, dataset.hid))
+                self.experiments['e-' + title] = make_experiment('e-' + title, tuning_mode = tuning_mode)
+                return self.experiments['e-' + title]
+            client.add_experiment_if_not_exists.side_effect = add_experiment_if_not_exists
+            client.get_experiment.side_effect = lambda hid: self.experiments[hid]
+            return client
+        def result_client(project_hid):
+            client = mock.Mock()
+            client.get_results.side_effect = lambda experiment_hid: self.results[experiment_hid]
+            return client
+        patchers = [mock.patch.object(Mljar, '_add_project', autospec = True, side_effect = add_project),
+                    mock.patch('mljar.mljar.ExperimentClient', side_effect = experiment_client),
+                    mock.patch('mljar.mljar.ResultClient', side_effect = result_client)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.X = pd.DataFrame({'a': np.arange(100, dtype=float), 'b': np.zeros(100)})
+        self.y = np.arange(100) % 2
+
+    def test_baseline_then_full(self):
+        full_upload = threading.Event()
+        # training dataset with all rows waits till the event is set
+        self.api.on_upload = lambda X, y: full_upload.wait(5) if y is not None and len(y) == 100 else None
+        model = Mljar(project = 'project', experiment = 'expt', tuning_mode = 'Sport')
+        model.fit(self.X, self.y, wait_till_all_done = False, baseline = True, baseline_rows = 20)
+        self.assertEqual(self.created, [('expt-baseline', 'Baseline', 'ds-0')])
+        self.assertIsNone(model.experiment)
+        # full dataset is still uploaded, baseline model is used
+        self.assertEqual(model._get_the_best_available_result().hid, 'm1')
+        pred = model.predict(self.X)
+        self.assertEqual(list(pred['prediction']), list(self.X['a']))
+
+        full_upload.set()
+        model._full_experiment.result(5)
+        # ds-1 is the prediction dataset
+        self.assertEqual(self.created[1], ('expt', 'Sport', 'ds-2'))
+        self.assertEqual(model.dataset.hid, 'ds-2')
+        self.assertEqual(model.experiment.hid, 'e-expt')
+        # the full experiment has better model
+        pred = model.predict(self.X)
+        self.assertEqual(list(pred['prediction']), list(self.X['a'] * 2))
+
+    def test_best_available_result(self):
+        model = Mljar(project = 'project', experiment = 'expt')
+        model.fit(self.X, self.y, wait_till_all_done = False, baseline = True, baseline_rows = 20)
+        model._full_experiment.result(5)
+        self.assertEqual(model._get_the_best_available_result().hid, 'm2')
+        # results of experiments which are not started are skipped
+        self.experiments['e-expt'].compute_now = 0
+        self.assertEqual(model._get_the_best_available_result().hid, 'm1')
+        self.results['e-expt-baseline'] = []
+        self.assertIsNone(model._get_the_best_available_result())
+
+    def test_small_data(self):
+        model = Mljar(project = 'project', experiment = 'expt')
+        model.fit(self.X, self.y, wait_till_all_done = False, baseline = True, baseline_rows = 200)
+        self.assertIsNone(model.baseline)
+        self.assertEqual(self.created, [('expt', 'Normal', 'ds-0')])
+
+if __name__ == '__main__':
+    unittest.main()
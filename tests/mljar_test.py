@@ -13,6 +13,7 @@ from .project_based_test import ProjectBasedTest, get_postfix
 from mljar.exceptions import BadValueException, IncorrectInputDataException
 from mljar.utils import MLJAR_DEFAULT_TUNING_MODE
 from mljar import Mljar
+from mljar.cleanup import get_cleaner
 
 class MljarTest(ProjectBasedTest):
 
@@ -60,7 +61,8 @@ class MljarTest(ProjectBasedTest):
         # compute score
         score = self.mse(pred, self.y)
         self.assertTrue(score < 0.9)
-        # check if dataset was removed
+        # check if dataset was removed, deletes are done in the background
+        get_cleaner().flush()
         self.assertEqual(init_datasets_cnt, len(dc.get_datasets()))
         # run predictions again, but keep dataset
         pred = Mljar.compute_prediction(self.X, model_id, project_id, keep_dataset = True)
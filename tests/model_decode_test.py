@@ -0,0 +1,66 @@
+'''
+Compiled decoder tests, it should give the same objects as marshmallow schema load.
+'''
+import unittest
+from marshmallow import ValidationError
+
+from mljar.model.result import Result
+from mljar.model.experiment import Experiment
+from .model_payload import make_payload
+
+class ModelDecodeTest(unittest.TestCase):
+
+    def assertSameObjects(self, a, b):
+        self.assertEqual(type(a), type(b))
+        self.assertEqual(a.to_dict(), b.to_dict())
+
+    def test_result_decode(self):
+        payload = make_payload(5)
+        payload[0]['metric_value'] = None
+        payload[1]['run_time'] = '3.5'
+        del payload[2]['importance']
+        for r, fast in zip(payload, Result.from_list(payload)):
+            self.assertSameObjects(Result.from_dict(r), fast)
+        self.assertEqual(Result.from_list(payload)[1].run_time, 3.5)
+
+    def test_experiment_decode(self):
+        payload = [{'hid': 'e1', 'title': 'expt', 'models_cnt': 3, 'task': 'bin_class',
+                    'description': None, 'metric': 'logloss', 'validation_scheme': '5-fold CV',
+                    'details': {}, 'params': {'algs': ['xgb']}, 'compute_now': 1,
+                    'computation_started_at': '2017-08-01T12:00:00Z', 'bestalg': [{'a': 1}],
+                    'created_at': None, 'parent_project': 'p1'}]
+        self.assertSameObjects(Experiment.from_dict(payload[0]), Experiment.from_list(payload)[0])
+
+    def test_invalid_values(self):
+        payload = make_payload(1)
+        payload[0]['status'] = None
+        with self.assertRaises(ValidationError):
+            Result.from_list(payload)
+        payload = make_payload(1)
+        payload[0]['metric_value'] = 'not a number'
+        with self.assertRaises(ValidationError):
+            Result.from_list(payload)
+        payload = make_payload(1)
+        payload[0]['params'] = [1, 2]
+        with self.assertRaises(ValidationError):
+            Result.from_list(payload)
+        payload = make_payload(1)
+        payload[0]['status_modify_at'] = 12
+        with self.assertRaises(ValidationError):
+            Result.from_list(payload)
+
+    def test_lazy_fields(self):
+        result = Result.from_list(make_payload(1))[0]
+        self.assertFalse(hasattr(result, '__dict__'))
+        # datetime is parsed on first access
+        self.assertEqual(result._status_modify_at, '2017-08-01T12:00:00.000000Z')
+        self.assertEqual(result.status_modify_at.year, 2017)
+        # heavy fields are kept as JSON, they are decoded on access
+        self.assertTrue(isinstance(result._params, str))
+        self.assertEqual(result.params['max_depth'], 4)
+        self.assertEqual(result.importance['attribute_1'], 0.1)
+        result = Result.from_list(make_payload(1), compact = False)[0]
+        self.assertTrue(isinstance(result._params, dict))
+        result.compact()
+        self.assertTrue(isinstance(result._params, str))
+        self.assertEqual(result.params['max_depth'], 4)
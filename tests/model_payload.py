@@ -0,0 +1,25 @@
+'''
+Results payload as returned by /results/ endpoint, used in model decoding tests and benchmarks.
+'''
+
+def make_payload(n):
+    return [{
+        'hid': 'result-%d' % i,
+        'experiment': 'expt-%d' % (i % 10),
+        'dataset': 'dataset-1',
+        'validation_scheme': '5-fold CV, Shuffle, Stratify',
+        'model_type': ['xgb', 'lgb', 'mlp'][i % 3],
+        'metric_type': 'logloss',
+        'metric_value': 0.5 + i * 1e-6,
+        'run_time': 12.5,
+        'iters': 100,
+        'status': 'Done',
+        'status_detail': None,
+        'status_modify_at': '2017-08-01T12:00:00.000000Z',
+        'importance': {'attribute_%d' % j: j * 0.1 for j in range(10)},
+        'train_prediction_path': 'path/to/train/prediction',
+        'params': {'max_depth': 4, 'eta': 0.1, 'subsample': 0.8},
+        'train_details': {'iterations': 100},
+        'models_saved': 'models',
+        'metric_additional': {'auc': 0.9}
+    } for i in range(n)]
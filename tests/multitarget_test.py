@@ -0,0 +1,125 @@
+'''
+FeatureBlock and fit_targets tests, MLJAR API calls are mocked.
+'''
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+try:
+    from unittest import mock
+except ImportError: # Python 2
+    import mock
+
+from mljar.mljar import Mljar
+from mljar.multitarget import FeatureBlock, fit_targets
+from mljar.exceptions import IncorrectInputDataException
+
+class FeatureBlockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.file_path = os.path.join(self.tmp_dir, 'data.csv')
+
+    def test_write_with_target(self):
+        X = pd.DataFrame({'a': [1.5, 2.5, 3.5],
+                            'text': ['one', 'two\nlines', 'with "quotes",\r\nand comma']})
+        y = np.array([0, 1, 0])
+        block = FeatureBlock(X)
+        try:
+            block.write_with_target(self.file_path, y)
+        finally:
+            block.close()
+        self.assertFalse(os.path.exists(block.file_path))
+        data = pd.read_csv(self.file_path)
+        self.assertEqual(list(data.columns), ['a', 'text', 'target'])
+        self.assertEqual(list(data['text']), list(X['text']))
+        self.assertEqual(list(data['a']), list(X['a']))
+        self.assertEqual(list(data['target']), list(y))
+
+    def test_numpy_input(self):
+        block = FeatureBlock(np.arange(6).reshape(3, 2))
+        try:
+            block.write_with_target(self.file_path, ['a', 'b', 'c'])
+        finally:
+            block.close()
+        with open(self.file_path) as fin:
+            self.assertEqual(fin.read(), 'attribute_1,attribute_2,target\n0,1,a\n2,3,b\n4,5,c\n')
+
+    def test_fingerprint(self):
+        block = FeatureBlock(pd.DataFrame({'a': [1, 2, 3]}))
+        try:
+            fingerprints = [block.write_with_target(self.file_path, y) for y in [[0, 1, 0], [0, 1, 0], [1, 1, 0]]]
+            with self.assertRaises(IncorrectInputDataException):
+                block.write_with_target(self.file_path, [0, 1])
+        finally:
+            block.close()
+        self.assertEqual(fingerprints[0], fingerprints[1])
+        self.assertNotEqual(fingerprints[0], fingerprints[2])
+
+    def test_target_column(self):
+        with self.assertRaises(IncorrectInputDataException):
+            FeatureBlock(pd.DataFrame({'a': [1, 2], 'target': [0, 1]}))
+
+class FitTargetsTest(unittest.TestCase):
+
+    def setUp(self):
+        # uploaded datasets, fingerprint -> dataset hid
+        self.datasets = {}
+        self.uploads = []
+        self.wait_for_all = []
+        self.failing = set()
+
+        def add_csv_dataset_if_not_exists(file_path, fingerprint, title_prefix = 'dataset-', wait_for_all = True):
+            self.wait_for_all.append(wait_for_all)
+            if fingerprint not in self.datasets:
+                self.uploads.append(pd.read_csv(file_path))
+                self.datasets[fingerprint] = 'ds-%d' % len(self.datasets)
+            return self.datasets[fingerprint]
+        def dataset_client(project_hid):
+            client = mock.Mock()
+            client.add_csv_dataset_if_not_exists.side_effect = add_csv_dataset_if_not_exists
+            return client
+        def add_project(model, y):
+            model.project_task = 'bin_class'
+            model.project = mock.Mock(hid = 'p1')
+        def add_experiment(model, index = None):
+            if model.experiment_title in self.failing:
+                raise Exception('experiment error')
+        patchers = [mock.patch('mljar.multitarget.DatasetClient', side_effect = dataset_client),
+                    mock.patch.object(Mljar, '_add_project', autospec = True, side_effect = add_project),
+                    mock.patch.object(Mljar, '_add_experiment', autospec = True, side_effect = add_experiment)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.X = pd.DataFrame({'a': [1.0, 2.0, 3.0, 4.0]})
+
+    def test_fit_targets(self):
+        Y = pd.DataFrame({'y1': [0, 1, 0, 1], 'y2': [0, 1, 0, 1], 'y3': [1, 1, 0, 0]})
+        models = fit_targets('project', 'expt', self.X, Y, max_workers = 2)
+        self.assertEqual(sorted(models.keys()), ['y1', 'y2', 'y3'])
+        self.assertEqual(models['y1'].experiment_title, 'expt-y1')
+        # the same target is uploaded once
+        self.assertEqual(len(self.uploads), 2)
+        self.assertEqual(models['y1'].dataset, models['y2'].dataset)
+        self.assertNotEqual(models['y1'].dataset, models['y3'].dataset)
+        for data in self.uploads:
+            self.assertEqual(list(data.columns), ['a', 'target'])
+        # the second call finds uploaded datasets
+        fit_targets('project', 'expt', self.X, {'y1': Y['y1'].values})
+        self.assertEqual(len(self.uploads), 2)
+        # targets do not wait for other datasets in the project
+        self.assertEqual(set(self.wait_for_all), set([False]))
+
+    def test_failed_target(self):
+        self.failing.add('expt-y2')
+        Y = {'y1': [0, 1, 0, 1], 'y2': [1, 1, 0, 0], 'y3': [1, 0, 0, 0]}
+        models = fit_targets('project', 'expt', self.X, Y)
+        self.assertEqual(str(models['y2']), 'experiment error')
+        self.assertEqual(models['y1'].experiment_title, 'expt-y1')
+        self.assertEqual(len(set([models['y1'].dataset, models['y3'].dataset])), 2)
+
+if __name__ == '__main__':
+    unittest.main()
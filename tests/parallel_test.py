@@ -0,0 +1,80 @@
+'''
+ParallelSerializer tests.
+'''
+import os
+import sys
+import zlib
+import shutil
+import tempfile
+import unittest
+import subprocess
+from zipfile import ZipFile
+import numpy as np
+import pandas as pd
+
+from mljar.parallel import ParallelSerializer, crc32_combine, compress_block, ZipStreamWriter
+
+class ParallelSerializerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        np.random.seed(1)
+        self.data = pd.DataFrame({'a': np.random.rand(1000),
+                                    'b': np.random.randint(0, 10, 1000),
+                                    'c': np.random.choice(['x', 'y'], 1000)}, columns=['a', 'b', 'c'])
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_crc32_combine(self):
+        a, b = b'first block\n', b'second block\n' * 100
+        self.assertEqual(crc32_combine(zlib.crc32(a), zlib.crc32(b), len(b)), zlib.crc32(a + b) & 0xffffffff)
+        self.assertEqual(crc32_combine(zlib.crc32(a), 0, 0), zlib.crc32(a))
+
+    def test_zip_from_blocks(self):
+        blocks = [b'a,b\n', b'1,2\n' * 1000, b'3,4\n']
+        file_path = os.path.join(self.path, 'data.zip')
+        with ZipStreamWriter(file_path, 'data.csv') as writer:
+            for i, block in enumerate(blocks):
+                compressed, crc, size, _ = compress_block(block, i == len(blocks) - 1)
+                writer.write_block(compressed, crc, size)
+        with ZipFile(file_path) as myzip:
+            self.assertEqual(myzip.testzip(), None)
+            self.assertEqual(myzip.read('data.csv'), b''.join(blocks))
+
+    def test_serialize(self):
+        file_path = os.path.join(self.path, 'data.csv.zip')
+        fingerprints = []
+        for n_workers in [1, 2]:
+            engine = ParallelSerializer(n_workers = n_workers, block_rows = 300)
+            fingerprints.append(engine.serialize(self.data, file_path, 'data.csv'))
+            with ZipFile(file_path) as myzip:
+                content = myzip.read('data.csv').decode('utf-8')
+            self.assertEqual(content, self.data.to_csv(index=False))
+        # fingerprint does not depend on workers count
+        self.assertEqual(fingerprints[0], fingerprints[1])
+        self.data.loc[0, 'a'] = 2.0
+        engine = ParallelSerializer(n_workers = 1, block_rows = 300)
+        self.assertNotEqual(engine.serialize(self.data, file_path, 'data.csv'), fingerprints[0])
+
+    def test_shared_memory_is_released(self):
+        # resource tracker reports errors on stderr of the process, so it is run separately
+        code = '''
+import sys
+import numpy as np
+import pandas as pd
+from mljar.parallel import ParallelSerializer
+data = pd.DataFrame({'a': np.arange(5000.0), 'b': np.arange(5000)})
+ParallelSerializer(n_workers = 4, block_rows = 500).serialize(data, sys.argv[1], 'data.csv')
+'''
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH = root)
+        process = subprocess.Popen([sys.executable, '-c', code, os.path.join(self.path, 'data.csv.zip')],
+                                    stdout = subprocess.PIPE, stderr = subprocess.PIPE, env = env)
+        _, err = process.communicate()
+        self.assertEqual(process.returncode, 0)
+        self.assertNotIn(b'Traceback', err)
+        self.assertNotIn(b'leaked', err)
+
+if __name__ == '__main__':
+    unittest.main()
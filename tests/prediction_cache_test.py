@@ -0,0 +1,50 @@
+'''
+PredictionCache tests.
+'''
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+from mljar.prediction_cache import PredictionCache
+
+class PredictionCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.X = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'b': [0.5, 0.1, 0.2]})
+        self.pred = pd.DataFrame({'prediction': [0.1, 0.9, 0.4]})
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_put_and_get(self):
+        cache = PredictionCache(self.path)
+        key = cache.key(self.X, 'model-1')
+        self.assertEqual(cache.get(key), None)
+        cache.put(key, self.pred)
+        pred = cache.get(key)
+        self.assertEqual(list(pred.columns), ['prediction'])
+        self.assertTrue(np.allclose(pred['prediction'].values, self.pred['prediction'].values))
+        # different model has different key
+        self.assertNotEqual(key, cache.key(self.X, 'model-2'))
+
+    def test_no_collisions(self):
+        cache = PredictionCache(self.path)
+        wide = pd.DataFrame(np.zeros((3, 1200)), columns=['c%d' % i for i in range(1200)])
+        changed = wide.copy()
+        changed.iloc[1, 600] = 1.0
+        self.assertNotEqual(cache.key(wide, 'model-1'), cache.key(changed, 'model-1'))
+        renamed = self.X.rename(columns={'a': 'c'})
+        self.assertNotEqual(cache.key(self.X, 'model-1'), cache.key(renamed, 'model-1'))
+        self.assertNotEqual(cache.key(self.X, 'model-1'), cache.key(self.X.astype(np.float32), 'model-1'))
+        self.assertEqual(cache.key(self.X, 'model-1'), cache.key(self.X.copy(), 'model-1'))
+
+    def test_lru_eviction(self):
+        cache = PredictionCache(self.path, max_size = 0)
+        key = cache.key(self.X, 'model-1')
+        cache.put(key, self.pred)
+        self.assertEqual(cache.get(key), None)
+        self.assertEqual(os.listdir(self.path), [])
@@ -0,0 +1,115 @@
+'''
+PredictionDownloadClient tests, with local HTTP server as a stand-in for MLJAR.
+'''
+import os
+import gzip
+import shutil
+import tempfile
+import threading
+import unittest
+import numpy as np
+import pandas as pd
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+except ImportError: # Python 2
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+from mljar.client.prediction_download import PredictionDownloadClient
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    # response body and flag if it is gzip encoded, set by test
+    body = b''
+    gzipped = False
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = gzip.compress(self.body) if self.gzipped else self.body
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv')
+        self.send_header('Content-Length', str(len(body)))
+        if self.gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class PredictionDownloadTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), PredictionHandler)
+        cls.thread = threading.Thread(target = cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.token = os.environ.get('MLJAR_TOKEN', None)
+        os.environ['MLJAR_TOKEN'] = self.token or 'test-token'
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        if self.token is None:
+            del os.environ['MLJAR_TOKEN']
+        PredictionHandler.gzipped = False
+
+    def client(self):
+        client = PredictionDownloadClient()
+        client.base_url = 'http://127.0.0.1:%d' % self.server.server_address[1]
+        return client
+
+    def serve(self, n_rows, gzipped = False, trailing_newline = True):
+        values = np.arange(n_rows) / 7.0
+        body = pd.DataFrame({'prediction': values}).to_csv(index = False)
+        if not trailing_newline:
+            body = body.rstrip('\n')
+        PredictionHandler.body = body.encode('utf-8')
+        PredictionHandler.gzipped = gzipped
+        return values
+
+    def test_download(self):
+        for n_rows in [2500, 400000]:
+            for gzipped in [False, True]:
+                values = self.serve(n_rows, gzipped)
+                pred = self.client().download('prediction-1')
+                self.assertEqual(list(pred.columns), ['prediction'])
+                self.assertTrue(np.allclose(pred['prediction'].values, values))
+                pred = self.client().download('prediction-1', dtype = np.float32, as_numpy = True)
+                self.assertEqual(pred.shape, (n_rows, 1))
+                self.assertEqual(pred.dtype, np.float32)
+
+    def test_download_chunks(self):
+        values = self.serve(2500, gzipped = True)
+        chunks = list(self.client().download_chunks('prediction-1', chunksize = 1000))
+        self.assertEqual([c.shape[0] for c in chunks], [1000, 1000, 500])
+        self.assertEqual(list(chunks[2].index[:2]), [2000, 2001])
+        self.assertTrue(np.allclose(pd.concat(chunks)['prediction'].values, values))
+
+    def test_download_to_array(self):
+        values = self.serve(2500)
+        out = np.memmap(os.path.join(self.path, 'pred.dat'), dtype = np.float64, mode = 'w+', shape = (2500,))
+        self.assertEqual(self.client().download_to('prediction-1', out, chunksize = 1000), 2500)
+        self.assertTrue(np.allclose(out, values))
+        del out
+        with self.assertRaises(Exception):
+            self.client().download_to('prediction-1', np.zeros(100), chunksize = 1000)
+
+    def test_download_to_file(self):
+        file_path = os.path.join(self.path, 'pred.csv')
+        for trailing_newline in [True, False]:
+            for gzipped in [False, True]:
+                values = self.serve(2500, gzipped, trailing_newline)
+                self.assertEqual(self.client().download_to('prediction-1', file_path), 2500)
+                self.assertTrue(np.allclose(pd.read_csv(file_path)['prediction'].values, values))
+        self.serve(0)
+        self.assertEqual(self.client().download_to('prediction-1', file_path), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+'''
+ReadinessWaiter tests.
+'''
+import time
+import threading
+import unittest
+
+from mljar.readiness import Backoff, ReadinessWaiter
+
+class ReadinessWaiterTest(unittest.TestCase):
+
+    def test_backoff(self):
+        backoff = Backoff(initial = 0.5, factor = 2.0, max_interval = 3.0)
+        self.assertEqual([backoff.next() for _ in range(5)], [0.5, 1.0, 2.0, 3.0, 3.0])
+        backoff.reset()
+        self.assertEqual(backoff.next(), 0.5)
+
+    def test_wait_until_ready(self):
+        calls = []
+        def check():
+            calls.append(1)
+            return 'ready' if len(calls) == 3 else None
+        waiter = ReadinessWaiter(initial = 0.01, max_interval = 0.05)
+        self.assertEqual(waiter.wait_until(check), 'ready')
+        self.assertEqual(len(calls), 3)
+
+    def test_timeout(self):
+        waiter = ReadinessWaiter(timeout = 0.1, initial = 0.02)
+        self.assertEqual(waiter.wait_until(lambda: None), None)
+
+    def test_notify_wakes_waiter(self):
+        state = {'ready': False}
+        waiter = ReadinessWaiter(timeout = 30, initial = 20)
+        def push():
+            state['ready'] = True
+            waiter.notify()
+        threading.Timer(0.1, push).start()
+        start = time.time()
+        self.assertEqual(waiter.wait_until(lambda: True if state['ready'] else None), True)
+        self.assertTrue(time.time() - start < 5)
@@ -0,0 +1,59 @@
+'''
+ResultTable tests.
+'''
+import unittest
+
+from mljar.model.result import Result
+from mljar.model.result_table import ResultTable
+from .model_payload import make_payload
+
+def make_result(hid, model_type, metric_value, status = 'Done'):
+    return Result(hid=hid, experiment='expt', dataset='ds', validation_scheme='5-fold CV',
+                    model_type=model_type, metric_type='logloss', params={},
+                    status=status, metric_value=metric_value, run_time=10.0)
+
+class ResultTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.results = [make_result('a', 'xgb', 0.5),
+                        make_result('b', 'lgb', 0.3),
+                        make_result('c', 'xgb', 0.4),
+                        make_result('d', 'mlp', None, status='Learning')]
+
+    def test_best_minimize(self):
+        table = ResultTable(self.results, 'logloss')
+        self.assertEqual(len(table), 4)
+        self.assertEqual(table.best().hid, 'b')
+        self.assertEqual([r.hid for r in table.top_k(2)], ['b', 'c'])
+        self.assertEqual(table.best('xgb').hid, 'c')
+        self.assertEqual(table.best('mlp'), None)
+
+    def test_best_maximize(self):
+        table = ResultTable(self.results, 'auc')
+        self.assertEqual(table.best().hid, 'a')
+        best = table.best_per_algorithm()
+        self.assertEqual(sorted(best.keys()), ['lgb', 'xgb'])
+        self.assertEqual(best['xgb'].hid, 'a')
+
+    def test_incremental_update(self):
+        table = ResultTable(self.results[:2], 'logloss')
+        self.assertEqual(table.best().hid, 'b')
+        table.update([make_result('a', 'xgb', 0.1), make_result('e', 'rfc', 0.2)])
+        self.assertEqual(len(table), 3)
+        self.assertEqual([r.hid for r in table.top_k(10)], ['a', 'e', 'b'])
+
+    def test_from_payload(self):
+        payload = [{'hid': 'x', 'model_type': 'xgb', 'metric_value': 0.7, 'status': 'Done'},
+                    {'hid': 'y', 'model_type': 'xgb', 'metric_value': None, 'status': 'Initiated'}]
+        table = ResultTable.from_payload(payload, 'logloss')
+        self.assertEqual(table.status_counts(), {'Done': 1, 'Initiated': 1})
+        self.assertEqual(ResultTable([], 'logloss').best(), None)
+
+    def test_payload_is_compact(self):
+        payload = make_payload(3)
+        table = ResultTable.from_payload(payload, 'logloss')
+        best = table.best()
+        self.assertEqual(best.hid, 'result-0')
+        # nested fields are kept as JSON till the first access
+        self.assertTrue(isinstance(best._params, str))
+        self.assertEqual(best.params['max_depth'], 4)
@@ -9,6 +9,27 @@ from .dataset_client_test import DatasetClientTest
 from .experiment_client_test import ExperimentClientTest
 from .result_client_test import ResultClientTest
 from .mljar_test import MljarTest
+from .result_table_test import ResultTableTest
+from .eta_test import ETAEstimatorTest
+from .prediction_cache_test import PredictionCacheTest
+from .readiness_test import ReadinessWaiterTest
+from .webhook_test import WebhookReceiverTest
+from .model_decode_test import ModelDecodeTest
+from .import_test import ImportTest
+from .metadata_cache_test import MetadataCacheTest
+from .experiment_fingerprint_test import ExperimentFingerprintTest
+from .parallel_test import ParallelSerializerTest
+from .sampled_hash_test import SampledHashTest, SampledHashClientTest
+from .delta_test import DeltaUploadTest
+from .sampling_test import StratifiedSampleTest
+from .timing_test import TimingRecorderTest
+from .watcher_test import ExperimentWatcherTest
+from .mljar_offline_test import MljarPredictManyTest, MljarPredictionCleanupTest, MljarBatchedPredictionTest, MljarStateTest, MljarBaselineTest
+from .batcher_test import PredictionBatcherTest
+from .prediction_download_test import PredictionDownloadTest
+from .cleanup_test import DatasetCleanerTest
+from .grid_test import GridTest
+from .multitarget_test import FeatureBlockTest, FitTargetsTest
 
 if __name__ == '__main__':
     unittest.main()
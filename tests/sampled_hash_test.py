@@ -0,0 +1,84 @@
+'''
+Sampled hash tests.
+'''
+import os
+import unittest
+import numpy as np
+import pandas as pd
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from mljar.utils import make_sampled_hash, sampled_positions
+from mljar.client.dataset import DatasetClient
+
+class SampledHashTest(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(1)
+        self.data = pd.DataFrame({'a': np.random.rand(10000),
+                                    'b': np.random.randint(0, 10, 10000)}, columns=['a', 'b'])
+
+    def test_deterministic(self):
+        self.assertEqual(make_sampled_hash(self.data), make_sampled_hash(self.data.copy()))
+        self.assertEqual(make_sampled_hash(self.data.values), make_sampled_hash(self.data.values))
+
+    def test_detects_changes(self):
+        h = make_sampled_hash(self.data)
+        # head, tail, dtypes, columns and shape are always covered
+        for row, column, value in [(0, 'a', 2.0), (9999, 'b', 11)]:
+            data = self.data.copy()
+            data.loc[row, column] = value
+            self.assertNotEqual(make_sampled_hash(data), h)
+        self.assertNotEqual(make_sampled_hash(self.data.astype({'b': np.float64})), h)
+        self.assertNotEqual(make_sampled_hash(self.data.rename(columns={'a': 'c'})), h)
+        self.assertNotEqual(make_sampled_hash(self.data.iloc[:-1]), h)
+
+    def test_small_frame_fully_hashed(self):
+        data = self.data.iloc[:100].copy()
+        h = make_sampled_hash(data)
+        data.loc[50, 'a'] = 2.0
+        self.assertNotEqual(make_sampled_hash(data), h)
+
+    def test_sampled_rows(self):
+        positions = sampled_positions(self.data.shape[0])
+        self.assertEqual(make_sampled_hash(self.data.iloc[positions], n_rows = self.data.shape[0]),
+                            make_sampled_hash(self.data))
+        self.assertIsNone(sampled_positions(100))
+
+class SampledHashClientTest(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(1)
+        self.X = np.random.rand(10000, 3)
+        self.y = np.random.randint(0, 2, 10000)
+        with mock.patch.dict(os.environ, {'MLJAR_TOKEN': 'token'}):
+            self.client = DatasetClient('project')
+        self.client.add_new_dataset = mock.MagicMock(return_value = 'new')
+        self.client._finalize_dataset = mock.MagicMock(side_effect = lambda d: d)
+        self.frames = []
+        prepare_frame = self.client._prepare_frame
+        def record(X, y):
+            data = prepare_frame(X, y)
+            self.frames.append(data.shape[0])
+            return data
+        self.client._prepare_frame = record
+
+    def test_sample_hash_equals_frame_hash(self):
+        for X, y in [(self.X, self.y), (pd.DataFrame(self.X, columns = ['a', 'b', 'c']), pd.Series(self.y)),
+                        (self.X, None), (self.X[:100], self.y[:100])]:
+            expected = make_sampled_hash(self.client._prepare_frame(X, y))
+            self.assertEqual(make_sampled_hash(self.client._prepare_sample(X, y), n_rows = X.shape[0]),
+                                expected)
+
+    def test_full_frame_prepared_only_to_upload(self):
+        self.client.get_datasets = mock.MagicMock(return_value = [])
+        self.assertEqual(self.client._add_dataset_with_sampled_hash(self.X, self.y, 'dataset-', None), 'new')
+        # the sample and the full frame for upload
+        self.assertEqual(self.frames, [sampled_positions(10000).shape[0], 10000])
+        sampled_hash = self.client.add_new_dataset.call_args[1]['meta'][0]['sampled_fingerprint']
+        self.assertEqual(sampled_hash, make_sampled_hash(self.client._prepare_frame(self.X, self.y)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+'''
+Stratified sampling tests.
+'''
+import unittest
+import numpy as np
+
+from mljar.sampling import stratified_sample
+
+class StratifiedSampleTest(unittest.TestCase):
+
+    def test_bin_class(self):
+        y = np.array([0] * 9000 + [1] * 1000)
+        positions = stratified_sample(y, 1000, 'bin_class')
+        self.assertEqual(len(positions), 1000)
+        self.assertEqual(len(np.unique(positions)), 1000)
+        self.assertTrue(np.all(np.diff(positions) > 0))
+        self.assertEqual(np.sum(y[positions] == 1), 100)
+
+    def test_rare_class_is_kept(self):
+        y = np.array([0] * 9999 + [1])
+        positions = stratified_sample(y, 10, 'bin_class')
+        self.assertEqual(np.sum(y[positions] == 1), 1)
+
+    def test_regression(self):
+        np.random.seed(1)
+        y = np.random.exponential(size = 10000)
+        positions = stratified_sample(y, 1000, 'reg')
+        self.assertEqual(len(positions), 1000)
+        # quantiles of sample are close to quantiles of data
+        self.assertTrue(np.allclose(np.percentile(y[positions], [25, 50, 75]),
+                                    np.percentile(y, [25, 50, 75]), rtol = 0.1))
+
+    def test_deterministic(self):
+        y = np.random.randint(0, 2, 5000)
+        self.assertTrue(np.array_equal(stratified_sample(y, 500, 'bin_class'),
+                                        stratified_sample(y, 500, 'bin_class')))
+        self.assertEqual(len(stratified_sample(y, 10000, 'bin_class')), 5000)
+
+if __name__ == '__main__':
+    unittest.main()
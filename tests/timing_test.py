@@ -0,0 +1,76 @@
+'''
+Timing instrumentation tests.
+'''
+import threading
+import unittest
+
+from mljar.timing import TimingRecorder, TimingHook, use_recorder, phase, timed
+from mljar.timing import record_request, record_bytes, run_with_recorder
+
+class ListHook(TimingHook):
+    def __init__(self):
+        self.calls = []
+
+    def on_phase(self, name, duration, n_bytes, n_requests):
+        self.calls.append((name, n_bytes, n_requests))
+
+class TimingRecorderTest(unittest.TestCase):
+
+    def test_nested_phases(self):
+        hook = ListHook()
+        recorder = TimingRecorder(hooks = [hook])
+        with use_recorder(recorder):
+            with phase('upload'):
+                with phase('signed_url'):
+                    record_request(10)
+                record_request(100)
+                record_bytes(5)
+        self.assertEqual(recorder.get('signed_url').requests, 1)
+        self.assertEqual(recorder.get('upload').requests, 2)
+        self.assertEqual(recorder.get('upload').bytes, 115)
+        self.assertEqual(hook.calls, [('signed_url', 10, 1), ('upload', 115, 2)])
+        self.assertEqual(list(recorder.to_dict().keys()), ['signed_url', 'upload'])
+
+    def test_no_recorder(self):
+        @timed('hash')
+        def fun():
+            record_request(10)
+            return 1
+        self.assertEqual(fun(), 1)
+        recorder = TimingRecorder()
+        with use_recorder(recorder):
+            fun()
+            fun()
+        self.assertEqual(recorder.get('hash').count, 2)
+        self.assertEqual(recorder.get('hash').requests, 2)
+        # recorder is not active after the block
+        fun()
+        self.assertEqual(recorder.get('hash').count, 2)
+
+    def test_threads(self):
+        recorder = TimingRecorder()
+        def work():
+            with phase('upload'):
+                record_request()
+        threads = [threading.Thread(target = run_with_recorder(recorder, work)) for _ in range(4)]
+        # thread without recorder is not measured
+        threads.append(threading.Thread(target = work))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(recorder.get('upload').count, 4)
+        self.assertEqual(recorder.get('upload').requests, 4)
+
+    def test_failing_hook(self):
+        class FailingHook(TimingHook):
+            def on_phase(self, name, duration, n_bytes, n_requests):
+                raise Exception('failed')
+        recorder = TimingRecorder(hooks = [FailingHook()])
+        with use_recorder(recorder):
+            with phase('download'):
+                pass
+        self.assertEqual(recorder.get('download').count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
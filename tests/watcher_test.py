@@ -0,0 +1,126 @@
+'''
+ExperimentWatcher tests, MLJAR clients are mocked.
+'''
+import unittest
+try:
+    from unittest import mock
+except ImportError: # Python 2
+    import mock
+
+from mljar.watcher import ExperimentWatcher
+
+class FakeExperiment(object):
+    def __init__(self, hid, compute_now = 1, metric = 'logloss'):
+        self.hid = hid
+        self.compute_now = compute_now
+        self.metric = metric
+
+def make_payload(experiment_hid, hid, metric_value):
+    return {'hid': hid, 'experiment': experiment_hid, 'dataset': 'ds', 'validation_scheme': '5-fold CV',
+            'model_type': 'xgb', 'metric_type': 'logloss', 'params': {},
+            'metric_value': metric_value, 'run_time': 10.0, 'status': 'Done'}
+
+class ExperimentWatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        # state of the mocked API: project hid -> (results payload, experiments)
+        self.api = {}
+        self.calls = []
+        self.failing = set()
+        patchers = [mock.patch('mljar.watcher.ResultClient', side_effect=self._result_client),
+                    mock.patch('mljar.watcher.ExperimentClient', side_effect=self._experiment_client)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _result_client(self, project_hid):
+        client = mock.Mock()
+        def get_results_payload():
+            self.calls.append(('results', project_hid))
+            if project_hid in self.failing:
+                raise Exception('connection error')
+            return self.api[project_hid][0]
+        client.get_results_payload.side_effect = get_results_payload
+        return client
+
+    def _experiment_client(self, project_hid):
+        client = mock.Mock()
+        def get_experiments():
+            self.calls.append(('experiments', project_hid))
+            return self.api[project_hid][1]
+        client.get_experiments.side_effect = get_experiments
+        return client
+
+    def test_one_request_per_project(self):
+        self.api['p1'] = ([make_payload('e1', 'r1', 0.5), make_payload('e2', 'r2', 0.4)],
+                            [FakeExperiment('e1'), FakeExperiment('e2')])
+        self.api['p2'] = ([], [FakeExperiment('e3')])
+        watcher = ExperimentWatcher()
+        for project_hid, experiment_hid in [('p1', 'e1'), ('p1', 'e2'), ('p2', 'e3')]:
+            watcher.watch(project_hid, experiment_hid)
+        self.assertEqual(len(watcher), 3)
+        watcher.poll_once()
+        self.assertEqual(sorted(self.calls), [('experiments', 'p1'), ('experiments', 'p2'),
+                                                ('results', 'p1'), ('results', 'p2')])
+
+    def test_callbacks_and_done(self):
+        experiment = FakeExperiment('e1')
+        self.api['p1'] = ([make_payload('e1', 'r1', 0.5), make_payload('e2', 'r2', 0.1)], [experiment])
+        states = []
+        watcher = ExperimentWatcher()
+        future = watcher.watch('p1', 'e1', callback = lambda state: states.append(len(state.table)))
+        watcher.poll_once()
+        # only results of watched experiment are dispatched
+        self.assertEqual(states, [1])
+        self.assertFalse(future.done())
+        experiment.compute_now = 2
+        self.api['p1'][0].append(make_payload('e1', 'r3', 0.3))
+        watcher.poll_once()
+        self.assertEqual(states, [1, 2])
+        state = future.result(0)
+        self.assertEqual(state.table.best().hid, 'r3')
+        self.assertEqual(len(watcher), 0)
+
+    def test_errors(self):
+        self.api['p1'] = ([], [FakeExperiment('e1')])
+        self.failing.add('p1')
+        watcher = ExperimentWatcher(max_error_cnt = 2)
+        future = watcher.watch('p1', 'e1')
+        watcher.poll_once()
+        self.assertFalse(future.done())
+        watcher.poll_once()
+        with self.assertRaises(Exception):
+            future.result(0)
+        self.assertEqual(len(watcher), 0)
+
+    def test_unwatch(self):
+        self.api['p1'] = ([], [FakeExperiment('e1')])
+        watcher = ExperimentWatcher()
+        future = watcher.watch('p1', 'e1')
+        watcher.unwatch('p1', 'e1')
+        self.assertTrue(future.cancelled())
+        self.assertEqual(len(watcher), 0)
+        watcher.poll_once()
+        self.assertEqual(self.calls, [])
+
+    def test_background_thread(self):
+        self.api['p1'] = ([], [FakeExperiment('e1', compute_now = 2)])
+        watcher = ExperimentWatcher(interval = 0.01).start()
+        try:
+            state = watcher.watch('p1', 'e1').result(5)
+            self.assertEqual(state.experiment.hid, 'e1')
+        finally:
+            watcher.stop(5)
+
+    def test_stop_from_callback(self):
+        self.api['p1'] = ([], [FakeExperiment('e1', compute_now = 2)])
+        watcher = ExperimentWatcher(interval = 0.01).start()
+        thread = watcher._thread
+        future = watcher.watch('p1', 'e1')
+        future.add_done_callback(lambda f: watcher.stop())
+        future.result(5)
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+'''
+WebhookReceiver tests, with local receiver as a stand-in for MLJAR callbacks.
+'''
+import json
+import time
+import threading
+import unittest
+import requests
+
+from mljar.webhook import WebhookReceiver, get_waiter
+
+class WebhookReceiverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.receiver = WebhookReceiver().start()
+
+    def tearDown(self):
+        self.receiver.stop()
+
+    def post(self, body):
+        return requests.post(self.receiver.url, data = json.dumps(body))
+
+    def test_notification_wakes_waiter(self):
+        waiter = get_waiter([('experiment', 'expt-1')])
+        threading.Timer(0.1, self.post, [{'kind': 'experiment', 'hid': 'expt-1'}]).start()
+        start = time.time()
+        self.assertTrue(waiter.sleep(30))
+        self.assertTrue(time.time() - start < 5)
+
+    def test_wildcard_waiter(self):
+        waiter = get_waiter([('prediction', None)], timeout = 30, initial = 20)
+        state = {'calls': 0}
+        def check():
+            state['calls'] += 1
+            return True if state['calls'] > 1 else None
+        threading.Timer(0.1, self.post, [{'kind': 'prediction', 'hid': 'some-hid'}]).start()
+        start = time.time()
+        self.assertTrue(waiter.wait_until(check))
+        self.assertTrue(time.time() - start < 5)
+
+    def test_other_notification_does_not_wake(self):
+        waiter = get_waiter([('experiment', 'expt-1')])
+        response = self.post({'kind': 'experiment', 'hid': 'expt-2'})
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(waiter.sleep(0.2))
+
+    def test_wrong_notification(self):
+        response = self.post({'kind': 'unknown', 'hid': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_polling_without_receiver(self):
+        self.receiver.stop()
+        waiter = get_waiter([('dataset', None)], timeout = 0.1, initial = 0.01)
+        self.assertEqual(waiter.wait_until(lambda: None), None)